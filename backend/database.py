@@ -1,9 +1,13 @@
 # backend/database.py
 
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import create_engine, event, text, exc
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import QueuePool
+from collections import deque
+from contextlib import contextmanager
 import os
+import threading
+import time
 from dotenv import load_dotenv
 import logging
 
@@ -23,8 +27,9 @@ if "postgresql" in DATABASE_URL:
     engine = create_engine(
         DATABASE_URL,
         poolclass=QueuePool,
-        pool_size=10,
-        max_overflow=20,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
         pool_pre_ping=True,
         pool_recycle=3600,
         echo=False,
@@ -52,6 +57,117 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+# ==================== MÉTRIQUES DU POOL ====================
+
+class PoolMetrics:
+    """Emprunts de connexions: nombre, attente au pool, durée de détention"""
+
+    WINDOW = 1000  # Dernières mesures conservées pour les percentiles
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self._waits = deque(maxlen=self.WINDOW)
+        self._holds = deque(maxlen=self.WINDOW)
+
+    def attach(self, engine):
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checkout_at", None)
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+            if started is not None:
+                self._holds.append(time.perf_counter() - started)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self._waits.append(seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    @staticmethod
+    def _summary(values) -> dict:
+        if not values:
+            return {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(values)
+        return {
+            "count": len(ordered),
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3)
+        }
+
+    def snapshot(self, engine=None) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "timeouts": self.timeouts,
+                "wait": self._summary(list(self._waits)),
+                "hold": self._summary(list(self._holds))
+            }
+        pool = engine.pool if engine is not None else None
+        if isinstance(pool, QueuePool):
+            data["pool"] = {
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "overflow": pool.overflow(),
+                "checked_in": pool.checkedin()
+            }
+        return data
+
+
+pool_metrics = PoolMetrics()
+pool_metrics.attach(engine)
+
+
+@contextmanager
+def session_scope():
+    """
+    Unité de travail courte: la connexion n'est empruntée que le temps du bloc.
+    Commit à la sortie, rollback sur exception. Les objets restent lisibles
+    après fermeture (expire_on_commit=False).
+    """
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        try:
+            db.connection()  # Emprunt immédiat pour mesurer l'attente au pool
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Panne de la base ou de la connexion (à réessayer), par opposition à une ligne refusée"""
+    if isinstance(error, (exc.OperationalError, exc.InterfaceError)):
+        return True
+    return isinstance(error, exc.DBAPIError) and error.connection_invalidated
+
+
 def get_db():
     """Dépendance FastAPI pour session DB"""
     db = SessionLocal()
@@ -67,11 +183,15 @@ def init_db():
         # Import des modèles APRÈS déclaration de Base
         from backend.models.db_models import (
             ClientDB, ContratDB, SinistreDB, HistoriqueConversationDB,
-            ActionRecommandeeDB, RemboursementDB, ConseillerDB, EscaladeDB
+            ActionRecommandeeDB, RemboursementDB, ConseillerDB, EscaladeDB, CompteurDB, AnalyticsRollupDB, AnalyticsDeltaDB
         )
         
         # Créer les tables
         Base.metadata.create_all(bind=engine)
+
+        # Colonnes/index ajoutés depuis la création + backfills
+        from backend.migrations import run_migrations
+        run_migrations(engine)
         logger.info("Database initialized successfully")
         return True
     except Exception as e:
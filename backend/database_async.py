@@ -0,0 +1,91 @@
+# backend/database_async.py
+
+"""
+Moteur SQLAlchemy asynchrone pour les routes chaudes et le WebSocket.
+Même DATABASE_URL que backend/database.py, avec le driver async:
+- PostgreSQL: asyncpg
+- SQLite (dev): aiosqlite
+Les requêtes n'occupent plus la boucle d'événements pendant l'aller-retour DB.
+Pool distinct de celui du moteur synchrone, dimensionné à part
+(DB_ASYNC_POOL_SIZE / DB_ASYNC_MAX_OVERFLOW): connexions PostgreSQL par worker =
+somme des deux pools.
+"""
+
+import os
+import time
+import logging
+from contextlib import asynccontextmanager
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from backend.database import DATABASE_URL, PoolMetrics
+
+logger = logging.getLogger(__name__)
+
+
+def to_async_url(url: str) -> str:
+    """postgresql://... -> postgresql+asyncpg://..., sqlite:///... -> sqlite+aiosqlite:///..."""
+    scheme, sep, rest = url.partition("://")
+    driver = scheme.split("+", 1)[0]
+    if driver in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if driver == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+if ASYNC_DATABASE_URL.startswith("postgresql"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=int(os.getenv("DB_ASYNC_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "5")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        echo=False,
+        connect_args={"timeout": 10}
+    )
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async_pool_metrics = PoolMetrics()
+async_pool_metrics.attach(async_engine.sync_engine)
+
+
+async def get_async_db():
+    """Dépendance FastAPI pour session DB asynchrone"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def async_session_scope():
+    """Équivalent async de session_scope(): emprunt court, commit ou rollback"""
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        try:
+            await db.connection()
+        except exc.TimeoutError:
+            async_pool_metrics.record_timeout()
+            raise
+        async_pool_metrics.record_wait(time.perf_counter() - started)
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def dispose_async_engine():
+    await async_engine.dispose()
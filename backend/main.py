@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 import logging
 from pathlib import Path
 from contextlib import asynccontextmanager
@@ -9,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi import FastAPI
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -17,10 +18,14 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from backend.database import init_db, get_db_connection
+from backend.database import init_db, get_db_connection, engine, pool_metrics
+from backend.database_async import async_engine, async_pool_metrics, dispose_async_engine
 from backend.routers import clients, conversation, audio, advisor, emotions
-from backend.routers import operations
+from backend.routers import operations, events, imports, exports
 from backend.seeds.seed_data import seed_all
+from backend.services.analytics_rollup import compaction_loop
+from modules.timing import registry as timing_registry
+from modules.tts_module import resolve_audio_dir
 
 # Configuration logging
 logging.basicConfig(
@@ -50,9 +55,25 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.info(f"[!] Seed: {e}")
     
+    # Pré-rendu audio des prompts fixes (PROMPT_PRERENDER=background|sync|off)
+    prerender_mode = os.getenv("PROMPT_PRERENDER", "background").lower()
+    if prerender_mode == "sync":
+        conversation.prompt_catalogue.prerender()
+    elif prerender_mode != "off":
+        asyncio.get_running_loop().run_in_executor(
+            conversation.tts_executor, conversation.prompt_catalogue.prerender
+        )
+    
+    # Report périodique des deltas d'agrégats (ANALYTICS_COMPACT_SECONDS)
+    compaction = asyncio.create_task(compaction_loop(engine))
+    
     yield
     
     logger.info("[*] Server shutting down...")
+    compaction.cancel()
+    conversation.tts_executor.shutdown(wait=False, cancel_futures=True)
+    await conversation.turn_history.stop()
+    await dispose_async_engine()
 
 
 app = FastAPI(
@@ -72,9 +93,8 @@ app.add_middleware(
 
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 
-# Audio serving - use absolute path to project root
-project_root = Path(__file__).parent.parent
-audio_dir = project_root / "data" / "audio_responses"
+# Audio serving - même dossier que le moteur TTS ($AUDIO_DIR)
+audio_dir = resolve_audio_dir()
 audio_dir.mkdir(parents=True, exist_ok=True)
 
 
@@ -94,17 +114,40 @@ async def health():
     return {
         "status": "✅ Online" if db_ok else "⚠️ Degraded",
         "version": "1.0.0",
-        "database": "✅ OK" if db_ok else "❌ Error"
+        "database": "✅ OK" if db_ok else "❌ Error",
+        "tts_cache": conversation.tts_engine.cache_stats(),
+        "sessions": await conversation.session_store.astats()
+    }
+
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Emprunts du pool DB (attente, détention, saturation) pour dimensionner le pool"""
+    return {
+        "sync": pool_metrics.snapshot(engine),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine)
     }
 
 
+@app.get("/metrics")
+async def pipeline_metrics(format: str = "prometheus"):
+    """Histogrammes des étapes du pipeline (extraction, DB, manager, TTS, envoi...)"""
+    if format == "json":
+        return timing_registry.snapshot()
+    return PlainTextResponse(timing_registry.render_prometheus())
+
+
 # Routes
 app.include_router(clients.router)
 app.include_router(conversation.router)
 app.include_router(audio.router)
 app.include_router(advisor.router)
+app.include_router(advisor.ws_router)
 app.include_router(emotions.router)
 app.include_router(operations.router)
+app.include_router(events.router)
+app.include_router(imports.router)
+app.include_router(exports.router)
 
 
 @app.get("/")
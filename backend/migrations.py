@@ -0,0 +1,267 @@
+# backend/migrations.py
+
+"""
+Migrations légères du schéma (sans Alembic).
+`create_all` ne modifie pas les tables existantes: ce module ajoute les
+colonnes manquantes, exécute les backfills de données, puis crée les index
+manquants (un index unique n'est construit qu'en l'absence de doublons).
+Idempotent: peut être rejoué à chaque démarrage.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import inspect, text, select, update, bindparam, func
+from sqlalchemy.schema import CreateIndex
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _add_missing_columns(engine, metadata):
+    """ALTER TABLE ... ADD COLUMN pour chaque colonne déclarée absente en base"""
+    inspector = inspect(engine)
+    added = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def _index_valid(conn, name):
+    """pg_index.indisvalid de l'index `name` (None s'il n'existe pas)"""
+    return conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+        ),
+        {"name": name}
+    ).scalar()
+
+
+def _create_index(engine, index) -> bool:
+    """
+    PostgreSQL: CREATE INDEX CONCURRENTLY, les tables chaudes restent ouvertes
+    en écriture pendant la construction (hors transaction, d'où AUTOCOMMIT).
+    Un seul processus construit un index donné (verrou consultatif non bloquant:
+    une attente dans une transaction ouverte bloquerait le CONCURRENTLY de
+    l'autre worker). Un index n'est supprimé que s'il est INVALID, sous ce verrou:
+    reste d'une construction interrompue, jamais l'index valide ou en cours d'un
+    autre worker. Retourne False si un autre processus s'en charge.
+    """
+    if engine.dialect.name != "postgresql":
+        index.create(bind=engine)
+        return True
+    ddl = str(CreateIndex(index).compile(dialect=engine.dialect))
+    ddl = re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", ddl)
+    lock = {"key": f"migrations:index:{index.name}"}
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:key))"), lock).scalar():
+            logger.info(f"[*] Index {index.name}: construit par un autre processus")
+            return False
+        try:
+            valid = _index_valid(conn, index.name)
+            if valid:
+                return False
+            if valid is False:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+            try:
+                conn.execute(text(ddl))
+            except Exception:
+                if _index_valid(conn, index.name) is False:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+                raise
+            return True
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), lock)
+
+
+def _duplicates(engine, index) -> List[Dict[str, Any]]:
+    """Valeurs en double qui empêchent de construire l'index unique `index` (20 premières)"""
+    columns = list(index.columns)
+    stmt = (
+        select(*columns, func.count().label("count"))
+        .where(*[c.isnot(None) for c in columns])
+        .group_by(*columns)
+        .having(func.count() > 1)
+        .limit(20)
+    )
+    with engine.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(stmt)]
+
+
+def _drop_index(engine, name):
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        return
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _create_missing_indexes(engine, metadata):
+    """
+    Crée les index déclarés dans les modèles mais absents en base, et reconstruit
+    en unique ceux qui le sont devenus. Un index unique n'est pas construit tant
+    que des doublons existent: ils sont rapportés (index -> valeurs) pour être corrigés.
+    """
+    inspector = inspect(engine)
+    created, collisions = [], {}
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        # Index INVALID (CREATE INDEX CONCURRENTLY interrompu): reflété mais à reconstruire
+        existing = {
+            ix["name"]: ix for ix in inspector.get_indexes(table.name)
+            if not ix.get("dialect_options", {}).get("postgresql_invalid")
+        }
+        for index in table.indexes:
+            reflected = existing.get(index.name)
+            if reflected is not None and (reflected["unique"] or not index.unique):
+                continue
+            if index.unique:
+                duplicates = _duplicates(engine, index)
+                if duplicates:
+                    logger.error(f"❌ Index unique {index.name} non construit, doublons à corriger: {duplicates}")
+                    collisions[index.name] = duplicates
+                    continue
+            if reflected is not None:
+                _drop_index(engine, index.name)
+            if _create_index(engine, index):
+                created.append(index.name)
+    return created, collisions
+
+
+def _rebuild_sqlite_table(engine, table, existing_columns):
+    """
+    SQLite n'a pas d'ALTER COLUMN: table recréée au schéma des modèles puis
+    recopiée (procédure documentée par SQLite; clés étrangères non appliquées
+    par défaut, les références des autres tables restent valides après le RENAME).
+    """
+    from sqlalchemy import MetaData
+
+    scratch = MetaData()  # Copie des tables référencées: les clés étrangères s'y résolvent
+    for other in table.metadata.sorted_tables:
+        if other is not table:
+            other.to_metadata(scratch)
+    staging = table.to_metadata(scratch, name=f"_rebuild_{table.name}")
+    staging.indexes.clear()  # Recréés sous leur nom d'origine après le RENAME
+    columns = ", ".join(c.name for c in table.columns if c.name in existing_columns)
+    with engine.begin() as conn:
+        for index in inspect(conn).get_indexes(table.name):
+            conn.execute(text(f"DROP INDEX {index['name']}"))
+        staging.create(conn)
+        conn.execute(text(f"INSERT INTO {staging.name} ({columns}) SELECT {columns} FROM {table.name}"))
+        conn.execute(text(f"DROP TABLE {table.name}"))
+        conn.execute(text(f"ALTER TABLE {staging.name} RENAME TO {table.name}"))
+        for index in table.indexes:
+            index.create(conn)
+
+
+def _relax_not_null(engine, metadata):
+    """
+    DROP NOT NULL sur les colonnes devenues optionnelles
+    (PostgreSQL: ALTER COLUMN; SQLite: reconstruction de la table)
+    """
+    if engine.dialect.name not in ("postgresql", "sqlite"):
+        return []
+    inspector = inspect(engine)
+    relaxed = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        nullable_in_db = {c["name"]: c["nullable"] for c in inspector.get_columns(table.name)}
+        columns = [
+            column for column in table.columns
+            if column.nullable and not column.primary_key and nullable_in_db.get(column.name) is False
+        ]
+        if not columns:
+            continue
+        if engine.dialect.name == "sqlite":
+            _rebuild_sqlite_table(engine, table, nullable_in_db)
+        else:
+            with engine.begin() as conn:
+                for column in columns:
+                    conn.execute(text(f'ALTER TABLE {table.name} ALTER COLUMN {column.name} DROP NOT NULL'))
+        relaxed.extend(f"{table.name}.{column.name}" for column in columns)
+    return relaxed
+
+
+def backfill_matricule_normalized(engine):
+    """Renseigne clients.matricule_normalized pour les lignes antérieures à la colonne"""
+    from backend.models.db_models import ClientDB, normalize_matricule
+
+    clients = ClientDB.__table__
+    total = 0
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(clients.c.id, clients.c.matricule).where(clients.c.matricule_normalized.is_(None))
+        ).all()
+        stmt = (
+            update(clients)
+            .where(clients.c.id == bindparam("_id"))
+            .values(matricule_normalized=bindparam("_normalized"))
+        )
+        for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+            batch = rows[start:start + BACKFILL_BATCH_SIZE]
+            conn.execute(stmt, [{"_id": r.id, "_normalized": normalize_matricule(r.matricule)} for r in batch])
+            total += len(batch)
+    return total
+
+
+def backfill_analytics_rollup(engine):
+    """Construit analytics_rollup à partir des tables existantes si elle n'a jamais été remplie"""
+    from backend.services.analytics_rollup import is_built, rebuild
+
+    with engine.begin() as conn:
+        if is_built(conn):
+            return 0
+        return rebuild(conn)
+
+
+BACKFILLS = [
+    backfill_matricule_normalized,
+    backfill_analytics_rollup,
+]
+
+
+def run_migrations(engine):
+    """Crée les tables manquantes, ajoute les colonnes, exécute les backfills puis crée les index"""
+    from backend.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    added = _add_missing_columns(engine, Base.metadata)
+    relaxed = _relax_not_null(engine, Base.metadata)
+    # Backfills avant les index: un index unique porte sur les valeurs remplies
+    for backfill in BACKFILLS:
+        count = backfill(engine)
+        if count:
+            logger.info(f"🔁 Backfill {backfill.__name__}: {count} lignes")
+    created, collisions = _create_missing_indexes(engine, Base.metadata)
+
+    if added or created or relaxed:
+        logger.info(f"🧱 Migration: colonnes {added or '-'}, index {created or '-'}, nullables {relaxed or '-'}")
+    return {"columns": added, "indexes": created, "collisions": collisions}
+
+
+if __name__ == "__main__":
+    # python -m backend.migrations (depuis la racine, backend/ dans le PYTHONPATH)
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    logging.basicConfig(level=logging.INFO)
+
+    from backend.database import engine
+    print(run_migrations(engine))
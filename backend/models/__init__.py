@@ -1,10 +1,10 @@
 # backend/models/__init__.py
 from .db_models import (
     ClientDB, ContratDB, SinistreDB, HistoriqueConversationDB,
-    ActionRecommandeeDB, RemboursementDB, ConseillerDB, EscaladeDB, Base
+    ActionRecommandeeDB, RemboursementDB, ConseillerDB, EscaladeDB, CompteurDB, AnalyticsRollupDB, AnalyticsDeltaDB, Base
 )
 
 __all__ = [
     "ClientDB", "ContratDB", "SinistreDB", "HistoriqueConversationDB",
-    "ActionRecommandeeDB", "RemboursementDB", "ConseillerDB", "EscaladeDB", "Base"
+    "ActionRecommandeeDB", "RemboursementDB", "ConseillerDB", "EscaladeDB", "CompteurDB", "AnalyticsRollupDB", "AnalyticsDeltaDB", "Base"
 ]
@@ -1,19 +1,29 @@
 # backend/models/db_models.py
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Numeric, ForeignKey, Text, Date, Time, Index, JSON, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Numeric, ForeignKey, Text, Date, Time, Index, JSON, Sequence, func
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
+import re
 import uuid
 from database import Base
 
 
+def normalize_matricule(matricule: str) -> str:
+    """Forme canonique d'un matricule: majuscules, sans séparateurs (AB-4521-22 -> AB452122)"""
+    return re.sub(r"[^0-9A-Z]", "", (matricule or "").upper())
+
+
 class ClientDB(Base):
     """Modèle Client"""
     __tablename__ = "clients"
+    # Pagination par curseur: ORDER BY date_creation DESC, id DESC
+    __table_args__ = (Index("ix_clients_date_creation_id", "date_creation", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     matricule = Column(String(20), unique=True, nullable=False, index=True)
+    # Unique: deux formes d'un même matricule ne désignent jamais deux clients
+    matricule_normalized = Column(String(20), unique=True, index=True)
     nom = Column(String(100), nullable=False)
     prenom = Column(String(100), nullable=False)
     email = Column(String(120), unique=True, nullable=False)
@@ -31,10 +41,17 @@ class ClientDB(Base):
     contrats = relationship("ContratDB", back_populates="client", cascade="all, delete-orphan")
     sinistres = relationship("SinistreDB", back_populates="client", cascade="all, delete-orphan")
 
+    @validates("matricule")
+    def _sync_matricule_normalized(self, key, value):
+        self.matricule_normalized = normalize_matricule(value)
+        return value
+
 
 class ContratDB(Base):
     """Modèle Contrat"""
     __tablename__ = "contrats"
+    # Pagination par curseur: ORDER BY date_creation DESC, id DESC
+    __table_args__ = (Index("ix_contrats_date_creation_id", "date_creation", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
@@ -67,6 +84,12 @@ class ContratDB(Base):
 class SinistreDB(Base):
     """Modèle Sinistre"""
     __tablename__ = "sinistres"
+    # Pagination par curseur: ORDER BY date_creation DESC, id DESC
+    # Dossiers ouverts d'un client (authentification, confirmation): client_id + status_dossier != 'fermé'
+    __table_args__ = (
+        Index("ix_sinistres_date_creation_id", "date_creation", "id"),
+        Index("ix_sinistres_client_id_status_dossier", "client_id", "status_dossier"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
@@ -109,7 +132,9 @@ class HistoriqueConversationDB(Base):
     __tablename__ = "historique_conversation"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    sinistre_id = Column(UUID(as_uuid=True), ForeignKey("sinistres.id"), nullable=False, index=True)
+    # Les tours précédant la création du sinistre sont rattachés a posteriori via session_id
+    sinistre_id = Column(UUID(as_uuid=True), ForeignKey("sinistres.id"), nullable=True, index=True)
+    session_id = Column(String(64), index=True)
     phase_conversation = Column(String(50), nullable=False)
 
     message_user = Column(Text)
@@ -129,6 +154,8 @@ class HistoriqueConversationDB(Base):
 class ActionRecommandeeDB(Base):
     """Modèle Actions Recommandées"""
     __tablename__ = "actions_recommandees"
+    # Suivi: actions d'un sinistre filtrées par statut
+    __table_args__ = (Index("ix_actions_recommandees_sinistre_id_status", "sinistre_id", "status"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     sinistre_id = Column(UUID(as_uuid=True), ForeignKey("sinistres.id"), nullable=False, index=True)
@@ -146,6 +173,8 @@ class ActionRecommandeeDB(Base):
 class RemboursementDB(Base):
     """Modèle Remboursement"""
     __tablename__ = "remboursements"
+    # Pagination par curseur: ORDER BY date_creation DESC, id DESC
+    __table_args__ = (Index("ix_remboursements_date_creation_id", "date_creation", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     sinistre_id = Column(UUID(as_uuid=True), ForeignKey("sinistres.id"), nullable=False, index=True)
@@ -188,6 +217,12 @@ class ConseillerDB(Base):
 class EscaladeDB(Base):
     """Modèle Escalade"""
     __tablename__ = "escalades"
+    # Pagination par curseur: ORDER BY date_escalade DESC, id DESC
+    # File d'attente conseillers: status == 'en_attente' triée par date_escalade
+    __table_args__ = (
+        Index("ix_escalades_date_escalade_id", "date_escalade", "id"),
+        Index("ix_escalades_status_date_escalade", "status", "date_escalade"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     sinistre_id = Column(UUID(as_uuid=True), ForeignKey("sinistres.id"), nullable=False, index=True)
@@ -205,3 +240,43 @@ class EscaladeDB(Base):
 
     sinistre = relationship("SinistreDB", back_populates="escalades")
     conseiller = relationship("ConseillerDB", back_populates="escalades")
+
+
+class CompteurDB(Base):
+    """Compteurs applicatifs réservés par blocs (numéros de sinistre sur SQLite)"""
+    __tablename__ = "compteurs"
+
+    nom = Column(String(50), primary_key=True)
+    valeur = Column(Integer, nullable=False, default=0)
+
+
+# Versions des ressources pour les ETag (services/resource_versions.py), PostgreSQL:
+# nextval() n'appartient à aucune transaction et ne verrouille aucune ligne.
+# Ignorées par SQLite, où les versions restent dans compteurs.
+VERSION_SEQUENCES = {
+    resource: Sequence(f"version_{resource}_seq", metadata=Base.metadata)
+    for resource in ("sinistres", "escalades", "remboursements", "contrats", "clients", "conseillers")
+}
+
+
+class AnalyticsRollupDB(Base):
+    """Agrégats du tableau de bord, maintenus à chaque écriture (services/analytics_rollup.py)"""
+    __tablename__ = "analytics_rollup"
+
+    metrique = Column(String(30), primary_key=True)
+    cle = Column(String(50), primary_key=True)
+    valeur = Column(Numeric(16, 2), nullable=False, default=0)
+
+
+class AnalyticsDeltaDB(Base):
+    """
+    Deltas d'agrégats en attente, insérés par les écritures (jamais mis à jour:
+    aucun verrou sur analytics_rollup dans les transactions métier), puis
+    reportés périodiquement dans analytics_rollup
+    """
+    __tablename__ = "analytics_rollup_deltas"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    metrique = Column(String(30), nullable=False)
+    cle = Column(String(50), nullable=False)
+    valeur = Column(Numeric(16, 2), nullable=False)
@@ -0,0 +1,225 @@
+# backend/query_plans.py
+
+"""
+Vérification des plans d'exécution des requêtes des routes de lecture.
+Les routes GET sont appelées sur une base seedée; chaque SELECT émis (moteurs
+sync et async) est rejoué en EXPLAIN au moment même de son exécution, avec
+le texte et les paramètres du driver, sur un curseur séparé de la connexion.
+Échec si une table est parcourue séquentiellement:
+- SQLite: EXPLAIN QUERY PLAN, ligne « SCAN <table> » sans index;
+- PostgreSQL: EXPLAIN (FORMAT JSON) avec enable_seqscan=off (sinon le
+  planificateur préfère le Seq Scan sur une base de test de quelques lignes),
+  nœud « Seq Scan » restant.
+Les exports (lecture complète par construction) ne sont pas vérifiés.
+
+Usage (depuis la racine; base SQLite temporaire si DATABASE_URL est absent):
+    python -m backend.query_plans
+"""
+
+import json
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Tables lues en entier par construction: pas de prédicat à indexer
+FULL_SCAN_ALLOWED = {
+    "conseillers": "liste complète des conseillers (quelques dizaines de lignes)",
+    "analytics_rollup": "agrégats pré-calculés lus en entier par /analytics/overview",
+    "analytics_rollup_deltas": "deltas pas encore reportés, vidés par le compactage périodique",
+}
+
+ROUTES = [
+    "/api/v1/sinistres",
+    "/api/v1/sinistres?cursor=",
+    "/api/v1/sinistres?cursor={sinistres_cursor}",
+    "/api/v1/sinistres/{sinistre_id}",
+    "/api/v1/sinistres/{sinistre_id}/suivi",
+    "/api/v1/contrats",
+    "/api/v1/contrats?cursor=",
+    "/api/v1/remboursements",
+    "/api/v1/remboursements?cursor=",
+    "/api/v1/escalades",
+    "/api/v1/escalades?cursor=",
+    "/api/v1/escalades/queue",
+    "/api/v1/conseillers",
+    "/api/v1/analytics/overview",
+    "/api/v1/clients",
+    "/api/v1/clients?cursor=",
+    "/api/v1/clients/{matricule}",
+    "/api/v1/clients/{client_id}/sinistres",
+]
+
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(.*)$")
+_ALIAS = re.compile(r"\b(\w+) AS (\w+)\b")
+
+
+def _table_names():
+    from backend.models import Base
+    return set(Base.metadata.tables)
+
+
+def _sqlite_scans(details: List[str], statement: str) -> List[str]:
+    """Tables parcourues sans index (les alias de SQLAlchemy sont ramenés à leur table)"""
+    aliases = {alias: table for table, alias in _ALIAS.findall(statement)}
+    tables = _table_names()
+    scans = []
+    for detail in details:
+        match = _SQLITE_SCAN.match(detail)
+        if not match or "USING" in match.group(3):  # USING (COVERING) INDEX / INTEGER PRIMARY KEY
+            continue
+        name = match.group(1)
+        table = aliases.get(name, name)
+        if table in tables and table not in FULL_SCAN_ALLOWED:
+            scans.append(table)
+    return scans
+
+
+def _postgres_scans(node: Dict[str, Any]) -> List[str]:
+    scans = []
+    if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") not in FULL_SCAN_ALLOWED:
+        scans.append(node["Relation Name"])
+    for child in node.get("Plans", []):
+        scans.extend(_postgres_scans(child))
+    return scans
+
+
+def explain(connection, statement: str, parameters) -> Dict[str, Any]:
+    """EXPLAIN de `statement` sur un curseur séparé: celui de la requête n'est pas touché"""
+    cursor = connection.connection.cursor()
+    try:
+        if connection.dialect.name == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            details = [row[3] for row in cursor.fetchall()]
+            return {"plan": details, "scans": _sqlite_scans(details, statement)}
+
+        cursor.execute("SET enable_seqscan = off")
+        try:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+        finally:
+            cursor.execute("RESET enable_seqscan")
+        if isinstance(plan, str):  # asyncpg renvoie le JSON brut
+            plan = json.loads(plan)
+        return {"plan": plan, "scans": _postgres_scans(plan[0]["Plan"])}
+    finally:
+        cursor.close()
+
+
+def seed_plan_data(db) -> None:
+    """Clients et conseillers de démo, puis sinistres, remboursements, actions et escalades pour chacun"""
+    from backend.models import ClientDB, SinistreDB, RemboursementDB, ActionRecommandeeDB, EscaladeDB, ConseillerDB
+    from backend.seeds.seed_data import seed_clients, seed_conseillers
+
+    seed_clients(db)
+    seed_conseillers(db)
+    conseiller = db.query(ConseillerDB).first()
+    for i, client in enumerate(db.query(ClientDB).all()):
+        for j, status in enumerate(("nouveau", "en_cours", "fermé")):
+            sinistre = SinistreDB(
+                client_id=client.id, numero_sinistre=f"SINS-PLAN-{i:03d}-{j}", type_sinistre="collision",
+                date_sinistre=date(2026, 1, 15), description="plan", status_dossier=status, cci_score=30 * j
+            )
+            db.add(sinistre)
+            db.flush()
+            db.add(RemboursementDB(sinistre_id=sinistre.id, montant_reclame=1000 + j))
+            db.add(ActionRecommandeeDB(sinistre_id=sinistre.id, action="Fournir le constat", status="en_attente"))
+            db.add(EscaladeDB(
+                sinistre_id=sinistre.id, conseiller_id=conseiller.id if conseiller else None,
+                raison_escalade="CCI > 60", cci_score_trigger=30 * j, status="en_attente"
+            ))
+    db.commit()
+
+
+def route_params(db, api) -> Dict[str, str]:
+    """Valeurs des chemins de ROUTES: un dossier ouvert, son client, un curseur de 2e page"""
+    from backend.models import SinistreDB
+
+    sinistre = db.query(SinistreDB).filter(SinistreDB.status_dossier != "fermé").first()
+    if sinistre is None:
+        raise RuntimeError("Base sans sinistre ouvert: lancer sans DATABASE_URL pour une base seedée")
+    first_page = api.get("/api/v1/sinistres", params={"cursor": "", "limit": 1}).json()
+    return {
+        "sinistre_id": str(sinistre.id),
+        "client_id": str(sinistre.client_id),
+        "matricule": sinistre.client.matricule,
+        "sinistres_cursor": first_page["next_cursor"] or "",
+    }
+
+
+def build_api():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.routers import advisor, clients, operations
+
+    app = FastAPI()
+    app.include_router(clients.router)
+    app.include_router(operations.router)
+    app.include_router(advisor.router)
+    return TestClient(app)
+
+
+def check_routes(api, routes: List[str], params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """Appelle chaque route et renvoie [{route, statement, plan, scans}] pour chaque SELECT distinct"""
+    from backend.services.suivi_cache import suivi_cache
+
+    results: List[Dict[str, Any]] = []
+    seen = set()
+    current = {"route": None}
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        if executemany or statement in seen or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+        seen.add(statement)
+        results.append({"route": current["route"], "statement": statement, **explain(conn, statement, parameters)})
+
+    suivi_cache.clear()  # Un hit ne toucherait pas la base
+    # Au niveau de la classe Engine: couvre aussi le moteur synchrone sous-jacent à l'async
+    event.listen(Engine, "before_cursor_execute", _on_execute)
+    try:
+        for route in routes:
+            current["route"] = route.format(**(params or {}))
+            response = api.get(current["route"])
+            if response.status_code >= 400:
+                raise RuntimeError(f"{current['route']}: HTTP {response.status_code} {response.text[:200]}")
+    finally:
+        event.remove(Engine, "before_cursor_execute", _on_execute)
+    return results
+
+
+def main() -> int:
+    from backend.database import engine, SessionLocal
+    from backend.migrations import run_migrations
+    from backend.models import SinistreDB
+
+    run_migrations(engine)
+    with SessionLocal() as db:
+        if not db.query(SinistreDB).first():
+            seed_plan_data(db)
+        api = build_api()
+        results = check_routes(api, ROUTES, route_params(db, api))
+
+    failures = [r for r in results if r["scans"]]
+    print(f"🔎 {len(results)} requêtes distinctes sur {len(ROUTES)} routes ({engine.dialect.name})")
+    for r in failures:
+        print(f"\n❌ {r['route']}: parcours séquentiel de {', '.join(sorted(set(r['scans'])))}")
+        print(f"   {r['statement'][:300]}")
+        print(f"   plan: {r['plan']}")
+    if not failures:
+        print("✅ Aucun parcours séquentiel")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    # python -m backend.query_plans (depuis la racine, backend/ dans le PYTHONPATH)
+    import os
+    import sys
+    import tempfile
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='query_plans_')}/plans.db"
+    sys.exit(main())
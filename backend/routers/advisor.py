@@ -1,68 +1,75 @@
 # backend/routers/advisor.py
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import asyncio
 
-from backend.database import get_db
-from backend.models import EscaladeDB, SinistreDB, ClientDB, ConseillerDB
+from fastapi import APIRouter, Depends, Response, WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-router = APIRouter(prefix="/api/v1", tags=["Advisor"])
+from backend.database_async import get_async_db, async_session_scope
+from backend.models import ConseillerDB
+from backend.services.event_bus import event_bus
+from backend.services.escalation_queue import QUEUE_TOPIC, queue_statement, queue_item
+from backend.services.resource_versions import conditional
+from backend.services.serialization import FastJSONResponse, json_response, row_serializer
 
+router = APIRouter(prefix="/api/v1", tags=["Advisor"], default_response_class=FastJSONResponse)
+# WebSockets hors préfixe /api/v1, comme /ws/conversation
+ws_router = APIRouter(tags=["Advisor"])
 
-@router.get("/escalades/queue")
-async def get_escalades_queue(db: Session = Depends(get_db)):
-    """Retourne la file d'escalades en attente."""
-    escalades = db.query(EscaladeDB).filter(EscaladeDB.status == "en_attente").all()
+_conseiller_row = row_serializer("id", "nom", "prenom", "email", "statut", "nombre_dossiers_actifs", "capacite_max")
 
-    results = []
-    for e in escalades:
-        sinistre = db.query(SinistreDB).filter(SinistreDB.id == e.sinistre_id).first()
-        client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first() if sinistre else None
-        conseiller = db.query(ConseillerDB).filter(ConseillerDB.id == e.conseiller_id).first() if e.conseiller_id else None
 
-        results.append({
-            "escalade_id": str(e.id),
-            "status": e.status,
-            "raison": e.raison_escalade,
-            "cci_score": e.cci_score_trigger,
-            "date_escalade": e.date_escalade,
-            "sinistre": {
-                "id": str(sinistre.id) if sinistre else None,
-                "numero": sinistre.numero_sinistre if sinistre else None,
-                "type": sinistre.type_sinistre if sinistre else None,
-                "status": sinistre.status_dossier if sinistre else None,
-            },
-            "client": {
-                "id": str(client.id) if client else None,
-                "matricule": client.matricule if client else None,
-                "nom": client.nom if client else None,
-                "prenom": client.prenom if client else None,
-                "telephone": client.telephone if client else None,
-            },
-            "conseiller": {
-                "id": str(conseiller.id) if conseiller else None,
-                "nom": conseiller.nom if conseiller else None,
-                "prenom": conseiller.prenom if conseiller else None,
-                "email": conseiller.email if conseiller else None,
-            } if conseiller else None
+@router.get("/escalades/queue", dependencies=[conditional("escalades", "sinistres", "clients", "conseillers")])
+async def get_escalades_queue(response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Retourne la file d'escalades en attente (CCI décroissant, puis plus ancienne d'abord)."""
+    rows = (await db.execute(queue_statement())).all()
+    results = [queue_item(*row) for row in rows]
+    return json_response({"count": len(results), "items": results}, response)
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    """Lit la socket jusqu'à la déconnexion (les messages entrants sont ignorés)"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@ws_router.websocket("/ws/escalades/queue")
+async def escalades_queue_stream(websocket: WebSocket):
+    """
+    Instantané de la file puis deltas {"type": "upsert"|"remove", "escalade_id", "item"}.
+    L'abonnement précède l'instantané: un delta peut le recouvrir, il s'applique
+    de façon idempotente par escalade_id. Sur {"type": "resync"}, recharger la file.
+    """
+    await websocket.accept()
+    with event_bus.subscribe([QUEUE_TOPIC]) as subscription:
+        async with async_session_scope() as db:
+            rows = (await db.execute(queue_statement())).all()
+        await websocket.send_json({
+            "type": "snapshot",
+            "seq": event_bus.last_seq,
+            "items": [queue_item(*row) for row in rows]
         })
 
-    return {"count": len(results), "items": results}
+        disconnected = asyncio.create_task(_wait_disconnect(websocket))
+        try:
+            while True:
+                next_event = asyncio.create_task(subscription.get())
+                done, _ = await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnected in done:
+                    next_event.cancel()
+                    break
+                await websocket.send_json(next_event.result())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            disconnected.cancel()
 
 
 @router.get("/conseillers")
-async def list_conseillers(db: Session = Depends(get_db)):
+async def list_conseillers(db: AsyncSession = Depends(get_async_db)):
     """Liste des conseillers."""
-    conseillers = db.query(ConseillerDB).all()
-    return [
-        {
-            "id": str(c.id),
-            "nom": c.nom,
-            "prenom": c.prenom,
-            "email": c.email,
-            "statut": c.statut,
-            "nombre_dossiers_actifs": c.nombre_dossiers_actifs,
-            "capacite_max": c.capacite_max
-        }
-        for c in conseillers
-    ]
+    conseillers = (await db.execute(select(ConseillerDB))).scalars().all()
+    return json_response([_conseiller_row(c) for c in conseillers])
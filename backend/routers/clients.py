@@ -1,25 +1,44 @@
 # backend/routers/clients.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 from uuid import UUID
 from datetime import datetime
+from typing import Union
 
 from backend.database import get_db
-from backend.models import ClientDB, SinistreDB, RemboursementDB, ContratDB, ActionRecommandeeDB, ConseillerDB, EscaladeDB
-from backend.schemas.schemas import ClientResponse, ClientCreate, SinistreResponse, SuiviDossierResponse, ActionTimelineItem, RemboursementResponse
+from backend.database_async import get_async_db
+from backend.models import ClientDB, SinistreDB, RemboursementDB, EscaladeDB
+from backend.models.db_models import normalize_matricule
+from backend.schemas.schemas import ClientResponse, ClientPageResponse, ClientCreate, SinistreResponse, SuiviDossierResponse, ActionTimelineItem, RemboursementResponse
+from backend.services.matricules import find_client_by_matricule, find_client_by_matricule_async
+from backend.services.claim_numbers import get_claim_number_allocator
+from backend.services.suivi_cache import suivi_cache
+from backend.services.pagination import cursor_param, ordered, keyset_page
+from backend.services.resource_versions import conditional
+from backend.services.serialization import FastJSONResponse, json_response, row_serializer
 
-router = APIRouter(prefix="/api/v1", tags=["Clients"])
+router = APIRouter(prefix="/api/v1", tags=["Clients"], default_response_class=FastJSONResponse)
+
+# Mêmes champs que les schémas de réponse, lus directement sur les lignes ORM
+_client_row = row_serializer(*ClientResponse.model_fields)
+_sinistre_row = row_serializer(*SinistreResponse.model_fields)
+
+
+def _earliest(rows, attr):
+    """Plus ancienne ligne d'une collection chargée (None si vide)"""
+    return min(rows, key=lambda r: (getattr(r, attr) is None, getattr(r, attr) or datetime.min), default=None)
 
 
 # ============================================================
 # GET CLIENT BY MATRICULE (PHASE 1: AUTH)
 # ============================================================
 @router.get("/clients/{matricule}", response_model=ClientResponse)
-async def get_client_by_matricule(matricule: str, db: Session = Depends(get_db)):
+async def get_client_by_matricule(matricule: str, db: AsyncSession = Depends(get_async_db)):
     """Récupère client par matricule pour PHASE 1: AUTHENTIFICATION"""
-    client = db.query(ClientDB).filter(ClientDB.matricule == matricule).first()
+    client = await find_client_by_matricule_async(db, matricule)
     
     if not client:
         raise HTTPException(
@@ -27,13 +46,13 @@ async def get_client_by_matricule(matricule: str, db: Session = Depends(get_db))
             detail=f"Client {matricule} non trouvé"
         )
     
-    return client
+    return json_response(_client_row(client))
 
 
 @router.post("/clients", response_model=ClientResponse)
-async def create_client(client: ClientCreate, db: Session = Depends(get_db)):
+def create_client(client: ClientCreate, db: Session = Depends(get_db)):
     """Créer un nouveau client"""
-    existing = db.query(ClientDB).filter(ClientDB.matricule == client.matricule).first()
+    existing = find_client_by_matricule(db, client.matricule)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -51,21 +70,23 @@ async def create_client(client: ClientCreate, db: Session = Depends(get_db)):
 # GET CLIENT DOSSIERS ACTIFS
 # ============================================================
 @router.get("/clients/{client_id}/sinistres", response_model=list[SinistreResponse])
-async def get_client_sinistres(client_id: UUID, db: Session = Depends(get_db)):
+async def get_client_sinistres(client_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Récupère sinistres actifs du client"""
-    sinistres = db.query(SinistreDB).filter(
-        SinistreDB.client_id == client_id,
-        SinistreDB.status_dossier != "fermé"
-    ).order_by(desc(SinistreDB.date_creation)).all()
+    sinistres = (await db.execute(
+        select(SinistreDB).where(
+            SinistreDB.client_id == client_id,
+            SinistreDB.status_dossier != "fermé"
+        ).order_by(desc(SinistreDB.date_creation))
+    )).scalars().all()
     
-    return sinistres
+    return json_response([_sinistre_row(s) for s in sinistres])
 
 
 # ============================================================
 # CREATE SINISTRE (PHASE 5: DECISION)
 # ============================================================
 @router.post("/sinistres", response_model=SinistreResponse)
-async def create_sinistre(
+def create_sinistre(
     client_id: UUID,
     type_sinistre: str,
     date_sinistre: str,
@@ -77,9 +98,12 @@ async def create_sinistre(
     """Créer sinistre après PHASE 5"""
     from datetime import datetime as dt
     
-    # Générer numéro sinistre
     client = db.query(ClientDB).filter(ClientDB.id == client_id).first()
-    numero_sinistre = f"SINS-{client.matricule}-{dt.now().strftime('%y%m%d%H%M%S')}"
+    if not client:
+        raise HTTPException(status_code=404, detail="Client non trouvé")
+
+    # Générer numéro sinistre (après la vérification: pas de numéro consommé pour rien)
+    numero_sinistre = get_claim_number_allocator().next_number()
     
     db_sinistre = SinistreDB(
         client_id=client_id,
@@ -113,23 +137,35 @@ async def create_sinistre(
 # SUIVI DOSSIER (PHASE 7)
 # ============================================================
 @router.get("/sinistres/{sinistre_id}/suivi", response_model=SuiviDossierResponse)
-async def suivi_dossier(sinistre_id: UUID, db: Session = Depends(get_db)):
+async def suivi_dossier(sinistre_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Récupère état complet dossier - PHASE 7: SUIVI"""
-    sinistre = db.query(SinistreDB).filter(SinistreDB.id == sinistre_id).first()
+    cached = suivi_cache.get(sinistre_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Sinistre, client, contrats, remboursements, actions, escalades et conseillers: un seul SELECT
+    token = suivi_cache.begin()
+    sinistre = (await db.execute(
+        select(SinistreDB)
+        .where(SinistreDB.id == sinistre_id)
+        .options(
+            joinedload(SinistreDB.client).joinedload(ClientDB.contrats),
+            joinedload(SinistreDB.remboursements),
+            joinedload(SinistreDB.actions),
+            joinedload(SinistreDB.escalades).joinedload(EscaladeDB.conseiller)
+        )
+    )).unique().scalars().first()
     
     if not sinistre:
         raise HTTPException(status_code=404, detail="Sinistre non trouvé")
     
-    # Remboursement
-    remboursement = db.query(RemboursementDB).filter(
-        RemboursementDB.sinistre_id == sinistre_id
-    ).first()
+    remboursement = _earliest(sinistre.remboursements, "date_creation")
+    escalade = _earliest(sinistre.escalades, "date_escalade")
+    client = sinistre.client
+    contrat = _earliest(client.contrats, "date_debut") if client else None
     
     # Actions
-    actions = db.query(ActionRecommandeeDB).filter(
-        ActionRecommandeeDB.sinistre_id == sinistre_id,
-        ActionRecommandeeDB.status != "completée"
-    ).all()
+    actions = [a for a in sinistre.actions if a.status != "completée"]
     
     # Timeline
     timeline_actions = [
@@ -142,9 +178,8 @@ async def suivi_dossier(sinistre_id: UUID, db: Session = Depends(get_db)):
     ]
     
     # Ajouter escalade si applicable
-    escalade = db.query(EscaladeDB).filter(EscaladeDB.sinistre_id == sinistre_id).first()
     if escalade and escalade.date_transfert:
-        conseiller = db.query(ConseillerDB).filter(ConseillerDB.id == escalade.conseiller_id).first()
+        conseiller = escalade.conseiller
         if conseiller:
             timeline_actions.append(
                 ActionTimelineItem(
@@ -167,9 +202,6 @@ async def suivi_dossier(sinistre_id: UUID, db: Session = Depends(get_db)):
         )
     
     # Garanties
-    client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first()
-    contrat = db.query(ContratDB).filter(ContratDB.client_id == client.id).first()
-    
     garanties_applicables = []
     if contrat:
         if contrat.garantie_collision:
@@ -204,7 +236,7 @@ async def suivi_dossier(sinistre_id: UUID, db: Session = Depends(get_db)):
             date_paiement=remboursement.date_paiement
         )
     
-    return SuiviDossierResponse(
+    response = SuiviDossierResponse(
         numero_sinistre=sinistre.numero_sinistre,
         type_sinistre=sinistre.type_sinistre,
         date_declaration=sinistre.date_creation.date(),
@@ -215,25 +247,44 @@ async def suivi_dossier(sinistre_id: UUID, db: Session = Depends(get_db)):
         actions_client=[{"action": a.action, "date_limite": a.date_limite} for a in actions],
         messages_recents=[]
     )
+    content = response.model_dump_json().encode()
+    suivi_cache.put(
+        sinistre_id, content, token,
+        client_id=sinistre.client_id, conseiller_ids=[e.conseiller_id for e in sinistre.escalades]
+    )
+    return Response(content=content, media_type="application/json")
 
 
 # ============================================================
 # CRUD OPERATIONS FOR ADVISOR DASHBOARD
 # ============================================================
-@router.get("/clients", response_model=list[ClientResponse])
-async def list_all_clients(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Liste tous les clients (pour dashboard advisor)"""
-    clients = db.query(ClientDB).offset(skip).limit(limit).all()
-    return clients
+@router.get("/clients", response_model=Union[list[ClientResponse], ClientPageResponse], dependencies=[conditional("clients")])
+def list_all_clients(response: Response, skip: int = 0, limit: int = 100, cursor=Depends(cursor_param), db: Session = Depends(get_db)):
+    """Liste tous les clients (pour dashboard advisor); page par curseur si `cursor` est fourni"""
+    if cursor is None:
+        clients = ordered(db.query(ClientDB), ClientDB.date_creation, ClientDB.id).offset(skip).limit(limit).all()
+        return json_response([_client_row(c) for c in clients], response)
+    clients, next_cursor = keyset_page(db.query(ClientDB), ClientDB.date_creation, ClientDB.id, cursor, limit)
+    return json_response({"items": [_client_row(c) for c in clients], "next_cursor": next_cursor}, response)
 
 
 @router.put("/clients/{client_id}", response_model=ClientResponse)
-async def update_client(client_id: UUID, client_update: ClientCreate, db: Session = Depends(get_db)):
+def update_client(client_id: UUID, client_update: ClientCreate, db: Session = Depends(get_db)):
     """Mettre à jour un client"""
     db_client = db.query(ClientDB).filter(ClientDB.id == client_id).first()
     if not db_client:
         raise HTTPException(status_code=404, detail="Client non trouvé")
     
+    duplicate = db.query(ClientDB.id).filter(
+        ClientDB.matricule_normalized == normalize_matricule(client_update.matricule),
+        ClientDB.id != client_id
+    ).first()
+    if duplicate:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Matricule déjà existant"
+        )
+    
     for key, value in client_update.dict(exclude_unset=True).items():
         setattr(db_client, key, value)
     
@@ -243,7 +294,7 @@ async def update_client(client_id: UUID, client_update: ClientCreate, db: Sessio
 
 
 @router.delete("/clients/{client_id}")
-async def delete_client(client_id: UUID, db: Session = Depends(get_db)):
+def delete_client(client_id: UUID, db: Session = Depends(get_db)):
     """Supprimer un client"""
     db_client = db.query(ClientDB).filter(ClientDB.id == client_id).first()
     if not db_client:
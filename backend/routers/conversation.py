@@ -1,11 +1,20 @@
 # backend/routers/conversation.py
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import itertools
 import json
 import logging
+import os
 import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 from decimal import Decimal
@@ -13,20 +22,40 @@ from decimal import Decimal
 # Import from parent directory
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from backend.database import get_db, SessionLocal
+from backend.database_async import get_async_db, async_session_scope
 from backend.models import (
-    ClientDB, SinistreDB, HistoriqueConversationDB, RemboursementDB,
-    ActionRecommandeeDB, ConseillerDB, EscaladeDB, ContratDB
+    SinistreDB, HistoriqueConversationDB, RemboursementDB,
+    ActionRecommandeeDB, EscaladeDB, ContratDB
 )
 from backend.schemas.schemas import ConversationPhaseResponse, MessageRequest
+from backend.services.matricules import find_client_by_matricule_async, matricule_index
+from backend.services.session_store import create_session_store
+from backend.services.claim_numbers import get_claim_number_allocator
+from backend.services.advisor_load import assign_advisor
+from backend.services.escalation_queue import queue_statement, queue_item, publish_queue_change
+from backend.services.turn_history import TurnHistoryBuffer
 from modules.conversation_manager_crm import ConversationManager
 from modules.tts_module import TTSEngine
+from modules.prompt_catalogue import PromptCatalogue
+from modules.timing import span, start_turn, current_turn, registry as timing_registry
 
 router = APIRouter(tags=["Conversation"])
 logger = logging.getLogger(__name__)
 
-active_conversations = {}
+session_store = create_session_store()
+turn_history = TurnHistoryBuffer()
 tts_engine = TTSEngine(language="fr", voice="george")
+prompt_catalogue = PromptCatalogue(tts_engine, tone="professional")
+
+# Synthèse TTS hors de la boucle d'événements (pool borné, partagé par toutes les sessions)
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "4"))
+TTS_MAX_PENDING = int(os.getenv("TTS_MAX_PENDING", "32"))
+AUDIO_DRAIN_TIMEOUT = float(os.getenv("TTS_DRAIN_TIMEOUT", "20"))
+AUDIO_STREAM_QUEUE = 8  # Morceaux en vol entre le thread TTS et la socket
+# Durées par étape jointes à chaque message (aussi activable par ?timings=1)
+DEBUG_TIMINGS = os.getenv("CONVERSATION_DEBUG_TIMINGS", "0").lower() in ("1", "true")
+tts_executor = ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS, thread_name_prefix="tts")
+_tts_pending = 0
 
 
 def extract_and_normalize_matricule(text: str) -> list:
@@ -99,29 +128,258 @@ def extract_and_normalize_matricule(text: str) -> list:
     return formats
 
 
+def audio_url_for(filename: str) -> str:
+    """URL publique d'un fichier servi par /audio/{filename}"""
+    return f"http://localhost:8000/audio/{filename}"
+
+
 def generate_audio_url(text: str) -> str:
     """Generate audio file and return URL"""
     try:
         audio_path = tts_engine.synthesize(text, tone="professional")
         if audio_path:
             filename = Path(audio_path).name
-            return f"http://localhost:8000/audio/{filename}"
+            return audio_url_for(filename)
     except Exception as e:
         logger.error(f"TTS Error: {e}")
     return None
 
 
+@asynccontextmanager
+async def timed_session(name: str):
+    """async_session_scope() chronométré (emprunt, requêtes, commit)"""
+    with span(name):
+        async with async_session_scope() as db:
+            yield db
+
+
+def catalogue_audio_url(text) -> Optional[str]:
+    """URL de l'audio pré-rendu d'un prompt fixe, sans synthèse"""
+    filename = prompt_catalogue.lookup(text if isinstance(text, str) else None)
+    return audio_url_for(filename) if filename else None
+
+
+class ConversationChannel:
+    """
+    Canal d'envoi d'une session WebSocket.
+    Le texte part immédiatement; l'audio est synthétisé dans le pool TTS
+    puis livré dans une trame `audio_ready` portant le même message_id.
+    En mode flux (opt-in ?audio_stream=1), l'audio part en trames binaires
+    encadrées par `audio_stream_start` / `audio_stream_end`.
+    Chaque message envoyé est déposé dans l'historique avec l'entrée client
+    du tour (audio différé: une fois son URL connue).
+    En mode debug_timings, chaque message porte les durées du tour par étape.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        stream_audio: bool = False,
+        history: Optional[TurnHistoryBuffer] = None,
+        debug_timings: bool = False
+    ):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.stream_audio = stream_audio
+        self.history = history
+        self.debug_timings = debug_timings
+        self._turn_started: Optional[float] = None
+        self.state: Optional[dict] = None
+        self._turn: dict = {}
+        self._send_lock = asyncio.Lock()
+        self._stream_lock = asyncio.Lock()
+        self._message_ids = itertools.count(1)
+        self._pending_audio = set()
+
+    def begin_turn(self, message_user: str, stt_confidence: Optional[float] = None, audio_url_user: Optional[str] = None):
+        """Entrée client du tour en cours, jointe au prochain message envoyé"""
+        start_turn()
+        self._turn_started = time.perf_counter()
+        self._turn = {
+            "message_user": message_user,
+            "stt_confidence": stt_confidence,
+            "audio_url_user": audio_url_user
+        }
+
+    def _snapshot_turn(self, payload: dict) -> Optional[dict]:
+        if self.history is None:
+            return None
+        turn, self._turn = self._turn, {}
+        message = payload.get("message")
+        if isinstance(message, dict):
+            message = message.get("message")
+        state = self.state or {}
+        turn.update(
+            phase=payload.get("phase"),
+            message_bot=message,
+            contexte=state.get("contexte"),
+            sinistre_id=UUID(state["sinistre_id"]) if state.get("sinistre_id") else None,
+            date_message=datetime.utcnow()
+        )
+        return turn
+
+    def _record_turn(self, turn: Optional[dict], audio_url: Optional[str]):
+        if turn is not None:
+            self.history.record(self.session_id, audio_url_bot=audio_url, **turn)
+
+    async def send_json(self, payload: dict):
+        """Envoi sérialisé (texte et audio différé partagent la socket)"""
+        if self.debug_timings and current_turn() is not None:
+            payload["timings"] = dict(current_turn())
+        with span("ws.send"):
+            async with self._send_lock:
+                await self.websocket.send_json(payload)
+
+    async def send(self, payload: dict, speech_text: Optional[str] = None) -> int:
+        """Envoie un message; si speech_text est fourni, l'audio suit en différé"""
+        message_id = next(self._message_ids)
+        payload["message_id"] = message_id
+
+        # Prompt du catalogue: audio déjà rendu, servi directement
+        prerendered_url = catalogue_audio_url(speech_text)
+        if prerendered_url:
+            payload["audio_url"] = prerendered_url
+            speech_text = None
+
+        if speech_text:
+            payload["audio_url"] = None
+            payload["audio_pending"] = True
+        turn = self._snapshot_turn(payload)
+        if self._turn_started is not None:
+            # Latence perçue: de la réception du client au premier message de réponse
+            elapsed = time.perf_counter() - self._turn_started
+            self._turn_started = None
+            timing_registry.observe("ws.turn", elapsed)
+            current_turn()["ws.turn"] = round(elapsed * 1000, 3)
+        await self.send_json(payload)
+
+        if not speech_text:
+            self._record_turn(turn, payload.get("audio_url"))
+        else:
+            task = asyncio.create_task(self._deliver_audio(message_id, payload.get("phase"), speech_text, turn))
+            self._pending_audio.add(task)
+            task.add_done_callback(self._pending_audio.discard)
+        return message_id
+
+    async def _deliver_audio(self, message_id: int, phase: Optional[str], text: str, turn: Optional[dict] = None):
+        global _tts_pending
+        audio_url = None
+        try:
+            if _tts_pending >= TTS_MAX_PENDING:
+                logger.warning(f"⚠️ File TTS saturée ({_tts_pending}), audio ignoré pour {self.session_id}")
+            else:
+                _tts_pending += 1
+                try:
+                    if self.stream_audio:
+                        with span("ws.tts_stream"):
+                            audio_url = await self._stream_audio(message_id, phase, text)
+                        return
+                    loop = asyncio.get_running_loop()
+                    with span("ws.tts"):
+                        audio_url = await loop.run_in_executor(tts_executor, generate_audio_url, text)
+                finally:
+                    _tts_pending -= 1
+
+            try:
+                await self.send_json({
+                    "type": "audio_ready",
+                    "phase": phase,
+                    "message_id": message_id,
+                    "audio_url": audio_url
+                })
+            except Exception as e:
+                logger.info(f"Audio non livré ({self.session_id}): {e}")
+        finally:
+            # Tour historisé même si la socket a fermé entre-temps
+            self._record_turn(turn, audio_url)
+
+    async def _stream_audio(self, message_id: int, phase: Optional[str], text: str) -> Optional[str]:
+        """Relaie les morceaux TTS en trames binaires dès leur arrivée; retourne l'URL du fichier complet"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=AUDIO_STREAM_QUEUE)
+        stopped = threading.Event()
+        stream = tts_engine.synthesize_stream(text, tone="professional")
+
+        def produce():
+            chunks = iter(stream)
+            try:
+                for chunk in chunks:
+                    if stopped.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+            finally:
+                # Flux abandonné: le générateur nettoie (fichier partiel) dans ce thread
+                chunks.close()
+                asyncio.run_coroutine_threadsafe(queue.put(None), loop).result()
+
+        # Un seul flux binaire à la fois par socket (les trames ne portent pas d'identifiant)
+        async with self._stream_lock:
+            await self.send_json({
+                "type": "audio_stream_start",
+                "phase": phase,
+                "message_id": message_id,
+                "mime_type": "audio/mpeg"
+            })
+            producer = loop.run_in_executor(tts_executor, produce)
+            finished = False
+            audio_url = None
+            try:
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        finished = True
+                        break
+                    async with self._send_lock:
+                        await self.websocket.send_bytes(chunk)
+            except Exception as e:
+                logger.info(f"Flux audio interrompu ({self.session_id}): {e}")
+            finally:
+                # Client parti ou tâche annulée: libérer le thread producteur, qui
+                # termine toujours par None, puis récupérer son résultat
+                stopped.set()
+                while not finished:
+                    finished = await queue.get() is None
+                try:
+                    await producer
+                    if stream.path:
+                        audio_url = audio_url_for(Path(stream.path).name)
+                except Exception as e:
+                    logger.error(f"TTS stream error: {e}")
+
+            try:
+                await self.send_json({
+                    "type": "audio_stream_end",
+                    "phase": phase,
+                    "message_id": message_id,
+                    "audio_url": audio_url
+                })
+            except Exception as e:
+                logger.info(f"Fin de flux audio non livrée ({self.session_id}): {e}")
+            return audio_url
+
+    async def drain(self, timeout: float = AUDIO_DRAIN_TIMEOUT):
+        """Attendre la livraison des audios en cours (fin de conversation)"""
+        if self._pending_audio:
+            await asyncio.wait(set(self._pending_audio), timeout=timeout)
+
+    def cancel(self):
+        """Abandonner les audios en cours (client déconnecté)"""
+        for task in list(self._pending_audio):
+            task.cancel()
+
+
 # ============================================================
 # PHASE 1: AUTHENTIFICATION
 # ============================================================
 @router.post("/api/v1/conversation/authenticate")
-async def authenticate(payload: MessageRequest, db: Session = Depends(get_db)):
+async def authenticate(payload: MessageRequest, db: AsyncSession = Depends(get_async_db)):
     """Vérifier matricule - PHASE 1: AUTHENTIFICATION"""
     matricule = (payload.text or "").strip()
     if not matricule:
         raise HTTPException(status_code=400, detail="Matricule requis")
 
-    client = db.query(ClientDB).filter(ClientDB.matricule == matricule).first()
+    client = await find_client_by_matricule_async(db, matricule)
     
     if not client:
         return {
@@ -130,10 +388,12 @@ async def authenticate(payload: MessageRequest, db: Session = Depends(get_db)):
             "client": None
         }
     
-    active_sinistres = db.query(SinistreDB).filter(
-        SinistreDB.client_id == client.id,
-        SinistreDB.status_dossier != "fermé"
-    ).all()
+    active_sinistres = (await db.execute(
+        select(SinistreDB).where(
+            SinistreDB.client_id == client.id,
+            SinistreDB.status_dossier != "fermé"
+        )
+    )).scalars().all()
     
     return {
         "valide": True,
@@ -167,75 +427,108 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
     """WebSocket conversation - 7 PHASES"""
     await websocket.accept()
     logger.info(f"🔗 Client connecté: {session_id}")
-    db = SessionLocal()
+    stream_audio = websocket.query_params.get("audio_stream", "").lower() in ("1", "true")
+    debug_timings = DEBUG_TIMINGS or websocket.query_params.get("timings", "").lower() in ("1", "true")
+    channel = ConversationChannel(
+        websocket, session_id, stream_audio=stream_audio, history=turn_history, debug_timings=debug_timings
+    )
 
     try:
-        # Initialiser manager
-        conv_manager = ConversationManager(session_id)
-        active_conversations[session_id] = conv_manager
-
-        # État conversation
-        state = {
-            "phase": "AUTHENTIFICATION",
-            "client_id": None,
-            "client_data": None,
-            "sinistre_id": None,
-            "contexte": {
-                "questions": [],
-                "question_index": 0,
-                "details_reponses": []
+        saved = await session_store.aget(session_id)
+        if saved:
+            # Reconnexion (éventuellement sur un autre worker): reprendre où on en était
+            conv_manager = ConversationManager.from_dict(saved["manager"])
+            state = saved["state"]
+            logger.info(f"♻️ Session reprise: {session_id} (phase {state['phase']})")
+            resume_msg = conv_manager.reprendre_conversation()
+            await channel.send({
+                "phase": state["phase"],
+                "message": resume_msg,
+                "action": "reprise_conversation"
+            }, speech_text=resume_msg)
+        else:
+            # Initialiser manager
+            conv_manager = ConversationManager(session_id)
+
+            # État conversation (sérialisable JSON: client_id en chaîne)
+            state = {
+                "phase": "AUTHENTIFICATION",
+                "client_id": None,
+                "client_data": None,
+                "sinistre_id": None,
+                "contexte": {
+                    "questions": [],
+                    "question_index": 0,
+                    "details_reponses": []
+                }
             }
-        }
 
-        # PHASE 1: AUTHENTIFICATION - Demander matricule
-        greeting = conv_manager.get_greeting()
-        greeting_text = greeting.get("message")
-        await websocket.send_json({
-            "phase": "AUTHENTIFICATION",
-            "message": greeting_text,
-            "audio_url": generate_audio_url(greeting_text),
-            "action": "demander_matricule"
-        })
+            # PHASE 1: AUTHENTIFICATION - Demander matricule
+            greeting = conv_manager.get_greeting()
+            greeting_text = greeting.get("message")
+            await channel.send({
+                "phase": "AUTHENTIFICATION",
+                "message": greeting_text,
+                "action": "demander_matricule"
+            }, speech_text=greeting_text)
+
+        channel.state = state
 
         while True:
+            # Sauvegarder le tour précédent avant d'attendre le client
+            await session_store.aput(session_id, {"state": state, "manager": conv_manager.to_dict()})
+
             # Recevoir input utilisateur
             data = await websocket.receive_text()
             try:
                 user_input = json.loads(data)
                 user_text = user_input.get("text", "").strip()
             except json.JSONDecodeError:
+                user_input = {}
                 user_text = data.strip()
+            channel.begin_turn(
+                user_text,
+                stt_confidence=user_input.get("confidence"),
+                audio_url_user=user_input.get("audio_url")
+            )
 
             logger.info(f"📥 Phase {state['phase']}: {user_text[:50]}")
 
             # === PHASE 1: AUTHENTIFICATION ===
             if state["phase"] == "AUTHENTIFICATION":
                 # Extraire et normaliser le matricule
-                possible_formats = extract_and_normalize_matricule(user_text)
+                with span("ws.extract_matricule"):
+                    possible_formats = extract_and_normalize_matricule(user_text)
                 logger.info(f"🔍 Formats testés: {possible_formats}")
                 
+                # Tous les formats partagent la même forme canonique: une seule requête indexée
                 client = None
-                matched_format = None
-                
-                # Essayer chaque format
-                for format_test in possible_formats:
-                    client = db.query(ClientDB).filter(ClientDB.matricule == format_test).first()
-                    if client:
-                        matched_format = format_test
-                        logger.info(f"✅ Matricule trouvé: {matched_format}")
-                        break
+                matricule_approx = False
+                if possible_formats:
+                    async with timed_session("ws.db.lookup_client") as db:
+                        client = await find_client_by_matricule_async(db, possible_formats[0])
+                        if client:
+                            logger.info(f"✅ Matricule trouvé: {client.matricule}")
+                        else:
+                            # Matricule mal entendu: proposer le plus proche plutôt que redemander
+                            if not matricule_index.loaded:
+                                await db.run_sync(matricule_index.ensure_loaded)
+                            candidates = matricule_index.search(possible_formats[0], max_distance=2, limit=3)
+                            logger.info(f"🔎 Matricules proches: {candidates}")
+                            if candidates and (len(candidates) == 1 or candidates[0][0] < candidates[1][0]):
+                                client = await find_client_by_matricule_async(db, candidates[0][1])
+                                matricule_approx = client is not None
 
                 if not client:
-                    error_msg = "Je n'ai pas trouvé ce matricule. Pouvez-vous vérifier et réessayer?"
-                    await websocket.send_json({
+                    error_msg = conv_manager.matricule_introuvable()
+                    await channel.send({
                         "phase": "AUTHENTIFICATION",
                         "message": error_msg,
-                        "audio_url": generate_audio_url(error_msg),
                         "action": "redemander_matricule"
-                    })
+                    }, speech_text=error_msg)
                     continue
 
-                state["client_id"] = client.id
+                state["client_id"] = str(client.id)
                 state["client_data"] = {
                     "id": str(client.id),
                     "matricule": client.matricule,
@@ -245,13 +538,16 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
 
                 # Demander confirmation d'identité
                 state["phase"] = "CONFIRMATION"
-                confirm_msg = f"Merci! Vous êtes bien {client.nom} {client.prenom}?"
-                await websocket.send_json({
+                if matricule_approx:
+                    confirm_msg = conv_manager.proposer_matricule(client.matricule, client.nom, client.prenom)
+                else:
+                    confirm_msg = f"Merci! Vous êtes bien {client.nom} {client.prenom}?"
+                await channel.send({
                     "phase": "CONFIRMATION",
                     "message": confirm_msg,
-                    "audio_url": generate_audio_url(confirm_msg),
-                    "action": "confirmer_identite"
-                })
+                    "action": "confirmer_identite",
+                    "matricule_approx": matricule_approx
+                }, speech_text=confirm_msg)
                 continue
 
             # === PHASE CONFIRMATION IDENTITÉ ===
@@ -272,18 +568,20 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
                 }
                 if confirmation in positive_phrases or "it" in confirmation and "me" in confirmation:
                     # Si dossiers actifs, proposer suivi
-                    active_sinistres = db.query(SinistreDB).filter(
-                        SinistreDB.client_id == state["client_id"],
-                        SinistreDB.status_dossier != "fermé"
-                    ).all()
+                    async with timed_session("ws.db.active_sinistres") as db:
+                        active_sinistres = (await db.execute(
+                            select(SinistreDB).where(
+                                SinistreDB.client_id == UUID(state["client_id"]),
+                                SinistreDB.status_dossier != "fermé"
+                            )
+                        )).scalars().all()
+                        suivi_msg = conv_manager.suivi_dossier(active_sinistres, db) if active_sinistres else None
 
                     if active_sinistres:
                         state["phase"] = "SUIVI"
-                        suivi_msg = conv_manager.suivi_dossier(active_sinistres, db)
-                        await websocket.send_json({
+                        await channel.send({
                             "phase": "SUIVI",
                             "message": suivi_msg,
-                            "audio_url": generate_audio_url(suivi_msg),
                             "action": "suivi_dossier",
                             "sinistres": [
                                 {
@@ -294,39 +592,38 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
                                 }
                                 for s in active_sinistres
                             ]
-                        })
+                        }, speech_text=suivi_msg)
                         break
 
                     state["phase"] = "DESCRIPTION"
                     desc_prompt = conv_manager.ask_description()
-                    await websocket.send_json({
+                    await channel.send({
                         "phase": "DESCRIPTION",
                         "message": desc_prompt,
-                        "audio_url": generate_audio_url(desc_prompt),
                         "action": "demander_description"
-                    })
+                    }, speech_text=desc_prompt)
                 else:
                     state["phase"] = "AUTHENTIFICATION"
-                    retry_msg = "D'accord, recommençons. Quel est votre numéro de matricule?"
-                    await websocket.send_json({
+                    retry_msg = conv_manager.recommencer_authentification()
+                    await channel.send({
                         "phase": "AUTHENTIFICATION",
                         "message": retry_msg,
-                        "audio_url": generate_audio_url(retry_msg),
                         "action": "redemander_matricule"
-                    })
+                    }, speech_text=retry_msg)
                 continue
 
             # === PHASE 2: DESCRIPTION ===
             elif state["phase"] == "DESCRIPTION":
                 state["contexte"]["description"] = user_text
-                result = conv_manager.analyser_description(user_text)
+                with span("ws.manager"):
+                    result = conv_manager.analyser_description(user_text)
 
                 state["contexte"].update(result)
                 state["contexte"]["questions"] = result.get("next_questions", [])
                 state["contexte"]["question_index"] = 0
                 state["phase"] = "SINISTRE_DETAILS"
 
-                await websocket.send_json({
+                await channel.send({
                     "phase": "SINISTRE_DETAILS",
                     "message": result.get("message"),
                     "audio_url": None,
@@ -337,7 +634,8 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
             # === PHASE 3: SINISTRE_DETAILS ===
             elif state["phase"] == "SINISTRE_DETAILS":
                 state["contexte"]["details_reponses"].append(user_text)
-                cci_increment = conv_manager.calculer_cci_incremental(user_text)
+                with span("ws.manager"):
+                    cci_increment = conv_manager.calculer_cci_incremental(user_text)
                 state["contexte"]["cci_score"] = state["contexte"].get("cci_score", 0) + cci_increment
 
                 state["contexte"]["question_index"] += 1
@@ -345,20 +643,22 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
                 idx = state["contexte"].get("question_index", 0)
 
                 if idx < len(questions):
-                    await websocket.send_json({
+                    await channel.send({
                         "phase": "SINISTRE_DETAILS",
                         "message": questions[idx],
-                        "audio_url": None,
+                        "audio_url": catalogue_audio_url(questions[idx]),
                         "cci_score": state["contexte"].get("cci_score", 0)
                     })
                     continue
 
                 state["phase"] = "DOCUMENTS"
+                with span("ws.manager"):
+                    documents_request = conv_manager.demander_documents()
 
-                await websocket.send_json({
+                await channel.send({
                     "phase": "DOCUMENTS",
-                    "message": conv_manager.demander_documents(),
-                    "audio_url": None,
+                    "message": documents_request,
+                    "audio_url": catalogue_audio_url(documents_request.get("message")),
                     "cci_score": state["contexte"].get("cci_score", 0)
                 })
 
@@ -372,9 +672,10 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
                 type_traitement = "escalade" if final_cci > 60 else "autonome"
 
                 # Créer sinistre
-                numero_sinistre = f"SINS-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+                with span("ws.claim_number"):
+                    numero_sinistre = await get_claim_number_allocator().next_number_async()
                 sinistre = SinistreDB(
-                    client_id=state["client_id"],
+                    client_id=UUID(state["client_id"]),
                     numero_sinistre=numero_sinistre,
                     type_sinistre=state["contexte"].get("type_sinistre", "collision"),
                     date_sinistre=datetime.utcnow().date(),
@@ -384,30 +685,41 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
                     type_traitement=type_traitement,
                     documents_complets=True
                 )
-                db.add(sinistre)
-                db.commit()
-                db.refresh(sinistre)
+                # Sinistre + escalade éventuelle: une seule unité de travail
+                async with timed_session("ws.db.create_sinistre") as db:
+                    db.add(sinistre)
+                    await db.flush()
+
+                    if final_cci > 60:
+                        # Conseiller le moins chargé, spécialiste du type de sinistre si possible
+                        conseiller_id = await db.run_sync(assign_advisor, sinistre.type_sinistre)
+                        escalade = EscaladeDB(
+                            sinistre_id=sinistre.id,
+                            conseiller_id=conseiller_id,
+                            raison_escalade="CCI > 60",
+                            cci_score_trigger=final_cci,
+                            status="en_attente",
+                            date_escalade=datetime.utcnow()
+                        )
+                        db.add(escalade)
+
+                if final_cci > 60:
+                    # Pousser la nouvelle escalade aux conseillers connectés
+                    async with timed_session("ws.db.queue_item") as db:
+                        row = (await db.execute(queue_statement(escalade.id))).first()
+                    if row:
+                        publish_queue_change("created", escalade.id, queue_item(*row))
 
                 state["sinistre_id"] = str(sinistre.id)
+                turn_history.bind_sinistre(session_id, sinistre.id)
 
                 if final_cci > 60:
                     # ESCALADE
-                    conseiller = db.query(ConseillerDB).filter(ConseillerDB.statut == "disponible").first()
-                    escalade = EscaladeDB(
-                        sinistre_id=sinistre.id,
-                        conseiller_id=conseiller.id if conseiller else None,
-                        raison_escalade="CCI > 60",
-                        cci_score_trigger=final_cci,
-                        status="en_attente",
-                        date_escalade=datetime.utcnow()
-                    )
-                    db.add(escalade)
-                    db.commit()
-
-                    await websocket.send_json({
+                    transfert_msg = conv_manager.preparer_transfert(numero_sinistre)
+                    await channel.send({
                         "phase": "TRANSFERT",
-                        "message": conv_manager.preparer_transfert(numero_sinistre),
-                        "audio_url": None,
+                        "message": transfert_msg,
+                        "audio_url": catalogue_audio_url(transfert_msg),
                         "action": "transferer_conseiller",
                         "cci_score": final_cci,
                         "raison": "CCI > 60",
@@ -415,25 +727,33 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
                     })
                 else:
                     # AUTONOME
-                    await websocket.send_json({
+                    autonome_msg = conv_manager.suivi_message_autonome(numero_sinistre)
+                    await channel.send({
                         "phase": "SUIVI",
-                        "message": conv_manager.suivi_message_autonome(numero_sinistre),
-                        "audio_url": None,
+                        "message": autonome_msg,
                         "action": "fin_autonome",
                         "cci_score": final_cci,
                         "type_traitement": "autonome",
                         "sinistre_id": str(sinistre.id)
-                    })
+                    }, speech_text=autonome_msg)
 
                 break
 
+        # Conversation terminée: rien à reprendre
+        await session_store.adelete(session_id)
+
+        # Laisser partir les derniers audios avant de fermer la socket
+        await channel.drain()
+        await turn_history.flush()
+
     except WebSocketDisconnect:
+        # L'état reste dans le store jusqu'au TTL pour permettre une reconnexion
         logger.info(f"❌ Client déconnecté: {session_id}")
-        active_conversations.pop(session_id, None)
     except Exception as e:
         logger.error(f"❌ Erreur WebSocket: {e}")
+        await session_store.adelete(session_id)
         try:
-            await websocket.send_json({
+            await channel.send_json({
                 "phase": "ERROR",
                 "message": "Une erreur s'est produite",
                 "error": str(e)
@@ -441,4 +761,4 @@ async def websocket_conversation_endpoint(websocket: WebSocket, session_id: str)
         except:
             pass
     finally:
-        db.close()
+        channel.cancel()
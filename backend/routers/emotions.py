@@ -19,6 +19,8 @@ from pydantic import BaseModel
 
 from modules.emotion_analyzer import EmotionAnalyzer
 from modules.audio_recorder import AudioRecorder
+from backend.services.change_events import publish_change, EMOTIONS
+from backend.services.resource_versions import conditional_files
 
 router = APIRouter(prefix="/api/v1/emotions", tags=["Emotions"])
 
@@ -26,6 +28,15 @@ router = APIRouter(prefix="/api/v1/emotions", tags=["Emotions"])
 emotion_analyzer = EmotionAnalyzer()
 audio_recorder = AudioRecorder()
 
+# Répertoires lus par les routes de consultation: leur mtime fait l'ETag
+emotion_files = conditional_files(
+    Path("data/temp_audio"),
+    Path("data/recordings/metadata"),
+    audio_recorder.client_audio_dir,
+    audio_recorder.advisor_audio_dir,
+    audio_recorder.metadata_dir
+)
+
 
 class EmotionResponse(BaseModel):
     """Réponse d'analyse émotionnelle"""
@@ -105,6 +116,11 @@ async def analyze_emotion(
             result['dominant_emotion']['confidence']
         )
         
+        publish_change(
+            EMOTIONS, "created", sinistre_id=sinistre_id, client_id=client_id,
+            dominant_emotion=result['dominant_emotion']
+        )
+        
         return EmotionResponse(
             status="success",
             dominant_emotion=result['dominant_emotion'],
@@ -118,7 +134,7 @@ async def analyze_emotion(
         raise HTTPException(status_code=500, detail=f"Erreur analyse: {str(e)}")
 
 
-@router.get("/stats", response_model=EmotionStats)
+@router.get("/stats", response_model=EmotionStats, dependencies=[emotion_files])
 async def get_emotion_stats():
     """
     Statistiques globales des enregistrements et émotions
@@ -162,7 +178,7 @@ async def get_emotion_stats():
         raise HTTPException(status_code=500, detail=f"Erreur stats: {str(e)}")
 
 
-@router.get("/history/{sinistre_id}")
+@router.get("/history/{sinistre_id}", dependencies=[emotion_files])
 async def get_emotion_history(sinistre_id: str):
     """
     Historique émotionnel d'un sinistre spécifique
@@ -203,7 +219,7 @@ async def get_emotion_history(sinistre_id: str):
         raise HTTPException(status_code=500, detail=f"Erreur historique: {str(e)}")
 
 
-@router.get("/recent")
+@router.get("/recent", dependencies=[emotion_files])
 async def get_recent_emotions(limit: int = 10):
     """
     Récupère les N dernières analyses émotionnelles
@@ -245,7 +261,7 @@ async def get_recent_emotions(limit: int = 10):
         raise HTTPException(status_code=500, detail=f"Erreur récents: {str(e)}")
 
 
-@router.get("/alerts")
+@router.get("/alerts", dependencies=[emotion_files])
 async def get_emotion_alerts():
     """
     Récupère les alertes émotionnelles (clients en détresse)
@@ -302,7 +318,7 @@ async def get_emotion_alerts():
         raise HTTPException(status_code=500, detail=f"Erreur alertes: {str(e)}")
 
 
-@router.get("/dashboard-summary")
+@router.get("/dashboard-summary", dependencies=[emotion_files])
 async def get_dashboard_summary():
     """
     Récupère un résumé des émotions pour affichage sur le dashboard principal
@@ -0,0 +1,59 @@
+# backend/routers/events.py
+
+import asyncio
+import json
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from backend.services.change_events import TOPICS
+from backend.services.event_bus import event_bus
+
+router = APIRouter(prefix="/api/v1", tags=["Events"])
+
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/events")
+async def change_stream(request: Request, topics: Optional[str] = None):
+    """
+    Flux SSE des changements (clients, contrats, sinistres, remboursements, escalades,
+    conseillers, actions, emotions). `topics` filtre par ressource, séparées par des virgules.
+    Sur l'événement `resync`, le tableau de bord recharge tout.
+    """
+    wanted = [t.strip() for t in topics.split(",") if t.strip()] if topics else TOPICS
+    unknown = sorted(set(wanted) - set(TOPICS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Sujets inconnus: {', '.join(unknown)}")
+
+    subscription = event_bus.subscribe(wanted)
+
+    async def stream():
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n" + _sse("ready", {"seq": event_bus.last_seq, "topics": wanted})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                name = "resync" if event["type"] == "resync" else event["topic"]
+                yield _sse(name, event, event["seq"])
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
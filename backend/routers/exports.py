@@ -0,0 +1,52 @@
+# backend/routers/exports.py
+
+from datetime import date
+from typing import Optional, List
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from backend.services.exports import stream_export, parquet_available, MEDIA_TYPES
+
+router = APIRouter(prefix="/api/v1/export", tags=["Export"])
+
+
+def _export(resource: str, fmt: str, date_from, date_to, status, types) -> StreamingResponse:
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Format inconnu: {fmt} (attendu: {', '.join(MEDIA_TYPES)})")
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Export Parquet indisponible: installer pyarrow")
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from postérieure à date_to")
+
+    chunks = stream_export(resource, fmt, date_from=date_from, date_to=date_to, status=status or (), types=types or ())
+    filename = f"{resource}_{date.today():%Y%m%d}.{fmt}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/sinistres")
+def export_sinistres(
+    format: str = "ndjson",
+    date_from: Optional[date] = Query(None, description="Survenance (date_sinistre) à partir de, incluse"),
+    date_to: Optional[date] = Query(None, description="Survenance jusqu'à, incluse"),
+    status: Optional[List[str]] = Query(None, description="status_dossier, répétable"),
+    types: Optional[List[str]] = Query(None, alias="type", description="type_sinistre, répétable")
+):
+    """Export en flux des sinistres (+ matricule client): ndjson | csv | parquet"""
+    return _export("sinistres", format, date_from, date_to, status, types)
+
+
+@router.get("/remboursements")
+def export_remboursements(
+    format: str = "ndjson",
+    date_from: Optional[date] = Query(None, description="Création à partir de, incluse"),
+    date_to: Optional[date] = Query(None, description="Création jusqu'à, incluse"),
+    status: Optional[List[str]] = Query(None, description="status, répétable"),
+    types: Optional[List[str]] = Query(None, alias="type", description="type_sinistre du sinistre, répétable")
+):
+    """Export en flux des remboursements (+ numéro et type du sinistre): ndjson | csv | parquet"""
+    return _export("remboursements", format, date_from, date_to, status, types)
@@ -0,0 +1,47 @@
+# backend/routers/imports.py
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from backend.services.bulk_import import BulkImporter, iter_line_batches, IMPORT_CHUNK_SIZE
+
+router = APIRouter(prefix="/api/v1/import", tags=["Import"])
+
+
+async def _import(resource: str, request: Request, fmt: Optional[str]):
+    if fmt is None:
+        fmt = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    try:
+        importer = BulkImporter(resource, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Corps lu au fil de l'eau: au plus un bloc en mémoire, la base travaille hors de la boucle
+    pending = []
+    async for lines in iter_line_batches(request.stream()):
+        pending.extend(lines)
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            await run_in_threadpool(importer.feed, pending, True)
+            pending = []
+    await run_in_threadpool(importer.feed, pending, True)
+    return importer.report.to_dict()
+
+
+@router.post("/clients")
+async def import_clients(request: Request, format: Optional[str] = Query(None, description="ndjson | csv (défaut: selon Content-Type)")):
+    """
+    Import en masse de clients (une ligne par client, champs de ClientCreate).
+    Les lignes invalides ou en doublon sont rapportées sans interrompre l'import.
+    """
+    return await _import("clients", request, format)
+
+
+@router.post("/contrats")
+async def import_contrats(request: Request, format: Optional[str] = Query(None, description="ndjson | csv (défaut: selon Content-Type)")):
+    """
+    Import en masse de contrats; le client est désigné par `client_id` ou par `matricule`.
+    Les lignes invalides ou en doublon sont rapportées sans interrompre l'import.
+    """
+    return await _import("contrats", request, format)
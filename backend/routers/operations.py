@@ -1,160 +1,122 @@
 # backend/routers/operations.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session, joinedload
 from uuid import UUID
-from datetime import datetime, date
+from datetime import datetime
 from typing import Optional
 
 from backend.database import get_db
 from backend.models import ClientDB, SinistreDB, ContratDB, RemboursementDB, EscaladeDB, ConseillerDB
+from backend.services.claim_numbers import get_claim_number_allocator
+from backend.services.advisor_load import assign_advisor, claim_advisor, release_advisor, ESCALADE_CLOSED_STATUSES
+from backend.services.analytics_rollup import read_overview
+from backend.services.pagination import cursor_param, ordered, keyset_page
+from backend.services.escalation_queue import QUEUE_STATUS, queue_item, publish_queue_change
+from backend.services.resource_versions import conditional
+from backend.services.serialization import FastJSONResponse, json_response, row_serializer, as_float, as_optional_float
 
-router = APIRouter(prefix="/api/v1", tags=["Operations"])
+router = APIRouter(prefix="/api/v1", tags=["Operations"], default_response_class=FastJSONResponse)
 
 
 # =========================
 # Helpers
 # =========================
 
-def _uuid(value):
-    return str(value) if value else None
-
-
-def _dt(value):
+def _as_uuid(value):
     if not value:
         return None
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    return str(value)
+    try:
+        return value if isinstance(value, UUID) else UUID(str(value))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Identifiant invalide")
+
+
+# Sérialiseurs précompilés: UUID et dates restent natifs, encodés par FastJSONResponse
+_client_brief = row_serializer("id", "matricule", "nom", "prenom", "telephone", "email")
+_conseiller_brief = row_serializer("id", "nom", "prenom", "email", "statut")
+_sinistre_row = row_serializer(
+    "id", "numero_sinistre", "client_id", "type_sinistre", "date_sinistre", "lieu_sinistre", "description",
+    "cci_score", "status_dossier", "type_traitement", "tiers_implique", "tiers_nom", "tiers_responsable_incertain",
+    "documents_complets", "date_creation", "date_modification"
+)
+_contrat_row = row_serializer(
+    "id", "client_id", "numero_contrat", "type_assurance", "date_debut", "date_fin", "statut",
+    "garantie_collision", "garantie_vol", "garantie_incendie", "garantie_responsabilite", "garantie_assistance",
+    "franchise_collision", "franchise_vol", "franchise_incendie", "limite_responsabilite", "limite_collision", "limite_vol",
+    "date_creation", "date_modification",
+    franchise_collision=as_float, franchise_vol=as_float, franchise_incendie=as_float,
+    limite_responsabilite=as_float, limite_collision=as_float, limite_vol=as_float
+)
+_remboursement_row = row_serializer(
+    "id", "sinistre_id", "montant_reclame", "montant_accepte", "franchise", "montant_net", "status", "motif_rejet",
+    "date_paiement", "reference_paiement", "date_creation", "date_modification",
+    montant_reclame=as_float, montant_accepte=as_optional_float, franchise=as_optional_float, montant_net=as_optional_float
+)
+_escalade_row = row_serializer(
+    "id", "sinistre_id", "conseiller_id", "raison_escalade", "cci_score_trigger", "status",
+    "date_escalade", "date_transfert", "date_completion"
+)
 
 
 def _sinistre_to_dict(s: SinistreDB, client: Optional[ClientDB] = None):
-    return {
-        "id": _uuid(s.id),
-        "numero_sinistre": s.numero_sinistre,
-        "client_id": _uuid(s.client_id),
-        "type_sinistre": s.type_sinistre,
-        "date_sinistre": _dt(s.date_sinistre),
-        "lieu_sinistre": s.lieu_sinistre,
-        "description": s.description,
-        "cci_score": s.cci_score,
-        "status_dossier": s.status_dossier,
-        "type_traitement": s.type_traitement,
-        "tiers_implique": s.tiers_implique,
-        "tiers_nom": s.tiers_nom,
-        "tiers_responsable_incertain": s.tiers_responsable_incertain,
-        "documents_complets": s.documents_complets,
-        "date_creation": _dt(s.date_creation),
-        "date_modification": _dt(s.date_modification),
-        "client": {
-            "id": _uuid(client.id),
-            "matricule": client.matricule,
-            "nom": client.nom,
-            "prenom": client.prenom,
-            "telephone": client.telephone,
-            "email": client.email,
-        } if client else None
-    }
+    data = _sinistre_row(s)
+    data["client"] = _client_brief(client) if client else None
+    return data
 
 
 def _contrat_to_dict(c: ContratDB, client: Optional[ClientDB] = None):
-    return {
-        "id": _uuid(c.id),
-        "client_id": _uuid(c.client_id),
-        "numero_contrat": c.numero_contrat,
-        "type_assurance": c.type_assurance,
-        "date_debut": _dt(c.date_debut),
-        "date_fin": _dt(c.date_fin),
-        "statut": c.statut,
-        "garantie_collision": c.garantie_collision,
-        "garantie_vol": c.garantie_vol,
-        "garantie_incendie": c.garantie_incendie,
-        "garantie_responsabilite": c.garantie_responsabilite,
-        "garantie_assistance": c.garantie_assistance,
-        "franchise_collision": float(c.franchise_collision or 0),
-        "franchise_vol": float(c.franchise_vol or 0),
-        "franchise_incendie": float(c.franchise_incendie or 0),
-        "limite_responsabilite": float(c.limite_responsabilite or 0),
-        "limite_collision": float(c.limite_collision or 0),
-        "limite_vol": float(c.limite_vol or 0),
-        "date_creation": _dt(c.date_creation),
-        "date_modification": _dt(c.date_modification),
-        "client": {
-            "id": _uuid(client.id),
-            "matricule": client.matricule,
-            "nom": client.nom,
-            "prenom": client.prenom,
-            "telephone": client.telephone,
-            "email": client.email,
-        } if client else None
-    }
+    data = _contrat_row(c)
+    data["client"] = _client_brief(client) if client else None
+    return data
 
 
 def _remboursement_to_dict(r: RemboursementDB, sinistre: Optional[SinistreDB] = None, client: Optional[ClientDB] = None):
-    return {
-        "id": _uuid(r.id),
-        "sinistre_id": _uuid(r.sinistre_id),
-        "montant_reclame": float(r.montant_reclame or 0),
-        "montant_accepte": float(r.montant_accepte or 0) if r.montant_accepte is not None else None,
-        "franchise": float(r.franchise or 0) if r.franchise is not None else None,
-        "montant_net": float(r.montant_net or 0) if r.montant_net is not None else None,
-        "status": r.status,
-        "motif_rejet": r.motif_rejet,
-        "date_paiement": _dt(r.date_paiement),
-        "reference_paiement": r.reference_paiement,
-        "date_creation": _dt(r.date_creation),
-        "date_modification": _dt(r.date_modification),
-        "sinistre": _sinistre_to_dict(sinistre, client) if sinistre else None
-    }
+    data = _remboursement_row(r)
+    data["sinistre"] = _sinistre_to_dict(sinistre, client) if sinistre else None
+    return data
 
 
 def _escalade_to_dict(e: EscaladeDB, sinistre: Optional[SinistreDB] = None, client: Optional[ClientDB] = None, conseiller: Optional[ConseillerDB] = None):
-    return {
-        "id": _uuid(e.id),
-        "sinistre_id": _uuid(e.sinistre_id),
-        "conseiller_id": _uuid(e.conseiller_id),
-        "raison_escalade": e.raison_escalade,
-        "cci_score_trigger": e.cci_score_trigger,
-        "status": e.status,
-        "date_escalade": _dt(e.date_escalade),
-        "date_transfert": _dt(e.date_transfert),
-        "date_completion": _dt(e.date_completion),
-        "sinistre": _sinistre_to_dict(sinistre, client) if sinistre else None,
-        "conseiller": {
-            "id": _uuid(conseiller.id),
-            "nom": conseiller.nom,
-            "prenom": conseiller.prenom,
-            "email": conseiller.email,
-            "statut": conseiller.statut
-        } if conseiller else None
-    }
+    data = _escalade_row(e)
+    data["sinistre"] = _sinistre_to_dict(sinistre, client) if sinistre else None
+    data["conseiller"] = _conseiller_brief(conseiller) if conseiller else None
+    return data
+
+
+def _page(query, sort_column, id_column, skip, limit, cursor, to_dict):
+    """Liste historique (offset) sans curseur; {"items", "next_cursor"} avec curseur"""
+    if cursor is None:
+        rows = ordered(query, sort_column, id_column).offset(skip).limit(limit).all()
+        return [to_dict(r) for r in rows]
+    rows, next_cursor = keyset_page(query, sort_column, id_column, cursor, limit)
+    return {"items": [to_dict(r) for r in rows], "next_cursor": next_cursor}
 
 
 # =========================
 # SINISTRES CRUD
 # =========================
-@router.get("/sinistres")
-async def list_sinistres(skip: int = 0, limit: int = 200, db: Session = Depends(get_db)):
-    sinistres = db.query(SinistreDB).order_by(SinistreDB.date_creation.desc()).offset(skip).limit(limit).all()
-    results = []
-    for s in sinistres:
-        client = db.query(ClientDB).filter(ClientDB.id == s.client_id).first()
-        results.append(_sinistre_to_dict(s, client))
-    return results
+@router.get("/sinistres", dependencies=[conditional("sinistres", "clients")])
+def list_sinistres(response: Response, skip: int = 0, limit: int = 200, cursor=Depends(cursor_param), db: Session = Depends(get_db)):
+    # Client chargé dans la même requête (JOIN): une seule requête par page
+    query = db.query(SinistreDB).options(joinedload(SinistreDB.client))
+    return json_response(_page(
+        query, SinistreDB.date_creation, SinistreDB.id, skip, limit, cursor,
+        lambda s: _sinistre_to_dict(s, s.client)
+    ), response)
 
 
 @router.get("/sinistres/{sinistre_id}")
-async def get_sinistre(sinistre_id: UUID, db: Session = Depends(get_db)):
+def get_sinistre(sinistre_id: UUID, db: Session = Depends(get_db)):
     sinistre = db.query(SinistreDB).filter(SinistreDB.id == sinistre_id).first()
     if not sinistre:
         raise HTTPException(status_code=404, detail="Sinistre non trouvé")
     client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first()
-    return _sinistre_to_dict(sinistre, client)
+    return json_response(_sinistre_to_dict(sinistre, client))
 
 
 @router.post("/sinistres")
-async def create_sinistre(payload: dict, db: Session = Depends(get_db)):
+def create_sinistre(payload: dict, db: Session = Depends(get_db)):
     client_id = payload.get("client_id")
     if not client_id:
         raise HTTPException(status_code=400, detail="client_id requis")
@@ -163,7 +125,7 @@ async def create_sinistre(payload: dict, db: Session = Depends(get_db)):
     if not client:
         raise HTTPException(status_code=404, detail="Client non trouvé")
 
-    numero_sinistre = payload.get("numero_sinistre") or f"SINS-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    numero_sinistre = payload.get("numero_sinistre") or get_claim_number_allocator().next_number()
     date_sinistre = payload.get("date_sinistre") or datetime.utcnow().date().isoformat()
 
     sinistre = SinistreDB(
@@ -188,7 +150,7 @@ async def create_sinistre(payload: dict, db: Session = Depends(get_db)):
 
 
 @router.put("/sinistres/{sinistre_id}")
-async def update_sinistre(sinistre_id: UUID, payload: dict, db: Session = Depends(get_db)):
+def update_sinistre(sinistre_id: UUID, payload: dict, db: Session = Depends(get_db)):
     sinistre = db.query(SinistreDB).filter(SinistreDB.id == sinistre_id).first()
     if not sinistre:
         raise HTTPException(status_code=404, detail="Sinistre non trouvé")
@@ -211,7 +173,7 @@ async def update_sinistre(sinistre_id: UUID, payload: dict, db: Session = Depend
 
 
 @router.delete("/sinistres/{sinistre_id}")
-async def delete_sinistre(sinistre_id: UUID, db: Session = Depends(get_db)):
+def delete_sinistre(sinistre_id: UUID, db: Session = Depends(get_db)):
     sinistre = db.query(SinistreDB).filter(SinistreDB.id == sinistre_id).first()
     if not sinistre:
         raise HTTPException(status_code=404, detail="Sinistre non trouvé")
@@ -223,18 +185,17 @@ async def delete_sinistre(sinistre_id: UUID, db: Session = Depends(get_db)):
 # =========================
 # CONTRATS CRUD
 # =========================
-@router.get("/contrats")
-async def list_contrats(skip: int = 0, limit: int = 200, db: Session = Depends(get_db)):
-    contrats = db.query(ContratDB).order_by(ContratDB.date_creation.desc()).offset(skip).limit(limit).all()
-    results = []
-    for c in contrats:
-        client = db.query(ClientDB).filter(ClientDB.id == c.client_id).first()
-        results.append(_contrat_to_dict(c, client))
-    return results
+@router.get("/contrats", dependencies=[conditional("contrats", "clients")])
+def list_contrats(response: Response, skip: int = 0, limit: int = 200, cursor=Depends(cursor_param), db: Session = Depends(get_db)):
+    query = db.query(ContratDB).options(joinedload(ContratDB.client))
+    return json_response(_page(
+        query, ContratDB.date_creation, ContratDB.id, skip, limit, cursor,
+        lambda c: _contrat_to_dict(c, c.client)
+    ), response)
 
 
 @router.post("/contrats")
-async def create_contrat(payload: dict, db: Session = Depends(get_db)):
+def create_contrat(payload: dict, db: Session = Depends(get_db)):
     client_id = payload.get("client_id")
     if not client_id:
         raise HTTPException(status_code=400, detail="client_id requis")
@@ -269,7 +230,7 @@ async def create_contrat(payload: dict, db: Session = Depends(get_db)):
 
 
 @router.put("/contrats/{contrat_id}")
-async def update_contrat(contrat_id: UUID, payload: dict, db: Session = Depends(get_db)):
+def update_contrat(contrat_id: UUID, payload: dict, db: Session = Depends(get_db)):
     contrat = db.query(ContratDB).filter(ContratDB.id == contrat_id).first()
     if not contrat:
         raise HTTPException(status_code=404, detail="Contrat non trouvé")
@@ -296,7 +257,7 @@ async def update_contrat(contrat_id: UUID, payload: dict, db: Session = Depends(
 
 
 @router.delete("/contrats/{contrat_id}")
-async def delete_contrat(contrat_id: UUID, db: Session = Depends(get_db)):
+def delete_contrat(contrat_id: UUID, db: Session = Depends(get_db)):
     contrat = db.query(ContratDB).filter(ContratDB.id == contrat_id).first()
     if not contrat:
         raise HTTPException(status_code=404, detail="Contrat non trouvé")
@@ -308,19 +269,17 @@ async def delete_contrat(contrat_id: UUID, db: Session = Depends(get_db)):
 # =========================
 # REMBOURSEMENTS CRUD
 # =========================
-@router.get("/remboursements")
-async def list_remboursements(skip: int = 0, limit: int = 200, db: Session = Depends(get_db)):
-    remboursements = db.query(RemboursementDB).order_by(RemboursementDB.date_creation.desc()).offset(skip).limit(limit).all()
-    results = []
-    for r in remboursements:
-        sinistre = db.query(SinistreDB).filter(SinistreDB.id == r.sinistre_id).first()
-        client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first() if sinistre else None
-        results.append(_remboursement_to_dict(r, sinistre, client))
-    return results
+@router.get("/remboursements", dependencies=[conditional("remboursements", "sinistres", "clients")])
+def list_remboursements(response: Response, skip: int = 0, limit: int = 200, cursor=Depends(cursor_param), db: Session = Depends(get_db)):
+    query = db.query(RemboursementDB).options(joinedload(RemboursementDB.sinistre).joinedload(SinistreDB.client))
+    return json_response(_page(
+        query, RemboursementDB.date_creation, RemboursementDB.id, skip, limit, cursor,
+        lambda r: _remboursement_to_dict(r, r.sinistre, r.sinistre.client if r.sinistre else None)
+    ), response)
 
 
 @router.post("/remboursements")
-async def create_remboursement(payload: dict, db: Session = Depends(get_db)):
+def create_remboursement(payload: dict, db: Session = Depends(get_db)):
     sinistre_id = payload.get("sinistre_id")
     if not sinistre_id:
         raise HTTPException(status_code=400, detail="sinistre_id requis")
@@ -348,7 +307,7 @@ async def create_remboursement(payload: dict, db: Session = Depends(get_db)):
 
 
 @router.put("/remboursements/{remboursement_id}")
-async def update_remboursement(remboursement_id: UUID, payload: dict, db: Session = Depends(get_db)):
+def update_remboursement(remboursement_id: UUID, payload: dict, db: Session = Depends(get_db)):
     remboursement = db.query(RemboursementDB).filter(RemboursementDB.id == remboursement_id).first()
     if not remboursement:
         raise HTTPException(status_code=404, detail="Remboursement non trouvé")
@@ -371,7 +330,7 @@ async def update_remboursement(remboursement_id: UUID, payload: dict, db: Sessio
 
 
 @router.delete("/remboursements/{remboursement_id}")
-async def delete_remboursement(remboursement_id: UUID, db: Session = Depends(get_db)):
+def delete_remboursement(remboursement_id: UUID, db: Session = Depends(get_db)):
     remboursement = db.query(RemboursementDB).filter(RemboursementDB.id == remboursement_id).first()
     if not remboursement:
         raise HTTPException(status_code=404, detail="Remboursement non trouvé")
@@ -383,21 +342,21 @@ async def delete_remboursement(remboursement_id: UUID, db: Session = Depends(get
 # =========================
 # ESCALADES CRUD
 # =========================
-@router.get("/escalades")
-async def list_escalades(skip: int = 0, limit: int = 200, db: Session = Depends(get_db)):
-    escalades = db.query(EscaladeDB).order_by(EscaladeDB.date_escalade.desc()).offset(skip).limit(limit).all()
-    results = []
-    for e in escalades:
-        sinistre = db.query(SinistreDB).filter(SinistreDB.id == e.sinistre_id).first()
-        client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first() if sinistre else None
-        conseiller = db.query(ConseillerDB).filter(ConseillerDB.id == e.conseiller_id).first() if e.conseiller_id else None
-        results.append(_escalade_to_dict(e, sinistre, client, conseiller))
-    return results
+@router.get("/escalades", dependencies=[conditional("escalades", "sinistres", "clients", "conseillers")])
+def list_escalades(response: Response, skip: int = 0, limit: int = 200, cursor=Depends(cursor_param), db: Session = Depends(get_db)):
+    query = db.query(EscaladeDB).options(
+        joinedload(EscaladeDB.sinistre).joinedload(SinistreDB.client),
+        joinedload(EscaladeDB.conseiller)
+    )
+    return json_response(_page(
+        query, EscaladeDB.date_escalade, EscaladeDB.id, skip, limit, cursor,
+        lambda e: _escalade_to_dict(e, e.sinistre, e.sinistre.client if e.sinistre else None, e.conseiller)
+    ), response)
 
 
 @router.post("/escalades")
-async def create_escalade(payload: dict, db: Session = Depends(get_db)):
-    sinistre_id = payload.get("sinistre_id")
+def create_escalade(payload: dict, db: Session = Depends(get_db)):
+    sinistre_id = _as_uuid(payload.get("sinistre_id"))
     if not sinistre_id:
         raise HTTPException(status_code=400, detail="sinistre_id requis")
 
@@ -405,12 +364,20 @@ async def create_escalade(payload: dict, db: Session = Depends(get_db)):
     if not sinistre:
         raise HTTPException(status_code=404, detail="Sinistre non trouvé")
 
+    status = payload.get("status", "en_attente")
+    conseiller_id = _as_uuid(payload.get("conseiller_id"))
+    if status not in ESCALADE_CLOSED_STATUSES:
+        if conseiller_id:
+            claim_advisor(db, conseiller_id)
+        else:
+            conseiller_id = assign_advisor(db, sinistre.type_sinistre)
+
     escalade = EscaladeDB(
         sinistre_id=sinistre.id,
-        conseiller_id=payload.get("conseiller_id"),
+        conseiller_id=conseiller_id,
         raison_escalade=payload.get("raison_escalade", "CCI élevé"),
         cci_score_trigger=payload.get("cci_score_trigger"),
-        status=payload.get("status", "en_attente"),
+        status=status,
         date_escalade=datetime.utcnow()
     )
     db.add(escalade)
@@ -418,18 +385,37 @@ async def create_escalade(payload: dict, db: Session = Depends(get_db)):
     db.refresh(escalade)
     client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first()
     conseiller = db.query(ConseillerDB).filter(ConseillerDB.id == escalade.conseiller_id).first() if escalade.conseiller_id else None
+    if escalade.status == QUEUE_STATUS:
+        publish_queue_change("created", escalade.id, queue_item(escalade, sinistre, client, conseiller))
     return _escalade_to_dict(escalade, sinistre, client, conseiller)
 
 
 @router.put("/escalades/{escalade_id}")
-async def update_escalade(escalade_id: UUID, payload: dict, db: Session = Depends(get_db)):
+def update_escalade(escalade_id: UUID, payload: dict, db: Session = Depends(get_db)):
     escalade = db.query(EscaladeDB).filter(EscaladeDB.id == escalade_id).first()
     if not escalade:
         raise HTTPException(status_code=404, detail="Escalade non trouvée")
 
-    for field in ["conseiller_id", "raison_escalade", "cci_score_trigger", "status"]:
+    previous_conseiller = escalade.conseiller_id if escalade.status not in ESCALADE_CLOSED_STATUSES else None
+    was_queued, queued_conseiller = escalade.status == QUEUE_STATUS, escalade.conseiller_id
+    for field in ["raison_escalade", "cci_score_trigger", "status"]:
         if field in payload:
             setattr(escalade, field, payload.get(field))
+    if "conseiller_id" in payload:
+        escalade.conseiller_id = _as_uuid(payload.get("conseiller_id"))
+
+    # Charge des conseillers: rendre l'ancienne place, prendre la nouvelle
+    current_conseiller = None
+    if escalade.status not in ESCALADE_CLOSED_STATUSES:
+        current_conseiller = escalade.conseiller_id
+        if current_conseiller is None:
+            sinistre = db.query(SinistreDB).filter(SinistreDB.id == escalade.sinistre_id).first()
+            current_conseiller = assign_advisor(db, sinistre.type_sinistre if sinistre else None)
+            escalade.conseiller_id = current_conseiller
+        elif current_conseiller != previous_conseiller:
+            claim_advisor(db, current_conseiller)
+    if previous_conseiller and previous_conseiller != current_conseiller:
+        release_advisor(db, previous_conseiller)
 
     if "date_transfert" in payload and payload.get("date_transfert"):
         escalade.date_transfert = datetime.fromisoformat(payload.get("date_transfert"))
@@ -441,123 +427,36 @@ async def update_escalade(escalade_id: UUID, payload: dict, db: Session = Depend
     sinistre = db.query(SinistreDB).filter(SinistreDB.id == escalade.sinistre_id).first()
     client = db.query(ClientDB).filter(ClientDB.id == sinistre.client_id).first() if sinistre else None
     conseiller = db.query(ConseillerDB).filter(ConseillerDB.id == escalade.conseiller_id).first() if escalade.conseiller_id else None
+    if escalade.status == QUEUE_STATUS:
+        if not was_queued:
+            event = "created"
+        else:
+            event = "assigned" if escalade.conseiller_id != queued_conseiller else "updated"
+        publish_queue_change(event, escalade.id, queue_item(escalade, sinistre, client, conseiller))
+    elif was_queued:
+        publish_queue_change("completed" if escalade.status in ESCALADE_CLOSED_STATUSES else "updated", escalade.id)
     return _escalade_to_dict(escalade, sinistre, client, conseiller)
 
 
 @router.delete("/escalades/{escalade_id}")
-async def delete_escalade(escalade_id: UUID, db: Session = Depends(get_db)):
+def delete_escalade(escalade_id: UUID, db: Session = Depends(get_db)):
     escalade = db.query(EscaladeDB).filter(EscaladeDB.id == escalade_id).first()
     if not escalade:
         raise HTTPException(status_code=404, detail="Escalade non trouvée")
+    if escalade.status not in ESCALADE_CLOSED_STATUSES:
+        release_advisor(db, escalade.conseiller_id)
+    was_queued = escalade.status == QUEUE_STATUS
     db.delete(escalade)
     db.commit()
+    if was_queued:
+        publish_queue_change("deleted", escalade_id)
     return {"message": "Escalade supprimée"}
 
 
 # =========================
 # ANALYTICS OVERVIEW
 # =========================
-@router.get("/analytics/overview")
-async def analytics_overview(db: Session = Depends(get_db)):
-    clients_total = db.query(func.count(ClientDB.id)).scalar() or 0
-    sinistres_total = db.query(func.count(SinistreDB.id)).scalar() or 0
-    escalades_total = db.query(func.count(EscaladeDB.id)).scalar() or 0
-    remboursements_total = db.query(func.count(RemboursementDB.id)).scalar() or 0
-
-    cci_avg = db.query(func.avg(SinistreDB.cci_score)).scalar() or 0
-    cci_min = db.query(func.min(SinistreDB.cci_score)).scalar() or 0
-    cci_max = db.query(func.max(SinistreDB.cci_score)).scalar() or 0
-
-    # Sinistres by status
-    sinistres_by_status = db.query(SinistreDB.status_dossier, func.count(SinistreDB.id)).group_by(SinistreDB.status_dossier).all()
-    sinistres_by_type = db.query(SinistreDB.type_sinistre, func.count(SinistreDB.id)).group_by(SinistreDB.type_sinistre).all()
-
-    # Escalades by status
-    escalades_by_status = db.query(EscaladeDB.status, func.count(EscaladeDB.id)).group_by(EscaladeDB.status).all()
-
-    # Remboursements by status
-    remboursements_by_status = db.query(RemboursementDB.status, func.count(RemboursementDB.id)).group_by(RemboursementDB.status).all()
-    remb_sum_reclame = db.query(func.sum(RemboursementDB.montant_reclame)).scalar() or 0
-    remb_sum_accepte = db.query(func.sum(RemboursementDB.montant_accepte)).scalar() or 0
-    remb_sum_net = db.query(func.sum(RemboursementDB.montant_net)).scalar() or 0
-
-    # Sinistres by day (last 14 days)
-    last_days = db.query(func.date(SinistreDB.date_creation), func.count(SinistreDB.id))\
-        .group_by(func.date(SinistreDB.date_creation))\
-        .order_by(func.date(SinistreDB.date_creation).desc())\
-        .limit(14).all()
-    sinistres_by_day = [
-        {"date": str(day[0]), "count": day[1]} for day in reversed(last_days)
-    ]
-
-    # CCI buckets
-    cci_values = [row[0] for row in db.query(SinistreDB.cci_score).all() if row[0] is not None]
-    buckets = {"0-20": 0, "21-40": 0, "41-60": 0, "61-80": 0, "81-100": 0}
-    for value in cci_values:
-        if value <= 20:
-            buckets["0-20"] += 1
-        elif value <= 40:
-            buckets["21-40"] += 1
-        elif value <= 60:
-            buckets["41-60"] += 1
-        elif value <= 80:
-            buckets["61-80"] += 1
-        else:
-            buckets["81-100"] += 1
-
-    # Cognitive insights for recent sinistres
-    recent_sinistres = db.query(SinistreDB).order_by(SinistreDB.date_creation.desc()).limit(8).all()
-    cognitive_cards = []
-    for s in recent_sinistres:
-        client = db.query(ClientDB).filter(ClientDB.id == s.client_id).first()
-        facts = 0
-        facts += 1 if s.lieu_sinistre else 0
-        facts += 1 if s.date_sinistre else 0
-        facts += 1 if s.tiers_implique is not None else 0
-        facts += 1 if s.documents_complets is not None else 0
-        facts += 1 if s.description else 0
-
-        propositions = 0
-        if s.description:
-            propositions = max(1, len([seg for seg in s.description.replace("?", ".").replace("!", ".").split(".") if seg.strip()]))
-
-        confidence = min(98, 60 + (facts * 6) + (s.cci_score or 0) // 5)
-
-        cognitive_cards.append({
-            "sinistre_id": _uuid(s.id),
-            "numero_sinistre": s.numero_sinistre,
-            "client": f"{client.nom} {client.prenom}" if client else "",
-            "facts": facts,
-            "propositions": propositions,
-            "ambiguities": 0,
-            "contradictions": 0,
-            "confidence": confidence,
-            "cci_score": s.cci_score or 0,
-            "status": s.status_dossier,
-            "type": s.type_sinistre,
-            "date": _dt(s.date_creation)
-        })
-
-    return {
-        "kpis": {
-            "clients_total": clients_total,
-            "sinistres_total": sinistres_total,
-            "escalades_total": escalades_total,
-            "remboursements_total": remboursements_total,
-            "cci_avg": round(float(cci_avg), 2),
-            "cci_min": int(cci_min),
-            "cci_max": int(cci_max)
-        },
-        "sinistres_by_status": [{"name": s[0], "value": s[1]} for s in sinistres_by_status],
-        "sinistres_by_type": [{"name": s[0], "value": s[1]} for s in sinistres_by_type],
-        "sinistres_by_day": sinistres_by_day,
-        "cci_buckets": [{"range": k, "value": v} for k, v in buckets.items()],
-        "escalades_by_status": [{"name": s[0], "value": s[1]} for s in escalades_by_status],
-        "remboursements_by_status": [{"name": s[0], "value": s[1]} for s in remboursements_by_status],
-        "remboursements_sum": {
-            "reclame": float(remb_sum_reclame),
-            "accepte": float(remb_sum_accepte or 0),
-            "net": float(remb_sum_net or 0)
-        },
-        "cognitive_cards": cognitive_cards
-    }
+@router.get("/analytics/overview", dependencies=[conditional("clients", "sinistres", "escalades", "remboursements")])
+def analytics_overview(response: Response, db: Session = Depends(get_db)):
+    """Lu depuis la table d'agrégats maintenue à l'écriture (services/analytics_rollup.py)"""
+    return json_response(read_overview(db), response)
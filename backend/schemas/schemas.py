@@ -78,6 +78,12 @@ class ClientResponse(ClientBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ClientPageResponse(BaseModel):
+    """Page de clients en pagination par curseur"""
+    items: List[ClientResponse]
+    next_cursor: Optional[str] = None
+
+
 # ============================================================
 # CONTRAT SCHEMAS
 # ============================================================
@@ -96,6 +102,16 @@ class ContratBase(BaseModel):
     franchise_incendie: Decimal = Decimal(500)
 
 
+class ContratImport(ContratBase):
+    """Ligne d'import en masse: client désigné par son id ou par son matricule"""
+    client_id: Optional[uuid.UUID] = None
+    matricule: Optional[str] = None
+    statut: str = "actif"
+    limite_responsabilite: Decimal = Decimal(50000)
+    limite_collision: Decimal = Decimal(50000)
+    limite_vol: Decimal = Decimal(50000)
+
+
 class ContratResponse(ContratBase):
     id: uuid.UUID
     client_id: uuid.UUID
@@ -9,72 +9,74 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Clients de démonstration (réutilisés par loadtest_conversation.py)
+CLIENTS_DATA = [
+    {
+        "matricule": "AB-4521-22",
+        "nom": "Ben Said",
+        "prenom": "Ahmed",
+        "email": "ahmed.bensaid@email.com",
+        "telephone": "+212612345678",
+        "civilite": "M",
+        "date_naissance": date(1985, 5, 15),
+        "adresse": "123 Rue de Paris",
+        "ville": "Casablanca",
+        "code_postal": "20000",
+    },
+    {
+        "matricule": "FC-7834-19",
+        "nom": "Dupont",
+        "prenom": "Marie",
+        "email": "marie.dupont@email.com",
+        "telephone": "+212612345679",
+        "civilite": "Mme",
+        "date_naissance": date(1990, 3, 22),
+        "adresse": "456 Rue de Lyon",
+        "ville": "Rabat",
+        "code_postal": "10000",
+    },
+    {
+        "matricule": "JK-1234-20",
+        "nom": "Martin",
+        "prenom": "Jean",
+        "email": "jean.martin@email.com",
+        "telephone": "+212612345680",
+        "civilite": "M",
+        "date_naissance": date(1980, 7, 10),
+        "adresse": "789 Rue de Marseille",
+        "ville": "Fès",
+        "code_postal": "30000",
+    },
+    {
+        "matricule": "LM-5678-21",
+        "nom": "Garcia",
+        "prenom": "Isabella",
+        "email": "isabella.garcia@email.com",
+        "telephone": "+212612345681",
+        "civilite": "Mme",
+        "date_naissance": date(1992, 12, 5),
+        "adresse": "321 Rue de Toulouse",
+        "ville": "Tangier",
+        "code_postal": "90000",
+    },
+    {
+        "matricule": "NO-9012-22",
+        "nom": "Thibault",
+        "prenom": "Pierre",
+        "email": "pierre.thibault@email.com",
+        "telephone": "+212612345682",
+        "civilite": "M",
+        "date_naissance": date(1988, 9, 20),
+        "adresse": "654 Rue de Nice",
+        "ville": "Marrakech",
+        "code_postal": "40000",
+    },
+]
+
+
 def seed_clients(db: Session):
     """Créer clients de test"""
-    clients_data = [
-        {
-            "matricule": "AB-4521-22",
-            "nom": "Ben Said",
-            "prenom": "Ahmed",
-            "email": "ahmed.bensaid@email.com",
-            "telephone": "+212612345678",
-            "civilite": "M",
-            "date_naissance": date(1985, 5, 15),
-            "adresse": "123 Rue de Paris",
-            "ville": "Casablanca",
-            "code_postal": "20000",
-        },
-        {
-            "matricule": "FC-7834-19",
-            "nom": "Dupont",
-            "prenom": "Marie",
-            "email": "marie.dupont@email.com",
-            "telephone": "+212612345679",
-            "civilite": "Mme",
-            "date_naissance": date(1990, 3, 22),
-            "adresse": "456 Rue de Lyon",
-            "ville": "Rabat",
-            "code_postal": "10000",
-        },
-        {
-            "matricule": "JK-1234-20",
-            "nom": "Martin",
-            "prenom": "Jean",
-            "email": "jean.martin@email.com",
-            "telephone": "+212612345680",
-            "civilite": "M",
-            "date_naissance": date(1980, 7, 10),
-            "adresse": "789 Rue de Marseille",
-            "ville": "Fès",
-            "code_postal": "30000",
-        },
-        {
-            "matricule": "LM-5678-21",
-            "nom": "Garcia",
-            "prenom": "Isabella",
-            "email": "isabella.garcia@email.com",
-            "telephone": "+212612345681",
-            "civilite": "Mme",
-            "date_naissance": date(1992, 12, 5),
-            "adresse": "321 Rue de Toulouse",
-            "ville": "Tangier",
-            "code_postal": "90000",
-        },
-        {
-            "matricule": "NO-9012-22",
-            "nom": "Thibault",
-            "prenom": "Pierre",
-            "email": "pierre.thibault@email.com",
-            "telephone": "+212612345682",
-            "civilite": "M",
-            "date_naissance": date(1988, 9, 20),
-            "adresse": "654 Rue de Nice",
-            "ville": "Marrakech",
-            "code_postal": "40000",
-        },
-    ]
-    
-    for client_data in clients_data:
+    for client_data in CLIENTS_DATA:
         existing = db.query(ClientDB).filter(ClientDB.matricule == client_data["matricule"]).first()
         if not existing:
             client = ClientDB(**client_data)
@@ -0,0 +1,234 @@
+# backend/services/advisor_load.py
+
+"""
+Index de charge des conseillers pour l'affectation des escalades.
+Un tas par spécialité (plus un tas général) ordonné sur la capacité restante
+(capacite_max - nombre_dossiers_actifs): l'affectation est en O(log n).
+À capacité restante égale, le conseiller dont l'entrée est la plus ancienne
+(affecté le moins récemment) passe en premier: tour de rôle.
+Les entrées périmées sont ignorées à la lecture (invalidation paresseuse par version).
+La base reste l'arbitre entre workers: l'incrément est un UPDATE conditionnel
+atomique, et l'index est rechargé périodiquement depuis la table conseillers.
+Les affectations faites dans une transaction ne modifient l'index qu'après son
+commit (rien à défaire si elle est annulée).
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Optional, Dict, List, Tuple, Any
+from uuid import UUID
+
+from sqlalchemy import event, select, update, case
+from sqlalchemy.orm import Session
+
+from backend.models import ConseillerDB
+
+logger = logging.getLogger(__name__)
+
+ADVISOR_INDEX_REFRESH_SECONDS = float(os.getenv("ADVISOR_INDEX_REFRESH_SECONDS", "60"))
+ALL_SPECIALITES = "*"
+ESCALADE_CLOSED_STATUSES = {"completee"}
+_PENDING = "advisor_load"
+
+
+def parse_specialites(value: Optional[str]) -> List[str]:
+    return [s.strip().lower() for s in (value or "").split(",") if s.strip()]
+
+
+class AdvisorLoadIndex:
+    """Capacité restante des conseillers disponibles, par spécialité"""
+
+    def __init__(self, refresh_seconds: float = ADVISOR_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._advisors: Dict[UUID, Dict[str, Any]] = {}
+        self._heaps: Dict[str, List[Tuple[int, int, int, UUID]]] = {}
+        self._seq = itertools.count()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._advisors)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def ensure_loaded(self, db: Session):
+        """(Re)construit l'index depuis la base au premier usage puis après refresh_seconds"""
+        if not self.is_stale():
+            return
+        rows = db.execute(select(
+            ConseillerDB.id, ConseillerDB.statut, ConseillerDB.nombre_dossiers_actifs,
+            ConseillerDB.capacite_max, ConseillerDB.specialites
+        )).all()
+        self.rebuild(rows)
+
+    def rebuild(self, rows):
+        with self._lock:
+            self._advisors = {}
+            self._heaps = {}
+            for advisor_id, statut, actifs, capacite, specialites in rows:
+                self._advisors[advisor_id] = {
+                    "disponible": statut == "disponible",
+                    "actifs": actifs or 0,
+                    "capacite": capacite or 0,
+                    "specialites": parse_specialites(specialites),
+                    "version": 0
+                }
+                self._push(advisor_id)
+            self._loaded_at = time.monotonic()
+        logger.info(f"🧑‍💼 Index conseillers: {len(self._advisors)} entrées")
+
+    def best(self, specialite: Optional[str] = None) -> Optional[UUID]:
+        """Conseiller le moins chargé (spécialiste en priorité), sans réserver de place"""
+        keys = [specialite.strip().lower(), ALL_SPECIALITES] if specialite else [ALL_SPECIALITES]
+        with self._lock:
+            for key in keys:
+                advisor_id = self._peek_best(key)
+                if advisor_id is not None:
+                    return advisor_id
+        return None
+
+    def acquire(self, specialite: Optional[str] = None) -> Optional[UUID]:
+        """Réserve une place chez le conseiller le moins chargé (spécialiste en priorité)"""
+        with self._lock:
+            advisor_id = self.best(specialite)
+            if advisor_id is not None:
+                self._adjust(advisor_id, +1)
+            return advisor_id
+
+    def claim(self, advisor_id: UUID):
+        """Affectation explicite (choix du conseiller par un superviseur)"""
+        self.apply({advisor_id: +1})
+
+    def release(self, advisor_id: Optional[UUID]):
+        """Rend une place (escalade complétée, supprimée ou réaffectée)"""
+        self.apply({advisor_id: -1})
+
+    def apply(self, deltas: Dict[UUID, int]):
+        """Variations de dossiers actifs validées en base (après commit)"""
+        with self._lock:
+            for advisor_id, delta in deltas.items():
+                if delta and advisor_id in self._advisors:
+                    self._adjust(advisor_id, delta)
+
+    def mark_full(self, advisor_id: UUID):
+        """La base a refusé l'incrément: un autre worker a pris la dernière place"""
+        with self._lock:
+            advisor = self._advisors.get(advisor_id)
+            if advisor:
+                advisor["actifs"] = max(advisor["actifs"], advisor["capacite"])
+                advisor["version"] += 1
+
+    def remaining(self, advisor_id: UUID) -> int:
+        advisor = self._advisors.get(advisor_id)
+        return advisor["capacite"] - advisor["actifs"] if advisor else 0
+
+    def _adjust(self, advisor_id: UUID, delta: int):
+        advisor = self._advisors[advisor_id]
+        advisor["actifs"] = max(0, advisor["actifs"] + delta)
+        advisor["version"] += 1
+        self._push(advisor_id)
+
+    def _push(self, advisor_id: UUID):
+        advisor = self._advisors[advisor_id]
+        remaining = advisor["capacite"] - advisor["actifs"]
+        if not advisor["disponible"] or remaining <= 0:
+            return
+        # La version ne départage pas: elle ne sert qu'à écarter les entrées périmées
+        entry = (-remaining, next(self._seq), advisor["version"], advisor_id)
+        for key in [ALL_SPECIALITES] + advisor["specialites"]:
+            heapq.heappush(self._heaps.setdefault(key, []), entry)
+
+    def _peek_best(self, key: str) -> Optional[UUID]:
+        """Meilleure entrée à jour, laissée en place; les entrées périmées sont retirées"""
+        heap = self._heaps.get(key)
+        while heap:
+            _, _, version, advisor_id = heap[0]
+            advisor = self._advisors.get(advisor_id)
+            if advisor is not None and advisor["version"] == version:
+                return advisor_id
+            heapq.heappop(heap)
+        return None
+
+
+advisor_index = AdvisorLoadIndex()
+
+
+def _record(db: Session, advisor_id: UUID, delta: int):
+    """Variation appliquée à l'index au commit de `db`"""
+    db.info.setdefault(_PENDING, defaultdict(int))[advisor_id] += delta
+
+
+def assign_advisor(db: Session, specialite: Optional[str] = None) -> Optional[UUID]:
+    """
+    Choisit un conseiller et incrémente nombre_dossiers_actifs dans la transaction de `db`.
+    L'UPDATE ne passe que sous capacite_max: deux workers ne peuvent pas dépasser la capacité.
+    """
+    advisor_index.ensure_loaded(db)
+    conseillers = ConseillerDB.__table__
+    while True:
+        advisor_id = advisor_index.best(specialite)
+        if advisor_id is None:
+            return None
+        result = db.execute(
+            update(conseillers)
+            .where(
+                conseillers.c.id == advisor_id,
+                conseillers.c.statut == "disponible",
+                conseillers.c.nombre_dossiers_actifs < conseillers.c.capacite_max
+            )
+            .values(nombre_dossiers_actifs=conseillers.c.nombre_dossiers_actifs + 1)
+        )
+        if result.rowcount:
+            _record(db, advisor_id, +1)
+            return advisor_id
+        advisor_index.mark_full(advisor_id)
+
+
+def claim_advisor(db: Session, advisor_id: UUID):
+    """Incrément sans contrôle de capacité: l'affectation explicite reste prioritaire"""
+    advisor_index.ensure_loaded(db)
+    conseillers = ConseillerDB.__table__
+    db.execute(
+        update(conseillers)
+        .where(conseillers.c.id == advisor_id)
+        .values(nombre_dossiers_actifs=conseillers.c.nombre_dossiers_actifs + 1)
+    )
+    _record(db, advisor_id, +1)
+
+
+def release_advisor(db: Session, advisor_id: Optional[UUID]):
+    """Décrémente nombre_dossiers_actifs (jamais sous zéro) et rend la place à l'index"""
+    if advisor_id is None:
+        return
+    conseillers = ConseillerDB.__table__
+    db.execute(
+        update(conseillers)
+        .where(conseillers.c.id == advisor_id)
+        .values(nombre_dossiers_actifs=case(
+            (conseillers.c.nombre_dossiers_actifs > 0, conseillers.c.nombre_dossiers_actifs - 1),
+            else_=0
+        ))
+    )
+    _record(db, advisor_id, -1)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_advisor_load(session):
+    deltas = session.info.pop(_PENDING, None)
+    if deltas:
+        advisor_index.apply(deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_advisor_load(session):
+    session.info.pop(_PENDING, None)
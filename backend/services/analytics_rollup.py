@@ -0,0 +1,382 @@
+# backend/services/analytics_rollup.py
+
+"""
+Agrégats matérialisés de /analytics/overview (table analytics_rollup).
+Chaque ligne (metrique, cle) est un compteur ou une somme: totaux, répartitions
+par statut/type, histogramme des scores CCI (un compteur par valeur, d'où
+min/max/moyenne/tranches) et nombre de sinistres par jour.
+Maintenance incrémentale: à chaque flush ORM, les contributions avant/après
+des clients, sinistres, escalades et remboursements modifiés sont converties en
+deltas INSÉRÉS dans analytics_rollup_deltas, dans la même transaction (annulés
+avec elle). Aucune ligne partagée n'est mise à jour par les écritures métier:
+pas de ligne chaude ("total", ...) verrouillée jusqu'au commit, pas d'interblocage.
+compact() reporte périodiquement les deltas dans analytics_rollup (DELETE ...
+RETURNING: chaque delta est reporté une seule fois, même à plusieurs workers);
+la lecture additionne la table et les deltas pas encore reportés.
+Reconstruction complète (reprise après incident): python rebuild_analytics.py
+"""
+
+import os
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Dict, Any, Tuple, Callable
+
+from sqlalchemy import event, inspect, select, delete, update, func, text, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
+
+from backend.models import ClientDB, SinistreDB, EscaladeDB, RemboursementDB, AnalyticsRollupDB, AnalyticsDeltaDB
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_COMPACT_SECONDS = float(os.getenv("ANALYTICS_COMPACT_SECONDS", "30"))
+CCI_BUCKETS = [("0-20", 20), ("21-40", 40), ("41-60", 60), ("61-80", 80), ("81-100", None)]
+DAYS_SHOWN = 14
+COGNITIVE_CARDS = 8
+TOTAL = "total"
+
+Key = Tuple[str, str]
+
+
+def _key(value) -> str:
+    """Clé de dimension: NULL stocké comme chaîne vide"""
+    return "" if value is None else str(value)
+
+
+def _day(value) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and value:
+        return value[:10]  # date() SQLite: 'YYYY-MM-DD'
+    # date_creation par défaut = now() côté base, inconnue avant rechargement
+    return datetime.utcnow().date().isoformat()
+
+
+# Contributions d'une ligne aux agrégats, à partir d'un accesseur d'attribut
+def _client_rows(get) -> Dict[Key, Any]:
+    return {(TOTAL, "clients"): 1}
+
+
+def _sinistre_rows(get) -> Dict[Key, Any]:
+    rows = {
+        (TOTAL, "sinistres"): 1,
+        ("sinistres_status", _key(get("status_dossier"))): 1,
+        ("sinistres_type", _key(get("type_sinistre"))): 1,
+        ("sinistres_day", _day(get("date_creation"))): 1,
+    }
+    if get("cci_score") is not None:
+        rows[("cci", str(int(get("cci_score"))))] = 1
+    return rows
+
+
+def _escalade_rows(get) -> Dict[Key, Any]:
+    return {(TOTAL, "escalades"): 1, ("escalades_status", _key(get("status"))): 1}
+
+
+def _remboursement_rows(get) -> Dict[Key, Any]:
+    return {
+        (TOTAL, "remboursements"): 1,
+        ("remboursements_status", _key(get("status"))): 1,
+        ("montants", "reclame"): get("montant_reclame") or 0,
+        ("montants", "accepte"): get("montant_accepte") or 0,
+        ("montants", "net"): get("montant_net") or 0,
+    }
+
+
+CONTRIBUTIONS: Dict[type, Tuple[Tuple[str, ...], Callable]] = {
+    ClientDB: ((), _client_rows),
+    SinistreDB: (("status_dossier", "type_sinistre", "date_creation", "cci_score"), _sinistre_rows),
+    EscaladeDB: (("status",), _escalade_rows),
+    RemboursementDB: (("status", "montant_reclame", "montant_accepte", "montant_net"), _remboursement_rows),
+}
+
+
+def _current(state):
+    """Valeurs à écrire; les défauts Python des colonnes s'appliquent aux None d'un INSERT"""
+    columns = state.mapper.columns
+
+    def get(attr):
+        value = state.dict.get(attr)
+        if value is None and state.key is None:
+            default = columns[attr].default
+            if default is not None and default.is_scalar:
+                return default.arg
+        return value
+    return get
+
+
+def _committed(state):
+    """Valeurs telles qu'en base avant ce flush"""
+    def get(attr):
+        history = state.attrs[attr].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.unchanged:
+            return history.unchanged[0]
+        return state.dict.get(attr)
+    return get
+
+
+def _subtract(deltas, rows):
+    for key, value in rows.items():
+        deltas[key] -= value
+
+
+def _add(deltas, rows):
+    for key, value in rows.items():
+        deltas[key] += value
+
+
+def collect_deltas(session: Session) -> Dict[Key, Any]:
+    deltas: Dict[Key, Any] = defaultdict(int)
+    for obj in session.new:
+        if type(obj) in CONTRIBUTIONS:
+            _add(deltas, CONTRIBUTIONS[type(obj)][1](_current(inspect(obj))))
+    for obj in session.deleted:
+        if type(obj) in CONTRIBUTIONS:
+            _subtract(deltas, CONTRIBUTIONS[type(obj)][1](_committed(inspect(obj))))
+    for obj in session.dirty:
+        tracked, contribution = CONTRIBUTIONS.get(type(obj), ((), None))
+        state = inspect(obj)
+        if not any(state.attrs[attr].history.has_changes() for attr in tracked):
+            continue
+        _subtract(deltas, contribution(_committed(state)))
+        _add(deltas, contribution(_current(state)))
+    return {key: value for key, value in deltas.items() if value}
+
+
+def apply_deltas(connection, deltas: Dict[Key, Any]):
+    """Deltas ajoutés au journal dans la transaction de `connection` (INSERT seul, aucun verrou partagé)"""
+    if not deltas:
+        return
+    connection.execute(
+        AnalyticsDeltaDB.__table__.insert(),
+        [{"metrique": m, "cle": c, "valeur": v} for (m, c), v in sorted(deltas.items())]
+    )
+
+
+def _upsert(connection, totals: Dict[Key, Any]):
+    """valeur = valeur + delta dans analytics_rollup; clés triées pour un ordre de verrouillage stable"""
+    table = AnalyticsRollupDB.__table__
+    rows = [{"metrique": m, "cle": c, "valeur": v} for (m, c), v in sorted(totals.items())]
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.metrique, table.c.cle],
+            set_={"valeur": table.c.valeur + stmt.excluded.valeur}
+        )
+        connection.execute(stmt, rows)
+        return
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(table.c.metrique == row["metrique"], table.c.cle == row["cle"])
+            .values(valeur=table.c.valeur + row["valeur"])
+        )
+        if not result.rowcount:
+            connection.execute(table.insert().values(**row))
+
+
+def compact(connection) -> int:
+    """
+    Reporte les deltas en attente dans analytics_rollup; retourne leur nombre.
+    Les deltas sont supprimés et lus en une instruction: un compacteur concurrent
+    attend le commit puis ne les voit plus.
+    """
+    deltas = AnalyticsDeltaDB.__table__
+    removed = connection.execute(
+        delete(deltas).returning(deltas.c.metrique, deltas.c.cle, deltas.c.valeur)
+    ).all()
+    totals: Dict[Key, Any] = defaultdict(int)
+    for metrique, cle, valeur in removed:
+        totals[(metrique, cle)] += valeur
+    totals = {key: value for key, value in totals.items() if value}
+    if totals:
+        _upsert(connection, totals)
+    return len(removed)
+
+
+def compact_rollup(engine) -> int:
+    """Une passe de compactage dans sa propre transaction (tâche périodique du serveur)"""
+    with engine.begin() as conn:
+        return compact(conn)
+
+
+async def compaction_loop(engine, interval: float = ANALYTICS_COMPACT_SECONDS):
+    """Compactage périodique hors de la boucle d'événements (annulée à l'arrêt du serveur)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(compact_rollup, engine)
+        except Exception as e:
+            logger.warning(f"[!] Compactage analytics_rollup: {e}")
+
+
+@event.listens_for(Session, "before_flush")
+def _load_tracked_values(session, flush_context, instances):
+    """Charger les colonnes suivies expirées tant que les lignes sont lisibles (avant DELETE/UPDATE)"""
+    for obj in list(session.deleted) + list(session.dirty):
+        if type(obj) in CONTRIBUTIONS:
+            state = inspect(obj)
+            for attr in CONTRIBUTIONS[type(obj)][0]:
+                if attr in state.unloaded:
+                    getattr(obj, attr)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_rollup(session, flush_context):
+    deltas = collect_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+# Ancienne valeur chargée même si l'attribut était expiré au moment de l'affectation
+for _model, (_attrs, _) in CONTRIBUTIONS.items():
+    for _attr in _attrs:
+        event.listen(getattr(_model, _attr), "set", lambda target, value, old, initiator: None, active_history=True)
+
+
+def rebuild(connection) -> int:
+    """Recalcule toute la table depuis les tables sources; retourne le nombre de lignes"""
+    table = AnalyticsRollupDB.__table__
+    deltas = AnalyticsDeltaDB.__table__
+    if connection.dialect.name == "postgresql":
+        # Les écritures concurrentes (journal des deltas) attendent la fin de la reconstruction
+        connection.execute(text(f"LOCK TABLE {table.name}, {deltas.name} IN EXCLUSIVE MODE"))
+    connection.execute(delete(deltas))
+    connection.execute(delete(table))
+
+    rows: Dict[Key, Any] = {("meta", "version"): 1}
+    for name, model in (("clients", ClientDB), ("sinistres", SinistreDB),
+                        ("escalades", EscaladeDB), ("remboursements", RemboursementDB)):
+        rows[(TOTAL, name)] = connection.execute(select(func.count()).select_from(model)).scalar() or 0
+
+    grouped = [
+        ("sinistres_status", SinistreDB.status_dossier),
+        ("sinistres_type", SinistreDB.type_sinistre),
+        ("sinistres_day", func.date(SinistreDB.date_creation)),
+        ("cci", SinistreDB.cci_score),
+        ("escalades_status", EscaladeDB.status),
+        ("remboursements_status", RemboursementDB.status),
+    ]
+    for metrique, column in grouped:
+        for value, count in connection.execute(select(column, func.count()).group_by(column)):
+            if metrique == "cci" and value is None:
+                continue
+            rows[(metrique, _day(value) if metrique == "sinistres_day" else _key(value))] = count
+
+    sums = connection.execute(select(
+        func.sum(RemboursementDB.montant_reclame), func.sum(RemboursementDB.montant_accepte),
+        func.sum(RemboursementDB.montant_net)
+    )).one()
+    for cle, value in zip(("reclame", "accepte", "net"), sums):
+        rows[("montants", cle)] = value or 0
+
+    connection.execute(table.insert(), [{"metrique": m, "cle": c, "valeur": v} for (m, c), v in rows.items()])
+    return len(rows)
+
+
+def is_built(connection) -> bool:
+    table = AnalyticsRollupDB.__table__
+    return connection.execute(
+        select(table.c.valeur).where(table.c.metrique == "meta", table.c.cle == "version")
+    ).first() is not None
+
+
+def _number(value):
+    value = value if isinstance(value, Decimal) else Decimal(str(value or 0))
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _cognitive_card(s: SinistreDB) -> Dict[str, Any]:
+    facts = 0
+    facts += 1 if s.lieu_sinistre else 0
+    facts += 1 if s.date_sinistre else 0
+    facts += 1 if s.tiers_implique is not None else 0
+    facts += 1 if s.documents_complets is not None else 0
+    facts += 1 if s.description else 0
+
+    propositions = 0
+    if s.description:
+        propositions = max(1, len([seg for seg in s.description.replace("?", ".").replace("!", ".").split(".") if seg.strip()]))
+
+    confidence = min(98, 60 + (facts * 6) + (s.cci_score or 0) // 5)
+    client = s.client
+    return {
+        "sinistre_id": str(s.id),
+        "numero_sinistre": s.numero_sinistre,
+        "client": f"{client.nom} {client.prenom}" if client else "",
+        "facts": facts,
+        "propositions": propositions,
+        "ambiguities": 0,
+        "contradictions": 0,
+        "confidence": confidence,
+        "cci_score": s.cci_score or 0,
+        "status": s.status_dossier,
+        "type": s.type_sinistre,
+        "date": s.date_creation.isoformat() if s.date_creation else None
+    }
+
+
+def read_overview(db: Session) -> Dict[str, Any]:
+    """Vue d'ensemble: agrégats + deltas pas encore reportés, puis les dernières fiches cognitives"""
+    combined = union_all(
+        select(AnalyticsRollupDB.metrique, AnalyticsRollupDB.cle, AnalyticsRollupDB.valeur),
+        select(AnalyticsDeltaDB.metrique, AnalyticsDeltaDB.cle, AnalyticsDeltaDB.valeur)
+    ).subquery()
+    values: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    for metrique, cle, valeur in db.execute(
+        select(combined.c.metrique, combined.c.cle, func.sum(combined.c.valeur))
+        .group_by(combined.c.metrique, combined.c.cle)
+    ):
+        if valeur:
+            values[metrique][cle] = _number(valeur)
+
+    cci = sorted((int(score), count) for score, count in values["cci"].items())
+    cci_count = sum(count for _, count in cci)
+    buckets = {name: 0 for name, _ in CCI_BUCKETS}
+    for score, count in cci:
+        name = next(name for name, upper in CCI_BUCKETS if upper is None or score <= upper)
+        buckets[name] += count
+
+    def by_name(metrique):
+        return [{"name": cle or None, "value": count} for cle, count in sorted(values[metrique].items())]
+
+    days = sorted(values["sinistres_day"].items())[-DAYS_SHOWN:]
+    montants = values["montants"]
+    recent = (
+        db.query(SinistreDB).options(joinedload(SinistreDB.client))
+        .order_by(SinistreDB.date_creation.desc()).limit(COGNITIVE_CARDS).all()
+    )
+
+    return {
+        "kpis": {
+            "clients_total": values[TOTAL].get("clients", 0),
+            "sinistres_total": values[TOTAL].get("sinistres", 0),
+            "escalades_total": values[TOTAL].get("escalades", 0),
+            "remboursements_total": values[TOTAL].get("remboursements", 0),
+            "cci_avg": round(sum(score * count for score, count in cci) / cci_count, 2) if cci_count else 0.0,
+            "cci_min": cci[0][0] if cci else 0,
+            "cci_max": cci[-1][0] if cci else 0
+        },
+        "sinistres_by_status": by_name("sinistres_status"),
+        "sinistres_by_type": by_name("sinistres_type"),
+        "sinistres_by_day": [{"date": day, "count": count} for day, count in days],
+        "cci_buckets": [{"range": k, "value": v} for k, v in buckets.items()],
+        "escalades_by_status": by_name("escalades_status"),
+        "remboursements_by_status": by_name("remboursements_status"),
+        "remboursements_sum": {
+            "reclame": float(montants.get("reclame", 0)),
+            "accepte": float(montants.get("accepte", 0)),
+            "net": float(montants.get("net", 0))
+        },
+        "cognitive_cards": [_cognitive_card(s) for s in recent]
+    }
+
@@ -0,0 +1,372 @@
+# backend/services/bulk_import.py
+
+"""
+Import en masse de clients et de contrats (NDJSON ou CSV, une ligne par enregistrement).
+Le flux est lu par blocs de IMPORT_CHUNK_SIZE lignes: validation Pydantic ligne
+à ligne, puis une transaction par bloc qui écarte les doublons (dans le fichier
+et en base, en une requête par clé unique) et insère le reste en un seul
+executemany (insertmanyvalues: INSERT multi-lignes sur PostgreSQL).
+Une ligne invalide est signalée avec son numéro sans interrompre l'import; un bloc
+refusé par la base est coupé en deux jusqu'à isoler les lignes fautives.
+CSV: un seul lecteur csv sur tout le flux (champs entre guillemets sur plusieurs
+lignes), numéro de ligne de début d'enregistrement.
+Les inserts passent par le Core, hors hooks ORM: agrégats, versions d'ETag,
+événements, cache de suivi et index des matricules sont tenus à jour ici.
+"""
+
+import codecs
+import csv
+import json
+import os
+import time
+import uuid
+from collections import deque
+from typing import Iterable, List, Tuple, Dict, Any, Optional, AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, DBAPIError
+
+from backend.database import engine, is_transient_error
+from backend.models import ClientDB, ContratDB
+from backend.models.db_models import normalize_matricule
+from backend.schemas.schemas import ClientCreate, ContratImport
+from backend.services.analytics_rollup import apply_deltas, TOTAL
+from backend.services.change_events import publish_change
+from backend.services.matricules import matricule_index
+from backend.services.resource_versions import bump
+from backend.services.suivi_cache import suivi_cache
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "2000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))  # Erreurs détaillées dans le rapport
+IMPORT_RETRIES = 3  # Conflit avec une écriture concurrente: le bloc est revérifié puis réinséré
+
+FORMATS = ("ndjson", "csv")
+Row = Tuple[int, Dict[str, Any]]  # (numéro de ligne, valeurs)
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'ligne'}: {err['msg']}" for err in e.errors())
+
+
+def _database_message(error: DBAPIError) -> str:
+    detail = str(error.orig or error).strip().splitlines()
+    return f"Refusé par la base: {detail[0] if detail else type(error).__name__}"[:300]
+
+
+class _LineFeed:
+    """
+    Source du lecteur csv, alimentée bloc après bloc (l'état du lecteur survit
+    entre les blocs). `ready`: fins d'enregistrement en attente, repérées à la
+    parité des guillemets (doublés dans un champ) pour ne jamais laisser le
+    lecteur buter sur la fin du tampon au milieu d'un champ.
+    """
+
+    def __init__(self):
+        self.lines = deque()
+        self.ready = 0
+        self._quoted = False
+
+    def push(self, raw: str):
+        if raw.count('"') % 2:
+            self._quoted = not self._quoted
+        self.lines.append((raw + "\n", not self._quoted))
+        self.ready += not self._quoted
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        raw, ends_record = self.lines.popleft()
+        self.ready -= ends_record
+        return raw
+
+
+class RecordReader:
+    """Lignes de texte -> (numéro de ligne, dict ou message d'erreur), en gardant l'en-tête CSV"""
+
+    def __init__(self, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format inconnu: {fmt} (attendu: {', '.join(FORMATS)})")
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+        self.line = 0
+        self._feed = _LineFeed()
+        self._csv = None
+
+    def read(self, lines: Iterable[str], final: bool = False) -> List[Tuple[int, Any]]:
+        """`final`: dernier bloc, un enregistrement resté ouvert est lu tel quel"""
+        if self.fmt == "csv":
+            return self._read_csv(lines, final)
+        records = []
+        for raw in lines:
+            self.line += 1
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except ValueError as e:
+                records.append((self.line, f"JSON invalide: {e}"))
+                continue
+            if not isinstance(record, dict):
+                records.append((self.line, "Objet JSON attendu"))
+                continue
+            records.append((self.line, _defaults(record)))
+        return records
+
+    def _read_csv(self, lines: Iterable[str], final: bool) -> List[Tuple[int, Any]]:
+        for raw in lines:
+            self._feed.push(raw)
+        if self._csv is None:
+            first = next((raw for raw, _ in self._feed.lines if raw.strip()), None)
+            if first is None:
+                return []
+            # Export tableur français: séparateur ';'
+            delimiter = ";" if first.count(";") > first.count(",") else ","
+            self._csv = csv.reader(self._feed, delimiter=delimiter)
+
+        records = []
+        while self._feed.lines and (final or self._feed.ready > 0):
+            start = self._csv.line_num + 1
+            try:
+                values = next(self._csv)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                records.append((start, f"CSV invalide: {e}"))
+                continue
+            if len(values) <= 1 and not "".join(values).strip():
+                continue
+            if self.header is None:
+                self.header = [h.strip() for h in values]
+                continue
+            if len(values) != len(self.header):
+                records.append((start, f"{len(values)} colonnes au lieu de {len(self.header)}"))
+                continue
+            records.append((start, _defaults(dict(zip(self.header, values)))))
+        return records
+
+
+def _defaults(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Cellule vide = valeur par défaut du schéma"""
+    return {k: v for k, v in record.items() if v is not None and v != ""}
+
+
+async def iter_line_batches(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """Flux d'octets (corps de requête) -> listes de lignes complètes, décodées en UTF-8"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        if lines:
+            yield [line.rstrip("\r") for line in lines]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield [pending.rstrip("\r")]
+
+
+# =========================
+# Clients
+# =========================
+
+def _client_values(record: Dict[str, Any]) -> Dict[str, Any]:
+    values = ClientCreate(**record).model_dump()
+    values["id"] = uuid.uuid4()
+    values["matricule_normalized"] = normalize_matricule(values["matricule"])
+    return values
+
+
+def _accept_clients(conn, rows: List[Row]) -> Tuple[List[Row], List[Tuple[int, str]]]:
+    matricules = {v["matricule_normalized"] for _, v in rows}
+    emails = {v["email"] for _, v in rows}
+    taken_matricules = set(conn.execute(
+        select(ClientDB.matricule_normalized).where(ClientDB.matricule_normalized.in_(matricules))
+    ).scalars())
+    taken_emails = set(conn.execute(select(ClientDB.email).where(ClientDB.email.in_(emails))).scalars())
+
+    accepted, errors = [], []
+    for line, values in rows:
+        if values["matricule_normalized"] in taken_matricules:
+            errors.append((line, f"Matricule déjà existant: {values['matricule']}"))
+        elif values["email"] in taken_emails:
+            errors.append((line, f"Email déjà existant: {values['email']}"))
+        else:
+            taken_matricules.add(values["matricule_normalized"])
+            taken_emails.add(values["email"])
+            accepted.append((line, values))
+    return accepted, errors
+
+
+def _clients_written(conn, values: List[Dict[str, Any]]):
+    apply_deltas(conn, {(TOTAL, "clients"): len(values)})
+
+
+def _clients_committed(bind, values: List[Dict[str, Any]]):
+    bump(bind, ["clients"])
+    publish_change("clients", "created", [v["id"] for v in values])
+    if matricule_index.loaded:
+        for v in values:
+            matricule_index.add(v["matricule"])
+
+
+# =========================
+# Contrats
+# =========================
+
+def _contrat_values(record: Dict[str, Any]) -> Dict[str, Any]:
+    contrat = ContratImport(**record)
+    if contrat.client_id is None and not contrat.matricule:
+        raise ValueError("client_id ou matricule requis")
+    values = contrat.model_dump()
+    values["id"] = uuid.uuid4()
+    return values
+
+
+def _accept_contrats(conn, rows: List[Row]) -> Tuple[List[Row], List[Tuple[int, str]]]:
+    numeros = {v["numero_contrat"] for _, v in rows}
+    taken = set(conn.execute(select(ContratDB.numero_contrat).where(ContratDB.numero_contrat.in_(numeros))).scalars())
+    client_ids = {v["client_id"] for _, v in rows if v["client_id"] is not None}
+    known_ids = set(conn.execute(select(ClientDB.id).where(ClientDB.id.in_(client_ids))).scalars()) if client_ids else set()
+    matricules = {normalize_matricule(v["matricule"]) for _, v in rows if v["client_id"] is None}
+    by_matricule = dict(conn.execute(
+        select(ClientDB.matricule_normalized, ClientDB.id).where(ClientDB.matricule_normalized.in_(matricules))
+    ).all()) if matricules else {}
+
+    accepted, errors = [], []
+    for line, values in rows:
+        reference = values.pop("client_id")
+        matricule = values.pop("matricule")
+        if reference is None:
+            client_id = by_matricule.get(normalize_matricule(matricule))
+        else:
+            client_id = reference if reference in known_ids else None
+        if client_id is None:
+            errors.append((line, f"Client non trouvé: {reference or matricule}"))
+        elif values["numero_contrat"] in taken:
+            errors.append((line, f"Numéro de contrat déjà existant: {values['numero_contrat']}"))
+        else:
+            taken.add(values["numero_contrat"])
+            accepted.append((line, {**values, "client_id": client_id}))
+    return accepted, errors
+
+
+def _contrats_committed(bind, values: List[Dict[str, Any]]):
+    bump(bind, ["contrats"])
+    publish_change("contrats", "created", [v["id"] for v in values])
+    suivi_cache.invalidate(client_ids={v["client_id"] for v in values})
+
+
+# ressource -> (table, validation d'une ligne, filtre en base, effets dans la transaction, effets après commit)
+SPECS = {
+    "clients": (ClientDB.__table__, _client_values, _accept_clients, _clients_written, _clients_committed),
+    "contrats": (ContratDB.__table__, _contrat_values, _accept_contrats, None, _contrats_committed),
+}
+
+
+class ImportReport:
+    def __init__(self, resource: str, fmt: str):
+        self.resource = resource
+        self.fmt = fmt
+        self.total = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.started = time.perf_counter()
+
+    def error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "resource": self.resource,
+            "format": self.fmt,
+            "total": self.total,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda e: e["line"]),
+            "errors_truncated": self.failed > len(self.errors),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "rows_per_second": round(self.total / elapsed) if elapsed > 0 else 0
+        }
+
+
+class BulkImporter:
+    """Un importeur par import, alimenté par blocs de lignes; une transaction par bloc"""
+
+    def __init__(self, resource: str, fmt: str, bind=None):
+        if resource not in SPECS:
+            raise ValueError(f"Ressource non importable: {resource}")
+        self.reader = RecordReader(fmt)
+        self.report = ImportReport(resource, fmt)
+        self.bind = bind if bind is not None else engine
+        self.table, self.validate, self.accept, self.written, self.committed = SPECS[resource]
+
+    def feed(self, lines: Iterable[str], final: bool = False):
+        """Un bloc de lignes; `final` pour le dernier. Ne lève pas: toute ligne refusée va au rapport"""
+        rows: List[Row] = []
+        for line, record in self.reader.read(lines, final):
+            self.report.total += 1
+            if isinstance(record, str):
+                self.report.error(line, record)
+                continue
+            try:
+                rows.append((line, self.validate(record)))
+            except ValidationError as e:
+                self.report.error(line, _validation_message(e))
+            except ValueError as e:
+                self.report.error(line, str(e))
+        if rows:
+            self._write(rows)
+
+    def _write(self, rows: List[Row]):
+        for attempt in range(IMPORT_RETRIES):
+            try:
+                with self.bind.begin() as conn:
+                    accepted, errors = self.accept(conn, [(line, dict(values)) for line, values in rows])
+                    values = [v for _, v in accepted]
+                    if values:
+                        conn.execute(self.table.insert(), values)
+                        if self.written:
+                            self.written(conn, values)
+            except DBAPIError as e:
+                # Ligne concurrente insérée entre la vérification et l'insert, ou connexion
+                # perdue: revérifier le bloc. Sinon (valeur trop longue...): isoler les lignes
+                if attempt < IMPORT_RETRIES - 1 and (isinstance(e, IntegrityError) or is_transient_error(e)):
+                    continue
+                self._reject(rows, e)
+                return
+            for line, message in errors:
+                self.report.error(line, message)
+            self.report.inserted += len(values)
+            if values:
+                self.committed(self.bind, values)
+            return
+
+    def _reject(self, rows: List[Row], error: DBAPIError):
+        """Bloc refusé: coupé en deux jusqu'aux lignes fautives (base indisponible: tout le bloc est rapporté)"""
+        if len(rows) > 1 and not is_transient_error(error):
+            middle = len(rows) // 2
+            self._write(rows[:middle])
+            self._write(rows[middle:])
+            return
+        for line, _ in rows:
+            self.report.error(line, _database_message(error))
+
+
+def import_lines(resource: str, fmt: str, lines: Iterable[str], chunk_size: int = IMPORT_CHUNK_SIZE, bind=None) -> Dict[str, Any]:
+    """Import synchrone d'un itérable de lignes (fichier ouvert en texte, CLI)"""
+    importer = BulkImporter(resource, fmt, bind)
+    chunk = []
+    for line in lines:
+        chunk.append(line.rstrip("\r\n"))
+        if len(chunk) >= chunk_size:
+            importer.feed(chunk)
+            chunk = []
+    importer.feed(chunk, final=True)
+    return importer.report.to_dict()
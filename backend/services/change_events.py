@@ -0,0 +1,77 @@
+# backend/services/change_events.py
+
+"""
+Événements de changement typés pour les tableaux de bord.
+Toute écriture ORM (routes sync ou async, WebSocket de conversation) est
+collectée au flush puis publiée sur le bus après commit: un événement par
+ressource et par action, avec les ids concernés. Rien n'est publié si la
+transaction est annulée. Les écritures hors base (analyses d'émotions) publient
+directement via publish_change().
+Le bus ne dépasse pas le worker: les tableaux de bord gardent un polling lent
+(réponses 304) pour les écritures traitées par les autres workers.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Dict, Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    ClientDB, ContratDB, SinistreDB, RemboursementDB, EscaladeDB, ConseillerDB, ActionRecommandeeDB
+)
+from backend.services.event_bus import event_bus
+
+RESOURCES = {
+    ClientDB: "clients",
+    ContratDB: "contrats",
+    SinistreDB: "sinistres",
+    RemboursementDB: "remboursements",
+    EscaladeDB: "escalades",
+    ConseillerDB: "conseillers",
+    ActionRecommandeeDB: "actions",
+}
+EMOTIONS = "emotions"
+TOPICS = sorted(set(RESOURCES.values()) | {EMOTIONS})
+_PENDING = "change_events"
+
+
+def publish_change(resource: str, action: str, ids: Iterable = (), **details) -> Dict[str, Any]:
+    """action: created | updated | deleted"""
+    payload = {"type": "change", "resource": resource, "action": action, "ids": [str(i) for i in ids], **details}
+    return event_bus.publish(resource, payload)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault(_PENDING, defaultdict(dict))
+    for action, objects in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            resource = RESOURCES.get(type(obj))
+            if resource is None or (action == "updated" and not session.is_modified(obj, include_collections=False)):
+                continue
+            # Clé primaire lue sur l'instance: identity est encore None pour une ligne insérée par ce flush
+            state = inspect(obj)
+            row_id = state.mapper.primary_key_from_instance(obj)[0]
+            # Créé puis modifié dans la même transaction: reste "created"
+            if action == "updated" and pending[resource].get(row_id) == "created":
+                continue
+            pending[resource][row_id] = action
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    for resource, changes in pending.items():
+        by_action = defaultdict(list)
+        for row_id, action in changes.items():
+            by_action[action].append(row_id)
+        for action, ids in by_action.items():
+            publish_change(resource, action, ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,125 @@
+# backend/services/claim_numbers.py
+
+"""
+Allocation des numéros de sinistre (SINS-AAAAMMJJ-NNNNNNNN).
+Chaque worker réserve un bloc de valeurs en base puis les distribue en mémoire:
+- PostgreSQL: séquence dont l'incrément vaut la taille du bloc (nextval = début du bloc)
+- SQLite (dev): ligne de la table `compteurs` incrémentée dans sa propre transaction
+Le chemin chaud ne touche pas la base; deux workers ne reçoivent jamais le même bloc.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy import text, select, update, exc
+
+from backend.models import CompteurDB
+
+logger = logging.getLogger(__name__)
+
+# Fixe: l'incrément de la séquence PostgreSQL est créé avec cette valeur
+CLAIM_NUMBER_BLOCK_SIZE = 100
+CLAIM_NUMBER_SEQUENCE = "sinistre_numero_seq"
+CLAIM_NUMBER_COUNTER = "numero_sinistre"
+
+
+def format_claim_number(value: int, when: datetime = None) -> str:
+    """SINS-20260115-00000042: la date aide la lecture, la valeur garantit l'unicité"""
+    return f"SINS-{(when or datetime.utcnow()).strftime('%Y%m%d')}-{value:08d}"
+
+
+class ClaimNumberAllocator:
+    """Distribue des numéros uniques à partir de blocs réservés en base"""
+
+    def __init__(self, engine, block_size: int = CLAIM_NUMBER_BLOCK_SIZE):
+        self.engine = engine
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0  # Exclusif: bloc épuisé quand _next == _end
+        self._pid = os.getpid()
+        self._sequence_ready = False
+        self.blocks_reserved = 0
+
+    def next_value(self) -> int:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Process forké: le bloc hérité appartient au parent
+                self._pid = os.getpid()
+                self._next = self._end = 0
+            if self._next >= self._end:
+                self._next = self._reserve_block()
+                self._end = self._next + self.block_size
+                self.blocks_reserved += 1
+            value = self._next
+            self._next += 1
+            return value
+
+    def next_number(self) -> str:
+        return format_claim_number(self.next_value())
+
+    async def next_number_async(self) -> str:
+        """Sans I/O tant que le bloc n'est pas épuisé; la réservation passe par un thread"""
+        with self._lock:
+            available = self._pid == os.getpid() and self._next < self._end
+            if available:
+                value = self._next
+                self._next += 1
+        if available:
+            return format_claim_number(value)
+        return await asyncio.to_thread(self.next_number)
+
+    def _reserve_block(self) -> int:
+        """Premier numéro d'un bloc neuf, réservé dans une transaction indépendante"""
+        if self.engine.dialect.name == "postgresql":
+            return self._reserve_from_sequence()
+        return self._reserve_from_counter()
+
+    def _reserve_from_sequence(self) -> int:
+        with self.engine.begin() as conn:
+            if not self._sequence_ready:
+                conn.execute(text(
+                    f"CREATE SEQUENCE IF NOT EXISTS {CLAIM_NUMBER_SEQUENCE} "
+                    f"START WITH 1 INCREMENT BY {self.block_size}"
+                ))
+                self._sequence_ready = True
+            return conn.execute(text(f"SELECT nextval('{CLAIM_NUMBER_SEQUENCE}')")).scalar_one()
+
+    def _reserve_from_counter(self) -> int:
+        counters = CompteurDB.__table__
+        stmt = (
+            update(counters)
+            .where(counters.c.nom == CLAIM_NUMBER_COUNTER)
+            .values(valeur=counters.c.valeur + self.block_size)
+        )
+        for _ in range(3):
+            # L'UPDATE prend le verrou d'écriture: la relecture voit notre propre incrément
+            with self.engine.begin() as conn:
+                if conn.execute(stmt).rowcount:
+                    end = conn.execute(
+                        select(counters.c.valeur).where(counters.c.nom == CLAIM_NUMBER_COUNTER)
+                    ).scalar_one()
+                    return end - self.block_size + 1
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(counters.insert().values(nom=CLAIM_NUMBER_COUNTER, valeur=self.block_size))
+                return 1
+            except exc.IntegrityError:
+                continue  # Un autre worker a créé le compteur entre-temps
+        raise RuntimeError("Impossible de réserver un bloc de numéros de sinistre")
+
+
+_allocator = None
+_allocator_lock = threading.Lock()
+
+
+def get_claim_number_allocator() -> ClaimNumberAllocator:
+    global _allocator
+    with _allocator_lock:
+        if _allocator is None:
+            from backend.database import engine
+            _allocator = ClaimNumberAllocator(engine)
+        return _allocator
@@ -0,0 +1,82 @@
+# backend/services/escalation_queue.py
+
+"""
+File d'escalades en attente des conseillers.
+Une seule requête jointe (escalade, sinistre, client, conseiller), triée par CCI
+décroissant puis par ancienneté; les changements sont poussés sur le bus
+d'événements sous forme de deltas (upsert / remove) par escalade.
+"""
+
+from typing import Optional, Dict, Any
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from backend.models import EscaladeDB, SinistreDB, ClientDB, ConseillerDB
+from backend.services.event_bus import event_bus
+
+QUEUE_TOPIC = "escalades.queue"
+QUEUE_STATUS = "en_attente"
+
+
+def queue_statement(escalade_id: Optional[UUID] = None):
+    """SELECT joint de la file; restreint à une escalade si escalade_id est fourni"""
+    cci = func.coalesce(EscaladeDB.cci_score_trigger, SinistreDB.cci_score, 0)
+    stmt = (
+        select(EscaladeDB, SinistreDB, ClientDB, ConseillerDB)
+        .outerjoin(SinistreDB, SinistreDB.id == EscaladeDB.sinistre_id)
+        .outerjoin(ClientDB, ClientDB.id == SinistreDB.client_id)
+        .outerjoin(ConseillerDB, ConseillerDB.id == EscaladeDB.conseiller_id)
+        .where(EscaladeDB.status == QUEUE_STATUS)
+        .order_by(cci.desc(), EscaladeDB.date_escalade.asc())
+    )
+    if escalade_id is not None:
+        stmt = stmt.where(EscaladeDB.id == escalade_id)
+    return stmt
+
+
+def queue_item(e: EscaladeDB, sinistre: Optional[SinistreDB], client: Optional[ClientDB], conseiller: Optional[ConseillerDB]) -> Dict[str, Any]:
+    return {
+        "escalade_id": str(e.id),
+        "status": e.status,
+        "raison": e.raison_escalade,
+        "cci_score": e.cci_score_trigger,
+        "date_escalade": e.date_escalade.isoformat() if e.date_escalade else None,
+        "sinistre": {
+            "id": str(sinistre.id) if sinistre else None,
+            "numero": sinistre.numero_sinistre if sinistre else None,
+            "type": sinistre.type_sinistre if sinistre else None,
+            "status": sinistre.status_dossier if sinistre else None,
+        },
+        "client": {
+            "id": str(client.id) if client else None,
+            "matricule": client.matricule if client else None,
+            "nom": client.nom if client else None,
+            "prenom": client.prenom if client else None,
+            "telephone": client.telephone if client else None,
+        },
+        "conseiller": {
+            "id": str(conseiller.id),
+            "nom": conseiller.nom,
+            "prenom": conseiller.prenom,
+            "email": conseiller.email,
+        } if conseiller else None
+    }
+
+
+def load_queue_item(db: Session, escalade_id: UUID) -> Optional[Dict[str, Any]]:
+    """Élément de file d'une escalade (None si elle n'est plus en attente)"""
+    row = db.execute(queue_statement(escalade_id)).first()
+    return queue_item(*row) if row else None
+
+
+def publish_queue_change(event: str, escalade_id, item: Optional[Dict[str, Any]] = None):
+    """
+    Delta de file après commit: upsert si l'escalade est (encore) en attente,
+    remove sinon. event: created | assigned | updated | completed | deleted
+    """
+    payload = {"type": "upsert" if item else "remove", "event": event, "escalade_id": str(escalade_id)}
+    if item:
+        payload["item"] = item
+    return event_bus.publish(QUEUE_TOPIC, payload)
@@ -0,0 +1,115 @@
+# backend/services/event_bus.py
+
+"""
+Bus d'événements en mémoire du process pour les canaux push (WebSocket).
+Les routes publient après commit, depuis la boucle asyncio ou depuis le pool de
+threads des routes synchrones; chaque abonné reçoit les événements sur sa propre
+boucle via une file bornée. Un abonné trop lent reçoit un unique {"type": "resync"}
+à la place des événements perdus et doit recharger son instantané.
+Portée: un worker uvicorn (les clients gardent un polling lent pour les écritures
+des autres workers). Chaque événement porte un numéro de séquence croissant.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+from typing import Dict, Any, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS_QUEUE_SIZE = int(os.getenv("EVENT_BUS_QUEUE_SIZE", "500"))
+
+
+class Subscription:
+    """File d'événements d'un abonné, consommée sur sa boucle"""
+
+    def __init__(self, bus: "EventBus", topics: Set[str], loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.bus = bus
+        self.topics = topics
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._resync_pending = False
+
+    def _deliver(self, event: Dict[str, Any]):
+        """Exécuté sur la boucle de l'abonné"""
+        if self._resync_pending:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Les deltas en file ne suffisent plus: on les remplace par une demande de resync
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "seq": event["seq"]})
+            self._resync_pending = True
+
+    async def get(self) -> Dict[str, Any]:
+        event = await self.queue.get()
+        if event.get("type") == "resync":
+            self._resync_pending = False
+        return event
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """Diffusion par sujet vers les abonnés du process"""
+
+    def __init__(self, queue_size: int = EVENT_BUS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def subscribe(self, topics: Iterable[str], maxsize: Optional[int] = None) -> Subscription:
+        """À appeler depuis la boucle qui consommera les événements"""
+        subscription = Subscription(self, set(topics), asyncio.get_running_loop(), maxsize or self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, topic: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Thread-safe; ne bloque jamais l'émetteur"""
+        with self._lock:
+            seq = self._last_seq = next(self._seq)
+            targets = [s for s in self._subscribers if topic in s.topics]
+        event = {"topic": topic, "seq": seq, **payload}
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Boucle fermée: abonné orphelin
+                self.unsubscribe(subscription)
+        return event
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "last_seq": self._last_seq,
+                "dropped": sum(s.dropped for s in self._subscribers)
+            }
+
+
+event_bus = EventBus()
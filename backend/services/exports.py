@@ -0,0 +1,236 @@
+# backend/services/exports.py
+
+"""
+Export en flux des sinistres et remboursements (actuariat, BI): NDJSON, CSV ou Parquet.
+Une requête Core parcourue par lots de EXPORT_BATCH_SIZE lignes (yield_per:
+curseur serveur sur PostgreSQL), chaque lot encodé puis envoyé aussitôt:
+la mémoire reste celle d'un lot, quelle que soit la taille de la table.
+Parquet: un row group par lot, pyarrow optionnel (501 s'il est absent).
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Iterator, Optional, List, Sequence
+
+from sqlalchemy import select, Boolean, Date, DateTime, Integer, Numeric, Time
+
+from backend.database import engine
+from backend.models import ClientDB, SinistreDB, RemboursementDB
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# =========================
+# Requêtes
+# =========================
+
+def sinistres_statement(date_from: Optional[date] = None, date_to: Optional[date] = None,
+                        status: Sequence[str] = (), types: Sequence[str] = ()):
+    """Période sur date_sinistre (survenance), bornes incluses"""
+    stmt = (
+        select(*SinistreDB.__table__.c, ClientDB.matricule.label("client_matricule"))
+        .join(ClientDB, ClientDB.id == SinistreDB.client_id)
+    )
+    if date_from:
+        stmt = stmt.where(SinistreDB.date_sinistre >= date_from)
+    if date_to:
+        stmt = stmt.where(SinistreDB.date_sinistre <= date_to)
+    if status:
+        stmt = stmt.where(SinistreDB.status_dossier.in_(status))
+    if types:
+        stmt = stmt.where(SinistreDB.type_sinistre.in_(types))
+    # Ordre de l'index (date_creation, id): parcours sans tri côté base
+    return stmt.order_by(SinistreDB.date_creation, SinistreDB.id)
+
+
+def remboursements_statement(date_from: Optional[date] = None, date_to: Optional[date] = None,
+                             status: Sequence[str] = (), types: Sequence[str] = ()):
+    """Période sur date_creation, bornes incluses; le type est celui du sinistre"""
+    stmt = (
+        select(
+            *RemboursementDB.__table__.c,
+            SinistreDB.numero_sinistre.label("numero_sinistre"),
+            SinistreDB.type_sinistre.label("type_sinistre")
+        )
+        .join(SinistreDB, SinistreDB.id == RemboursementDB.sinistre_id)
+    )
+    if date_from:
+        stmt = stmt.where(RemboursementDB.date_creation >= datetime.combine(date_from, time.min))
+    if date_to:
+        stmt = stmt.where(RemboursementDB.date_creation < datetime.combine(date_to + timedelta(days=1), time.min))
+    if status:
+        stmt = stmt.where(RemboursementDB.status.in_(status))
+    if types:
+        stmt = stmt.where(SinistreDB.type_sinistre.in_(types))
+    return stmt.order_by(RemboursementDB.date_creation, RemboursementDB.id)
+
+
+STATEMENTS = {
+    "sinistres": sinistres_statement,
+    "remboursements": remboursements_statement,
+}
+
+
+def iter_batches(statement, batch_size: int = EXPORT_BATCH_SIZE, bind=None) -> Iterator[List[tuple]]:
+    """Lots de lignes; la connexion est tenue le temps du parcours et rendue à la fin ou à l'abandon"""
+    with (bind if bind is not None else engine).connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(statement)
+        for partition in result.partitions():
+            yield partition
+
+
+# =========================
+# Encodeurs
+# =========================
+
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _encode_ndjson(names: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False) + "\n" for row in rows
+        ).encode()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(names: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Fichier en écriture seule vidé à chaque lot; tell() reste la position absolue (offsets du footer Parquet)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(pa, column_type):
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Numeric):
+        # Précision maximale, échelle de la colonne: la précision déclarée n'est pas
+        # garantie par la base (ex. responsabilite_assuree Numeric(3,1), défaut 100)
+        return pa.decimal128(38, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Time):
+        return pa.time64("us")
+    return pa.string()  # Texte, UUID
+
+
+def _arrow_column(pa_type, values, pa):
+    if pa.types.is_string(pa_type):
+        return [None if v is None else str(v) for v in values]
+    if pa.types.is_decimal(pa_type):
+        # SQLite rend des flottants convertis: ramener à l'échelle de la colonne
+        quantum = Decimal(1).scaleb(-pa_type.scale)
+        return [None if v is None else Decimal(v).quantize(quantum) for v in values]
+    return list(values)
+
+
+def _encode_parquet(columns, batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c.name, _arrow_type(pa, c.type)) for c in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for rows in batches:
+            arrays = {
+                field.name: _arrow_column(field.type, values, pa)
+                for field, values in zip(schema, zip(*rows))
+            }
+            writer.write_table(pa.Table.from_pydict(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _closing(chunks: Iterator[bytes], batches) -> Iterator[bytes]:
+    """Flux fermé avant la fin (client parti): encodeur puis connexion libérés dans l'ordre"""
+    try:
+        yield from chunks
+    finally:
+        chunks.close()
+        batches.close()
+
+
+def stream_export(resource: str, fmt: str, batch_size: int = EXPORT_BATCH_SIZE, bind=None, **filters) -> Iterator[bytes]:
+    """Générateur d'octets pour StreamingResponse (itéré dans le threadpool)"""
+    if resource not in STATEMENTS:
+        raise ValueError(f"Ressource non exportable: {resource}")
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Format inconnu: {fmt} (attendu: {', '.join(MEDIA_TYPES)})")
+    statement = STATEMENTS[resource](**filters)
+    columns = list(statement.selected_columns)
+    batches = iter_batches(statement, batch_size, bind)
+    if fmt == "parquet":
+        chunks = _encode_parquet(columns, batches)
+    else:
+        encode = _encode_ndjson if fmt == "ndjson" else _encode_csv
+        chunks = encode([c.name for c in columns], batches)
+    return _closing(chunks, batches)
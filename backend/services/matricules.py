@@ -0,0 +1,187 @@
+# backend/services/matricules.py
+
+"""
+Résolution des matricules clients.
+Toutes les variantes (AB-4521-22, AB452122, "AB 4521 22") se ramènent à la
+forme canonique `matricule_normalized`: une seule requête indexée suffit.
+Un index en mémoire propose les matricules les plus proches quand la STT
+a mal entendu un caractère (évite un cycle TTS -> client -> STT).
+"""
+
+import logging
+import threading
+from typing import Optional, List, Tuple, Dict, Set
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models import ClientDB
+from backend.models.db_models import normalize_matricule
+
+logger = logging.getLogger(__name__)
+
+
+def _single(clients: List[ClientDB], normalized: str) -> Optional[ClientDB]:
+    """
+    Base antérieure à l'index unique (doublons rapportés par la migration):
+    une forme partagée par deux clients n'en désigne aucun
+    """
+    if len(clients) > 1:
+        logger.warning(f"⚠️ Matricule {normalized} ambigu ({len(clients)} clients): non résolu")
+        return None
+    return clients[0] if clients else None
+
+
+def find_client_by_matricule(db: Session, matricule: str) -> Optional[ClientDB]:
+    """Client dont le matricule correspond, quel que soit le format saisi"""
+    normalized = normalize_matricule(matricule)
+    if not normalized:
+        return None
+    return _single(db.query(ClientDB).filter(ClientDB.matricule_normalized == normalized).limit(2).all(), normalized)
+
+
+async def find_client_by_matricule_async(db: AsyncSession, matricule: str) -> Optional[ClientDB]:
+    """Variante AsyncSession de find_client_by_matricule"""
+    normalized = normalize_matricule(matricule)
+    if not normalized:
+        return None
+    result = await db.execute(select(ClientDB).where(ClientDB.matricule_normalized == normalized).limit(2))
+    return _single(result.scalars().all(), normalized)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Distance d'édition (insertion, suppression, substitution)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        previous = current
+    return previous[-1]
+
+
+class MatriculeIndex:
+    """
+    Index des matricules normalisés par voisinage de suppressions (symmetric delete).
+    Chaque matricule est rangé sous toutes ses variantes à <= MAX_DISTANCE caractères
+    supprimés; deux matricules à distance d'édition <= 2 partagent forcément une variante.
+    Une recherche ne calcule donc la distance exacte que sur une poignée de candidats.
+    """
+
+    MAX_DISTANCE = 2
+
+    def __init__(self):
+        self._display: Dict[str, str] = {}  # normalisé -> matricule affiché
+        self._buckets: Dict[str, Set[str]] = {}  # variante -> matricules normalisés
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._display)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def ensure_loaded(self, db: Session):
+        """Construit l'index depuis la base au premier usage"""
+        if self._loaded:
+            return
+        rows = db.query(ClientDB.matricule_normalized, ClientDB.matricule).all()
+        self.rebuild(rows)
+
+    def rebuild(self, rows):
+        with self._lock:
+            self._display = {}
+            self._buckets = {}
+            for normalized, matricule in rows:
+                self._insert(normalized or normalize_matricule(matricule), matricule)
+            self._loaded = True
+        logger.info(f"🔎 Index matricules: {len(self._display)} entrées")
+
+    def add(self, matricule: str):
+        with self._lock:
+            self._insert(normalize_matricule(matricule), matricule)
+
+    def remove(self, matricule: str):
+        normalized = normalize_matricule(matricule)
+        with self._lock:
+            if self._display.pop(normalized, None) is None:
+                return
+            for variant in self._variants(normalized, self.MAX_DISTANCE):
+                bucket = self._buckets.get(variant)
+                if bucket is not None:
+                    bucket.discard(normalized)
+                    if not bucket:
+                        del self._buckets[variant]
+
+    def _insert(self, normalized: str, matricule: str):
+        if not normalized:
+            return
+        self._display[normalized] = matricule
+        for variant in self._variants(normalized, self.MAX_DISTANCE):
+            self._buckets.setdefault(variant, set()).add(normalized)
+
+    @staticmethod
+    def _variants(word: str, depth: int) -> Set[str]:
+        """Le mot et toutes ses variantes avec jusqu'à `depth` caractères supprimés"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(depth):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def search(self, matricule: str, max_distance: int = 2, limit: int = 3) -> List[Tuple[int, str]]:
+        """Matricules à distance <= max_distance, triés du plus proche au plus lointain"""
+        query = normalize_matricule(matricule)
+        if not query:
+            return []
+        max_distance = min(max_distance, self.MAX_DISTANCE)
+        candidates = set()
+        with self._lock:
+            for variant in self._variants(query, max_distance):
+                candidates.update(self._buckets.get(variant, ()))
+            results = []
+            for word in candidates:
+                if abs(len(word) - len(query)) > max_distance:
+                    continue
+                distance = levenshtein(query, word)
+                if distance <= max_distance:
+                    results.append((distance, self._display[word]))
+        results.sort()
+        return results[:limit]
+
+
+matricule_index = MatriculeIndex()
+
+
+# Maintenance incrémentale (uniquement si l'index est déjà construit)
+@event.listens_for(ClientDB, "after_insert")
+def _index_client_insert(mapper, connection, target):
+    if matricule_index.loaded:
+        matricule_index.add(target.matricule)
+
+
+@event.listens_for(ClientDB, "after_update")
+def _index_client_update(mapper, connection, target):
+    if not matricule_index.loaded:
+        return
+    history = inspect(target).attrs.matricule.history
+    if history.has_changes():
+        for old in history.deleted or []:
+            matricule_index.remove(old)
+        matricule_index.add(target.matricule)
+
+
+@event.listens_for(ClientDB, "after_delete")
+def _index_client_delete(mapper, connection, target):
+    if matricule_index.loaded:
+        matricule_index.remove(target.matricule)
@@ -0,0 +1,83 @@
+# backend/services/pagination.py
+
+"""
+Pagination par curseur (keyset) des listes, triées par (date, id) décroissants.
+La page suivante reprend strictement après la dernière ligne vue:
+WHERE (date, id) < (:date, :id) ORDER BY date DESC, id DESC LIMIT n
+coût constant quelle que soit la profondeur, contrairement à OFFSET.
+Le curseur est opaque pour le client (base64 url-safe).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple, List, Any, Union
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_, literal, type_coerce, String
+
+Cursor = Tuple[str, UUID]
+FIRST_PAGE = ()
+
+
+def encode_cursor(sort_value: Union[datetime, str], row_id) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        datetime.fromisoformat(sort_value)  # Validation seulement: la borne garde la forme stockée
+        return sort_value, UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Curseur invalide: {cursor!r}") from e
+
+
+def cursor_param(
+    cursor: Optional[str] = Query(None, description="Pagination par curseur: vide pour la première page, puis next_cursor")
+):
+    """
+    Dépendance FastAPI: None (pas de curseur, pagination par offset historique),
+    FIRST_PAGE (curseur vide) ou la position décodée
+    """
+    if cursor is None:
+        return None
+    if not cursor:
+        return FIRST_PAGE
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def ordered(query, sort_column, id_column):
+    """Ordre stable commun aux deux modes: l'id départage les dates égales"""
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+def keyset_page(query, sort_column, id_column, cursor: Cursor, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Page après `cursor` (query non triée) et curseur de la suivante (None en fin de liste)"""
+    # SQLite compare les dates en texte, et CURRENT_TIMESTAMP n'y a pas de fraction de seconde:
+    # le curseur y porte la valeur telle que stockée, pour une borne exacte
+    as_text = query.session.get_bind().dialect.name == "sqlite"
+    if cursor:
+        sort_value, row_id = cursor
+        bound = literal(sort_value, String) if as_text else literal(datetime.fromisoformat(sort_value), sort_column.type)
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(bound, literal(row_id, id_column.type)))
+    query = ordered(query, sort_column, id_column)
+    if as_text:
+        rows = query.add_columns(type_coerce(sort_column, String)).limit(limit + 1).all()
+    else:
+        rows = [(row, None) for row in query.limit(limit + 1).all()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, raw = rows[-1]
+        next_cursor = encode_cursor(raw if as_text else getattr(last, sort_column.key), getattr(last, id_column.key))
+    return [row for row, _ in rows], next_cursor
@@ -0,0 +1,161 @@
+# backend/services/resource_versions.py
+
+"""
+Versions par ressource pour les GET conditionnels (ETag faible / If-None-Match).
+Les ressources écrites sont collectées au flush; leurs versions sont incrémentées
+après commit, hors de la transaction d'écriture (rien après un rollback):
+- PostgreSQL: une séquence par ressource, nextval() ne verrouille rien, les
+  écrivains de tous les workers ne se sérialisent pas sur une ligne chaude;
+- SQLite (dev, un seul écrivain): ligne `version:<ressource>` de compteurs, en
+  transaction courte.
+Une version n'est donc jamais visible avant les données: au pire un client
+reçoit les nouvelles données sous l'ancien ETag et les recharge une fois de plus.
+Une route déclare les ressources qu'elle lit; son ETag se calcule en une seule
+lecture et un If-None-Match identique répond 304 sans exécuter la requête de
+liste ni sérialiser la réponse.
+Les données sur fichiers (analyses d'émotions) sont versionnées par la date de
+modification de leurs répertoires.
+"""
+
+from pathlib import Path
+from typing import Iterable, Dict, Optional, Sequence
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event, select, update, union_all, literal, case, table, column
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.models import ClientDB, ContratDB, SinistreDB, RemboursementDB, EscaladeDB, ConseillerDB, CompteurDB
+from backend.models.db_models import VERSION_SEQUENCES
+
+VERSIONED = {
+    SinistreDB: "sinistres",
+    EscaladeDB: "escalades",
+    RemboursementDB: "remboursements",
+    ContratDB: "contrats",
+    # Noms de clients et conseillers recopiés dans les listes
+    ClientDB: "clients",
+    ConseillerDB: "conseillers",
+}
+_PREFIX = "version:"
+_PENDING = "resource_versions"
+
+
+def bump(bind, resources: Iterable[str]):
+    """
+    Incrémente les versions, à appeler après commit avec un Engine: transaction
+    propre et courte, jamais celle de l'écriture (aucun verrou gardé jusqu'au commit)
+    """
+    resources = sorted(set(resources))
+    if not resources:
+        return
+    if bind.dialect.name == "postgresql":
+        with bind.connect() as conn:
+            conn.execute(select(*(VERSION_SEQUENCES[r].next_value() for r in resources)))
+            conn.commit()
+        return
+    table = CompteurDB.__table__
+    rows = [{"nom": _PREFIX + r, "valeur": 1} for r in resources]
+    with bind.begin() as conn:
+        if bind.dialect.name == "sqlite":
+            stmt = sqlite.insert(table)
+            stmt = stmt.on_conflict_do_update(index_elements=[table.c.nom], set_={"valeur": table.c.valeur + 1})
+            conn.execute(stmt, rows)
+            return
+        for row in rows:
+            result = conn.execute(update(table).where(table.c.nom == row["nom"]).values(valeur=table.c.valeur + 1))
+            if not result.rowcount:
+                conn.execute(table.insert().values(**row))
+
+
+def current_versions(db: Session, resources: Sequence[str]) -> Dict[str, int]:
+    if db.get_bind().dialect.name == "postgresql":
+        # Avant le premier nextval(): last_value vaut 1 avec is_called faux, lu comme 0
+        sequences = {r: table(VERSION_SEQUENCES[r].name, column("last_value"), column("is_called")) for r in resources}
+        found = dict(db.execute(union_all(*(
+            select(literal(r), case((seq.c.is_called, seq.c.last_value), else_=0)) for r, seq in sequences.items()
+        ))).all())
+        return {r: found.get(r, 0) for r in resources}
+    names = {_PREFIX + r: r for r in resources}
+    found = dict(db.execute(select(CompteurDB.nom, CompteurDB.valeur).where(CompteurDB.nom.in_(list(names)))).all())
+    return {resource: found.get(name, 0) for name, resource in names.items()}
+
+
+def files_version(directories: Iterable[Path]) -> str:
+    """Ajout, suppression ou renommage de fichier = changement de mtime du répertoire"""
+    parts = []
+    for directory in directories:
+        try:
+            parts.append(format(directory.stat().st_mtime_ns, "x"))
+        except OSError:
+            parts.append("0")
+    return ".".join(parts)
+
+
+def make_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible (RFC 9110): seul l'identifiant opaque compte"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def check_not_modified(request: Request, response: Response, etag: str):
+    """304 (levée avant la route) si le client a déjà cette version, sinon ETag posé sur la réponse"""
+    # no-cache: le navigateur garde la réponse mais revalide à chaque rafraîchissement
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional(*resources: str):
+    """Dépendance de route: ETag faible des versions des ressources lues par la route"""
+    unknown = set(resources) - set(VERSIONED.values())
+    if unknown:
+        raise ValueError(f"Ressources non versionnées: {sorted(unknown)}")
+
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+        versions = current_versions(db, resources)
+        check_not_modified(request, response, make_etag(*(versions[r] for r in resources)))
+
+    return Depends(dependency)
+
+
+def conditional_files(*directories: Path):
+    """Dépendance de route pour des données lues dans des répertoires (pas de base)"""
+    directories = tuple(Path(d) for d in directories)
+
+    def dependency(request: Request, response: Response):
+        check_not_modified(request, response, make_etag("f", files_version(directories)))
+
+    return Depends(dependency)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_versions(session, flush_context):
+    resources = session.info.setdefault(_PENDING, set())
+    for objects in (session.new, session.deleted):
+        resources.update(VERSIONED[type(obj)] for obj in objects if type(obj) in VERSIONED)
+    for obj in session.dirty:
+        if type(obj) in VERSIONED and session.is_modified(obj, include_collections=False):
+            resources.add(VERSIONED[type(obj)])
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session):
+    resources = session.info.pop(_PENDING, None)
+    if resources:
+        bump(session.get_bind(), resources)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_versions(session):
+    session.info.pop(_PENDING, None)
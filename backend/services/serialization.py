@@ -0,0 +1,97 @@
+# backend/services/serialization.py
+
+"""
+Sérialisation JSON des réponses en une seule passe.
+Une route qui renvoie un dict passe par jsonable_encoder (parcours complet,
+conversion des UUID/dates/Decimal) puis par json.dumps. Ici:
+- row_serializer: ligne ORM -> dict, attributs lus par un attrgetter compilé une
+  fois, seules les colonnes qui l'exigent sont converties (Decimal -> float);
+  UUID et dates restent natifs;
+- FastJSONResponse: orjson encode directement UUID, datetime et date (même
+  format ISO que isoformat()); repli sur json si orjson est absent.
+Renvoyer la réponse (json_response) évite jsonable_encoder et la validation
+du response_model, gardé pour la documentation OpenAPI.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    """Types hors JSON natif (orjson: seulement Decimal; json: tous)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Réponse déjà sérialisée. FastAPI ne fusionne pas les en-têtes posés par les
+    dépendances (ETag...) dans une Response renvoyée telle quelle: `response`
+    est la sous-réponse injectée dans la route, ses en-têtes sont recopiés.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def as_float(value) -> float:
+    """Montant NULL -> 0.0 (forme historique des listes)"""
+    return float(value or 0)
+
+
+def as_optional_float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def row_serializer(*fields: str, **converters: Callable[[Any], Any]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Sérialiseur précompilé: obj -> {champ: valeur}. `converters` associe un champ
+    à sa conversion; les autres valeurs sont reprises telles quelles.
+    """
+    unknown = set(converters) - set(fields)
+    if unknown:
+        raise ValueError(f"Conversions sans champ: {sorted(unknown)}")
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        single = getter
+        getter = lambda obj: (single(obj),)
+    conversions = [(i, converters[name]) for i, name in enumerate(fields) if name in converters]
+
+    if not conversions:
+        def serialize(obj) -> Dict[str, Any]:
+            return dict(zip(fields, getter(obj)))
+        return serialize
+
+    def serialize(obj) -> Dict[str, Any]:
+        values = list(getter(obj))
+        for i, convert in conversions:
+            values[i] = convert(values[i])
+        return dict(zip(fields, values))
+    return serialize
@@ -0,0 +1,204 @@
+# backend/services/session_store.py
+
+"""
+Stockage des conversations actives (état de phase + ConversationManager).
+Deux implémentations derrière la même interface:
+- MemorySessionStore: dict en mémoire, TTL + LRU (un seul worker)
+- SQLiteSessionStore: fichier SQLite partagé par plusieurs workers uvicorn
+Les sessions inactives au-delà du TTL sont récupérées automatiquement.
+Côté WebSocket, passer par les variantes async (aget/aput/adelete): les
+accès fichier tournent dans un thread, pas sur la boucle d'événements.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+
+
+class SessionStore(ABC):
+    """Interface commune: les valeurs sont des dicts sérialisables en JSON"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, data: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Supprime les sessions expirées, retourne leur nombre"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+    async def aget(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def aput(self, session_id: str, data: Dict[str, Any]):
+        await asyncio.to_thread(self.put, session_id, data)
+
+    async def adelete(self, session_id: str):
+        await asyncio.to_thread(self.delete, session_id)
+
+    async def astats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.stats)
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions en mémoire du process, évincées par TTL puis par ancienneté d'écriture"""
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS, max_entries: int = SESSION_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (expire_at, json)
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[session_id]
+                return None
+            raw = entry[1]
+        # Copie indépendante: même contrat que le stockage SQLite
+        return json.loads(raw)
+
+    def put(self, session_id: str, data: Dict[str, Any]):
+        raw = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            self._entries[session_id] = (time.time() + self.ttl_seconds, raw)
+            self._entries.move_to_end(session_id)
+            self._evict()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (expire_at, _) in self._entries.items() if expire_at <= now]
+            for sid in expired:
+                del self._entries[sid]
+        return len(expired)
+
+    def _evict(self):
+        # Les plus anciennes en tête: TTL dépassé ou capacité atteinte
+        now = time.time()
+        while self._entries:
+            session_id, (expire_at, _) = next(iter(self._entries.items()))
+            if expire_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[session_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "sessions": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+    # Sans I/O: pas de passage par un thread
+    async def aget(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self.get(session_id)
+
+    async def aput(self, session_id: str, data: Dict[str, Any]):
+        self.put(session_id, data)
+
+    async def adelete(self, session_id: str):
+        self.delete(session_id)
+
+    async def astats(self) -> Dict[str, Any]:
+        return self.stats()
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions dans une table SQLite (mode WAL), visibles de tous les workers de l'hôte"""
+
+    PURGE_EVERY = 100  # Écritures entre deux purges des sessions expirées
+
+    def __init__(self, path: str, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expire_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_expire_at ON sessions (expire_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Une connexion par thread (sqlite3 n'aime pas le partage entre threads)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT data FROM sessions WHERE session_id = ? AND expire_at > ?",
+            (session_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_id: str, data: Dict[str, Any]):
+        raw = json.dumps(data, ensure_ascii=False)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sessions (session_id, data, expire_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, expire_at = excluded.expire_at",
+                (session_id, raw, time.time() + self.ttl_seconds)
+            )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def delete(self, session_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self) -> int:
+        with self._connect() as conn:
+            count = conn.execute("DELETE FROM sessions WHERE expire_at <= ?", (time.time(),)).rowcount
+        if count:
+            logger.info(f"🧹 Sessions expirées supprimées: {count}")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        count = self._connect().execute(
+            "SELECT COUNT(*) FROM sessions WHERE expire_at > ?", (time.time(),)
+        ).fetchone()[0]
+        return {"backend": "sqlite", "sessions": count, "ttl_seconds": self.ttl_seconds}
+
+
+def create_session_store() -> SessionStore:
+    """Implémentation choisie par SESSION_STORE=memory|sqlite"""
+    backend = os.getenv("SESSION_STORE", "memory").lower()
+    if backend == "sqlite":
+        path = os.getenv("SESSION_STORE_PATH", "./sessions.db")
+        logger.info(f"💾 Sessions conversation: SQLite ({path})")
+        return SQLiteSessionStore(path)
+    return MemorySessionStore()
@@ -0,0 +1,176 @@
+# backend/services/suivi_cache.py
+
+"""
+Cache des réponses de suivi de dossier (GET /sinistres/{id}/suivi), par sinistre.
+Les valeurs sont le JSON déjà sérialisé: un hit ne coûte qu'une lecture de dict.
+Invalidation après commit de toute écriture ORM sur le sinistre ou ses lignes
+liées (remboursements, actions, escalades), sur les contrats du client ou sur
+le conseiller affecté. Une lecture commencée avant une invalidation ne peut pas
+réinsérer sa valeur (jeton de séquence). TTL en filet de sécurité: le cache et
+les invalidations sont propres au process.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.models import SinistreDB, RemboursementDB, ActionRecommandeeDB, EscaladeDB, ContratDB, ConseillerDB
+
+SUIVI_CACHE_TTL_SECONDS = float(os.getenv("SUIVI_CACHE_TTL_SECONDS", "60"))
+SUIVI_CACHE_MAX_ENTRIES = int(os.getenv("SUIVI_CACHE_MAX_ENTRIES", "10000"))
+
+
+class SuiviCache:
+    """LRU + TTL, index inverses client -> sinistres et conseiller -> sinistres"""
+
+    def __init__(self, ttl_seconds: float = SUIVI_CACHE_TTL_SECONDS, max_entries: int = SUIVI_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()  # sinistre_id -> (expire_at, value, client, conseillers)
+        self._by_client: Dict[Any, Set] = {}
+        self._by_conseiller: Dict[Any, Set] = {}
+        self._invalidated: "OrderedDict[Any, int]" = OrderedDict()  # sinistre_id -> séquence d'invalidation
+        self._invalidated_floor = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def begin(self) -> int:
+        """Jeton à prendre avant de lire la base, à repasser à put()"""
+        return self._seq
+
+    def get(self, sinistre_id) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(sinistre_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(sinistre_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(sinistre_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, sinistre_id, value: bytes, token: int, client_id=None, conseiller_ids: Iterable = ()) -> bool:
+        with self._lock:
+            if self._invalidated.get(sinistre_id, self._invalidated_floor) > token:
+                return False  # Invalidé pendant la lecture: valeur possiblement périmée
+            if sinistre_id in self._entries:
+                self._remove(sinistre_id)
+            conseiller_ids = tuple(c for c in conseiller_ids if c is not None)
+            self._entries[sinistre_id] = (time.monotonic() + self.ttl_seconds, value, client_id, conseiller_ids)
+            if client_id is not None:
+                self._by_client.setdefault(client_id, set()).add(sinistre_id)
+            for conseiller_id in conseiller_ids:
+                self._by_conseiller.setdefault(conseiller_id, set()).add(sinistre_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def invalidate(self, sinistre_ids: Iterable = (), client_ids: Iterable = (), conseiller_ids: Iterable = ()):
+        with self._lock:
+            keys = set(sinistre_ids)
+            for client_id in client_ids:
+                keys |= self._by_client.get(client_id, set())
+            for conseiller_id in conseiller_ids:
+                keys |= self._by_conseiller.get(conseiller_id, set())
+            if not keys:
+                return
+            self._seq += 1
+            for key in keys:
+                self._remove(key)
+                self._invalidated[key] = self._seq
+                self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_entries:
+                _, seq = self._invalidated.popitem(last=False)
+                self._invalidated_floor = max(self._invalidated_floor, seq)
+
+    def clear(self):
+        with self._lock:
+            self._seq += 1
+            self._invalidated_floor = self._seq
+            self._invalidated.clear()
+            self._entries.clear()
+            self._by_client.clear()
+            self._by_conseiller.clear()
+
+    def _remove(self, sinistre_id):
+        entry = self._entries.pop(sinistre_id, None)
+        if entry is None:
+            return
+        for index, ids in ((self._by_client, (entry[2],)), (self._by_conseiller, entry[3])):
+            for owner in ids:
+                keys = index.get(owner)
+                if keys is not None:
+                    keys.discard(sinistre_id)
+                    if not keys:
+                        del index[owner]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+
+suivi_cache = SuiviCache()
+
+
+# Colonne qui désigne la ressource invalidée, par modèle
+_DEPENDENCIES = {
+    SinistreDB: ("sinistre", "id"),
+    RemboursementDB: ("sinistre", "sinistre_id"),
+    ActionRecommandeeDB: ("sinistre", "sinistre_id"),
+    EscaladeDB: ("sinistre", "sinistre_id"),
+    ContratDB: ("client", "client_id"),
+    ConseillerDB: ("conseiller", "id"),
+}
+_PENDING = "suivi_cache_invalidations"
+
+
+@event.listens_for(Session, "before_flush")
+def _load_dependency_keys(session, flush_context, instances):
+    for obj in list(session.deleted) + list(session.dirty):
+        dependency = _DEPENDENCIES.get(type(obj))
+        if dependency and dependency[1] in inspect(obj).unloaded:
+            getattr(obj, dependency[1])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    pending = session.info.setdefault(_PENDING, {"sinistre": set(), "client": set(), "conseiller": set()})
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        dependency = _DEPENDENCIES.get(type(obj))
+        if not dependency:
+            continue
+        kind, attr = dependency
+        state = inspect(obj)
+        history = state.attrs[attr].history
+        for value in (state.dict.get(attr), *history.deleted):
+            if value is not None:
+                pending[kind].add(value)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        suivi_cache.invalidate(pending["sinistre"], pending["client"], pending["conseiller"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING, None)
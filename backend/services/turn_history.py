@@ -0,0 +1,222 @@
+# backend/services/turn_history.py
+
+"""
+Historique des tours de conversation en écriture différée (write-behind).
+Le WebSocket dépose chaque tour en mémoire sans attendre la base; un flush
+insère les tours en un seul INSERT multi-lignes dès que TURN_HISTORY_BATCH_SIZE
+tours sont en attente, au plus tard après TURN_HISTORY_FLUSH_MS, et en fin de session.
+Les tours antérieurs à la création du sinistre sont rattachés ensuite par session_id.
+Si un lot est refusé pour une ligne invalide, les tours sont réinsérés un par un:
+seules les lignes fautives sont écartées (journalisées). Seule une panne de la
+base (connexion, verrou) remet tout le lot en attente; toute autre erreur, même
+hors SQL, passe par la reprise tour par tour.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from sqlalchemy import insert, update
+
+from backend.database import is_transient_error
+from backend.models import HistoriqueConversationDB
+
+logger = logging.getLogger(__name__)
+
+TURN_HISTORY_BATCH_SIZE = int(os.getenv("TURN_HISTORY_BATCH_SIZE", "50"))
+TURN_HISTORY_FLUSH_MS = int(os.getenv("TURN_HISTORY_FLUSH_MS", "500"))
+TURN_HISTORY_MAX_PENDING = int(os.getenv("TURN_HISTORY_MAX_PENDING", "10000"))
+
+
+def _json_safe(value):
+    """Copie figée du contexte (Decimal, dates... convertis en texte)"""
+    if value is None:
+        return None
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+class TurnHistoryBuffer:
+    """Tampon des tours en attente d'insertion dans historique_conversation"""
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: int = TURN_HISTORY_BATCH_SIZE,
+        flush_ms: int = TURN_HISTORY_FLUSH_MS,
+        max_pending: int = TURN_HISTORY_MAX_PENDING
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.max_pending = max_pending
+        self._rows: deque = deque(maxlen=max_pending)
+        self._bindings: Dict[str, Any] = {}  # session_id -> sinistre_id à reporter
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self._timer: Optional[asyncio.Task] = None
+        self._loop = None
+        self._flushes = set()
+        self.flushed = 0
+        self.batches = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def record(
+        self,
+        session_id: str,
+        phase: str,
+        message_user: Optional[str] = None,
+        stt_confidence: Optional[float] = None,
+        audio_url_user: Optional[str] = None,
+        message_bot: Optional[str] = None,
+        audio_url_bot: Optional[str] = None,
+        contexte: Optional[dict] = None,
+        sinistre_id=None,
+        date_message: Optional[datetime] = None
+    ):
+        """Dépose un tour (aucune I/O); le flush est déclenché en tâche de fond"""
+        if len(self._rows) >= self.max_pending:
+            # Base indisponible depuis longtemps: le deque borné évince le plus ancien
+            self.dropped += 1
+        self._rows.append({
+            "id": uuid.uuid4(),
+            "session_id": session_id,
+            "sinistre_id": sinistre_id,
+            "phase_conversation": phase or "INCONNUE",
+            "message_user": message_user,
+            "stt_confidence": stt_confidence,
+            "audio_url_user": audio_url_user,
+            "message_bot": message_bot,
+            "audio_url_bot": audio_url_bot,
+            "contexte_json": _json_safe(contexte),
+            "date_message": date_message or datetime.utcnow()
+        })
+        self._ensure_timer()
+        if len(self._rows) >= self.batch_size:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    def bind_sinistre(self, session_id: str, sinistre_id):
+        """Rattache au sinistre les tours déjà enregistrés de la session (au prochain flush)"""
+        self._bindings[session_id] = sinistre_id
+
+    async def flush(self) -> int:
+        """Insère tous les tours en attente (INSERT multi-lignes par lot)"""
+        async with self._lock():
+            rows = list(self._rows)
+            self._rows.clear()
+            bindings, self._bindings = self._bindings, {}
+            if not rows and not bindings:
+                return 0
+            try:
+                await self._write(rows, bindings)
+            except Exception as e:
+                if is_transient_error(e):
+                    logger.error(f"❌ Historique conversation non écrit ({len(rows)} tours): {e}")
+                    self._requeue(rows, bindings)
+                    return 0
+                logger.warning(f"⚠️ Lot d'historique refusé, reprise tour par tour: {e}")
+                return await self._write_each(rows, bindings)
+            self.flushed += len(rows)
+            return len(rows)
+
+    async def _write_each(self, rows: List[Dict[str, Any]], bindings: Dict[str, Any]) -> int:
+        """Un tour par transaction: les lignes refusées sont écartées, pas le lot"""
+        written = 0
+        for i, row in enumerate(rows):
+            try:
+                await self._write([row], {})
+            except Exception as e:
+                if is_transient_error(e):
+                    logger.error(f"❌ Historique conversation non écrit ({len(rows) - i} tours): {e}")
+                    self._requeue(rows[i:], bindings)
+                    self.flushed += written
+                    return written
+                self.rejected += 1
+                logger.error(f"❌ Tour d'historique écarté (session {row['session_id']}, phase {row['phase_conversation']}): {e}")
+                continue
+            written += 1
+        self.flushed += written
+        if bindings:
+            try:
+                await self._write([], bindings)
+            except Exception as e:
+                logger.error(f"❌ Rattachement des tours au sinistre non écrit: {e}")
+                if is_transient_error(e):
+                    self._requeue([], bindings)
+        return written
+
+    def _requeue(self, rows: List[Dict[str, Any]], bindings: Dict[str, Any]):
+        """Remis en tête pour le prochain flush, dans la limite du tampon"""
+        pending = list(self._rows)
+        self._rows.clear()
+        self._rows.extend(rows + pending)
+        for session_id, sinistre_id in bindings.items():
+            self._bindings.setdefault(session_id, sinistre_id)
+
+    async def _write(self, rows: List[Dict[str, Any]], bindings: Dict[str, Any]):
+        table = HistoriqueConversationDB.__table__
+        async with self._session() as db:
+            for start in range(0, len(rows), self.batch_size):
+                await db.execute(insert(table).values(rows[start:start + self.batch_size]))
+                self.batches += 1
+            for session_id, sinistre_id in bindings.items():
+                await db.execute(
+                    update(table)
+                    .where(table.c.session_id == session_id, table.c.sinistre_id.is_(None))
+                    .values(sinistre_id=sinistre_id)
+                )
+            await db.commit()
+
+    def _session(self):
+        if self._session_factory is None:
+            from backend.database_async import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory()
+
+    def _lock(self) -> asyncio.Lock:
+        """Un verrou par boucle, jamais remplacé pendant qu'un flush le détient"""
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._lock_loop is not loop:
+            self._flush_lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._flush_lock
+
+    def _ensure_timer(self):
+        """Flush périodique, démarré au premier tour sur la boucle courante"""
+        loop = asyncio.get_running_loop()
+        if self._timer is not None and not self._timer.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._timer = loop.create_task(self._run_timer())
+
+    async def _run_timer(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._rows or self._bindings:
+                await self.flush()
+
+    async def stop(self):
+        """Arrêt du serveur: plus de timer, dernier flush"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._rows),
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,68 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+# Base SQLite isolée + chemins d'import identiques à run_backend.py
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+_TEST_DIR = tempfile.mkdtemp(prefix="insurance_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DIR}/test.db"
+
+
+@pytest.fixture
+def db_engine():
+    """Schéma complet recréé pour chaque test"""
+    from backend.models import Base
+    from database import engine
+
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db_session(db_engine):
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def seeded_db(db_session):
+    from backend.seeds.seed_data import seed_clients, seed_conseillers
+
+    seed_clients(db_session)
+    seed_conseillers(db_session)
+    return db_session
+
+
+@pytest.fixture
+def count_queries():
+    """with count_queries(engine) as statements: requêtes SQL émises dans le bloc (écouteur retiré à la sortie)"""
+    @contextmanager
+    def _count(engine):
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", on_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+
+    return _count
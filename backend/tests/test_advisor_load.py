@@ -0,0 +1,108 @@
+# backend/tests/test_advisor_load.py
+
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, ConseillerDB, SinistreDB
+from backend.routers import operations
+from backend.services import advisor_load
+from backend.services.advisor_load import AdvisorLoadIndex, assign_advisor
+
+
+@pytest.fixture
+def index(monkeypatch):
+    fresh = AdvisorLoadIndex(refresh_seconds=3600)
+    monkeypatch.setattr(advisor_load, "advisor_index", fresh)
+    return fresh
+
+
+def _advisor(db, email, specialites, actifs=0, capacite=5, statut="disponible"):
+    conseiller = ConseillerDB(
+        nom="Test", prenom=email, email=email, specialites=specialites,
+        nombre_dossiers_actifs=actifs, capacite_max=capacite, statut=statut
+    )
+    db.add(conseiller)
+    db.commit()
+    return conseiller
+
+
+def test_least_loaded_specialist_first():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index = AdvisorLoadIndex()
+    index.rebuild([
+        (a, "disponible", 1, 5, "collision,vol"),
+        (b, "disponible", 3, 5, "collision"),
+        (c, "disponible", 0, 5, "incendie"),
+    ])
+
+    # a (4 places) puis a; à égalité (2 places chacun), b attend depuis plus longtemps
+    assert [index.acquire("collision") for _ in range(4)] == [a, a, b, a]
+    # Aucun spécialiste: le conseiller le moins chargé tous domaines confondus
+    assert index.acquire("blessure") == c
+
+
+def test_full_or_unavailable_advisors_are_skipped():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    index = AdvisorLoadIndex()
+    index.rebuild([(a, "disponible", 1, 2, "vol"), (b, "absent", 0, 5, "vol")])
+
+    assert index.acquire("vol") == a
+    assert index.acquire("vol") is None
+    index.release(a)
+    assert index.acquire("vol") == a
+
+
+def test_database_capacity_guard(db_session, index):
+    full = _advisor(db_session, "full@test.ma", "collision", actifs=1, capacite=1)
+    free = _advisor(db_session, "free@test.ma", "incendie", actifs=0, capacite=2)
+    index.ensure_loaded(db_session)
+    # Un autre worker a rempli `free` depuis le chargement de l'index
+    db_session.query(ConseillerDB).filter(ConseillerDB.id == free.id).update({"nombre_dossiers_actifs": 2})
+    db_session.commit()
+
+    assert assign_advisor(db_session, "collision") is None
+    db_session.refresh(full)
+    assert full.nombre_dossiers_actifs == 1
+
+
+def test_index_follows_commit_not_rollback(db_session, index):
+    advisor = _advisor(db_session, "rr@test.ma", "vol", actifs=0, capacite=3)
+    index.ensure_loaded(db_session)
+
+    assert assign_advisor(db_session, "vol") == advisor.id
+    assert index.remaining(advisor.id) == 3  # Pas encore validé
+    db_session.rollback()
+    assert index.remaining(advisor.id) == 3
+
+    assert assign_advisor(db_session, "vol") == advisor.id
+    db_session.commit()
+    assert index.remaining(advisor.id) == 2
+
+
+def test_escalade_routes_track_advisor_load(seeded_db, index):
+    client = seeded_db.query(ClientDB).first()
+    sinistre = SinistreDB(
+        client_id=client.id, numero_sinistre="SINS-TEST-1", type_sinistre="vol",
+        date_sinistre=date(2026, 1, 15), description="test"
+    )
+    seeded_db.add(sinistre)
+    seeded_db.commit()
+
+    app = FastAPI()
+    app.include_router(operations.router)
+    api = TestClient(app)
+
+    assert api.post("/api/v1/escalades", json={"sinistre_id": "pas-un-uuid"}).status_code == 400
+    created = api.post("/api/v1/escalades", json={"sinistre_id": str(sinistre.id)}).json()
+    specialist = seeded_db.query(ConseillerDB).filter(ConseillerDB.specialites.contains("vol")).first()
+    assert created["conseiller_id"] == str(specialist.id)
+    seeded_db.refresh(specialist)
+    assert specialist.nombre_dossiers_actifs == 1
+
+    api.put(f"/api/v1/escalades/{created['id']}", json={"status": "completee"})
+    seeded_db.refresh(specialist)
+    assert specialist.nombre_dossiers_actifs == 0
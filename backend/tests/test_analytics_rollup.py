@@ -0,0 +1,85 @@
+# backend/tests/test_analytics_rollup.py
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from backend.models import ClientDB, SinistreDB, EscaladeDB, RemboursementDB, AnalyticsDeltaDB
+from backend.services.analytics_rollup import read_overview, rebuild, compact
+
+
+def _sinistre(db, client, cci, type_sinistre="collision"):
+    sinistre = SinistreDB(
+        client_id=client.id, numero_sinistre=f"SINS-TEST-{uuid.uuid4().hex[:6]}",
+        type_sinistre=type_sinistre, date_sinistre=date(2026, 1, 15), description="Choc. Pare-chocs abîmé.",
+        cci_score=cci
+    )
+    db.add(sinistre)
+    db.flush()
+    return sinistre
+
+
+def test_incremental_rollup_matches_full_rebuild(seeded_db):
+    db = seeded_db
+    clients = db.query(ClientDB).all()
+    s1 = _sinistre(db, clients[0], 15)
+    s2 = _sinistre(db, clients[1], 75, "vol")
+    s3 = _sinistre(db, clients[2], 92)
+    _sinistre(db, clients[3], None, "incendie")
+    db.add(EscaladeDB(sinistre_id=s2.id, raison_escalade="CCI > 60", cci_score_trigger=75))
+    db.add(EscaladeDB(sinistre_id=s3.id, raison_escalade="CCI > 60", cci_score_trigger=92))
+    db.add(RemboursementDB(sinistre_id=s1.id, montant_reclame=Decimal("1200.50")))
+    db.commit()
+
+    # Mises à jour sur objets expirés par le commit, puis suppression en cascade
+    s1.status_dossier = "fermé"
+    s1.cci_score = 35
+    s1.remboursements[0].montant_accepte = Decimal("900")
+    s1.remboursements[0].status = "accepte"
+    s3.escalades[0].status = "completee"
+    db.commit()
+    db.delete(s3)
+    db.commit()
+
+    incremental = read_overview(db)
+    assert incremental["kpis"]["sinistres_total"] == 3
+    assert incremental["kpis"]["escalades_total"] == 1
+    # Sinistre sans score: défaut de colonne 0, en base comme dans les agrégats
+    assert incremental["kpis"]["cci_min"] == 0 and incremental["kpis"]["cci_max"] == 75
+    assert incremental["kpis"]["cci_avg"] == round((35 + 75 + 0) / 3, 2)
+    assert {"name": "fermé", "value": 1} in incremental["sinistres_by_status"]
+    assert incremental["remboursements_sum"] == {"reclame": 1200.5, "accepte": 900.0, "net": 0.0}
+    assert incremental["cognitive_cards"][0]["client"]
+
+    db.commit()  # Libérer la transaction de lecture avant la reconstruction
+    with db.get_bind().begin() as conn:
+        rebuild(conn)
+    rebuilt = read_overview(db)
+    assert incremental == rebuilt
+
+
+def test_rolled_back_writes_leave_rollup_untouched(seeded_db):
+    before = read_overview(seeded_db)["kpis"]
+    _sinistre(seeded_db, seeded_db.query(ClientDB).first(), 50)
+    seeded_db.rollback()
+    assert read_overview(seeded_db)["kpis"] == before
+
+
+def test_writes_append_deltas_and_compaction_folds_them(seeded_db, count_queries):
+    db = seeded_db
+    before = read_overview(db)["kpis"]
+    db.commit()
+    with count_queries(db.get_bind()) as statements:
+        _sinistre(db, db.query(ClientDB).first(), 50)
+        db.commit()
+    # Aucune ligne partagée d'analytics_rollup écrite dans la transaction métier
+    assert not [s for s in statements if "analytics_rollup " in s or s.rstrip().endswith("analytics_rollup")]
+    assert db.query(AnalyticsDeltaDB).count() > 0
+
+    pending = read_overview(db)
+    assert pending["kpis"]["sinistres_total"] == before["sinistres_total"] + 1
+    db.commit()
+    with db.get_bind().begin() as conn:
+        assert compact(conn) > 0
+    assert db.query(AnalyticsDeltaDB).count() == 0
+    assert read_overview(db) == pending
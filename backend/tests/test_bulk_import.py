@@ -0,0 +1,103 @@
+# backend/tests/test_bulk_import.py
+
+import json
+
+from sqlalchemy import text
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, ContratDB
+from backend.routers import imports
+from backend.services.analytics_rollup import read_overview
+from backend.services.bulk_import import import_lines, RecordReader
+from backend.services.resource_versions import current_versions
+
+
+def _api():
+    app = FastAPI()
+    app.include_router(imports.router)
+    return TestClient(app)
+
+
+def _client(i, **overrides):
+    row = {"matricule": f"IM-{i:04d}-26", "nom": "Import", "prenom": f"Client{i}", "email": f"import{i}@example.com", "telephone": "0600000000"}
+    return {**row, **overrides}
+
+
+def test_import_clients_ndjson_reports_row_errors(seeded_db):
+    before = seeded_db.query(ClientDB).count()
+    versions = current_versions(seeded_db, ["clients"])
+    lines = [json.dumps(_client(i)) for i in range(50)]
+    lines[3] = json.dumps(_client(3, email="pas-un-email"))
+    lines[7] = json.dumps(_client(7, matricule="im 0001 26"))  # Doublon du fichier (forme normalisée)
+    lines[9] = json.dumps(_client(9, matricule="AB452122"))  # Déjà en base
+    lines[12] = "{tronqué"
+    body = "\n".join(lines[:25]) + "\n\n" + "\n".join(lines[25:])
+
+    report = _api().post("/api/v1/import/clients", content=body.encode(), headers={"Content-Type": "application/x-ndjson"}).json()
+
+    assert (report["total"], report["inserted"], report["failed"]) == (50, 46, 4)
+    assert [e["line"] for e in report["errors"]] == [4, 8, 10, 13]
+    assert "email" in report["errors"][0]["error"]
+    assert seeded_db.query(ClientDB).count() == before + 46
+    assert read_overview(seeded_db)["kpis"]["clients_total"] == before + 46
+    assert current_versions(seeded_db, ["clients"])["clients"] > versions["clients"]
+    imported = seeded_db.query(ClientDB).filter(ClientDB.matricule == "IM-0000-26").one()
+    assert imported.matricule_normalized == "IM000026" and imported.pays == "Maroc"
+
+
+def test_import_contrats_csv_by_matricule(seeded_db):
+    client = seeded_db.query(ClientDB).filter(ClientDB.matricule == "AB-4521-22").one()
+    csv_lines = [
+        "numero_contrat;matricule;client_id;type_assurance;date_debut;garantie_vol;franchise_vol",
+        "CTR-IMP-001;ab-4521-22;;auto;2026-01-01;true;750",
+        f"CTR-IMP-002;;{client.id};auto;2026-02-01;;",
+        "CTR-IMP-001;AB-4521-22;;auto;2026-01-01;false;",  # Numéro en double
+        "CTR-IMP-003;ZZ-0000-00;;auto;2026-01-01;false;",  # Client inconnu
+        "CTR-IMP-004;AB-4521-22;;auto;pas-une-date;false;",
+    ]
+    report = import_lines("contrats", "csv", csv_lines, chunk_size=2)
+
+    assert (report["total"], report["inserted"], report["failed"]) == (5, 2, 3)
+    assert [e["line"] for e in report["errors"]] == [4, 5, 6]
+    contrat = seeded_db.query(ContratDB).filter(ContratDB.numero_contrat == "CTR-IMP-001").one()
+    assert contrat.client_id == client.id and contrat.garantie_vol and float(contrat.franchise_vol) == 750
+    assert contrat.statut == "actif"
+
+
+def test_record_reader_csv_header_and_width():
+    reader = RecordReader("csv")
+    records = reader.read(["nom,prenom", "Alami,Sara", "Bennani"])
+    assert records == [(2, {"nom": "Alami", "prenom": "Sara"}), (3, "1 colonnes au lieu de 2")]
+
+
+def test_import_isolates_rows_refused_by_database(seeded_db):
+    # Refus côté base que la validation ne voit pas (ex. valeur trop longue pour sa colonne)
+    seeded_db.execute(text(
+        "CREATE TRIGGER refus_import BEFORE INSERT ON clients WHEN NEW.nom = 'Refus' "
+        "BEGIN SELECT RAISE(ABORT, 'nom refusé'); END"
+    ))
+    seeded_db.commit()
+    lines = [json.dumps(_client(i, nom="Refus" if i in (2, 5) else "Import")) for i in range(8)]
+
+    report = import_lines("clients", "ndjson", lines, chunk_size=8)
+
+    assert (report["total"], report["inserted"], report["failed"]) == (8, 6, 2)
+    assert [e["line"] for e in report["errors"]] == [3, 6]
+    assert "nom refusé" in report["errors"][0]["error"]
+
+
+def test_csv_quoted_field_spans_lines_and_chunks(seeded_db):
+    csv_lines = [
+        "matricule,nom,prenom,email,telephone,adresse",
+        'ML-0001-26,Multi,Ligne,ml1@example.com,0600000000,"12 rue des Fleurs',
+        'Appartement 3"',
+        "ML-0002-26,Multi,Ligne,pas-un-email,0600000000,",
+    ]
+    report = import_lines("clients", "csv", csv_lines, chunk_size=2)
+
+    assert (report["total"], report["inserted"], report["failed"]) == (2, 1, 1)
+    assert [e["line"] for e in report["errors"]] == [4]
+    client = seeded_db.query(ClientDB).filter(ClientDB.matricule == "ML-0001-26").one()
+    assert client.adresse == "12 rue des Fleurs\nAppartement 3"
@@ -0,0 +1,78 @@
+# backend/tests/test_change_events.py
+
+import asyncio
+import json
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend.models import ClientDB, SinistreDB
+from backend.routers.events import change_stream
+from backend.services.event_bus import event_bus
+
+
+def _request():
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/events", "headers": [], "query_string": b""}, receive)
+
+
+def test_committed_writes_published_rolled_back_ignored(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+
+    async def scenario():
+        with event_bus.subscribe(["sinistres", "clients"]) as subscription:
+            sinistre = SinistreDB(
+                client_id=client.id, numero_sinistre=f"SINS-TEST-{uuid.uuid4().hex[:6]}",
+                type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test"
+            )
+            seeded_db.add(sinistre)
+            seeded_db.flush()
+            sinistre.cci_score = 40  # Modifié avant commit: reste "created"
+            seeded_db.commit()
+            sinistre_id = sinistre.id
+
+            client.telephone = "0611111111"
+            seeded_db.flush()
+            seeded_db.rollback()
+
+            seeded_db.delete(sinistre)
+            seeded_db.commit()
+
+            events = [await asyncio.wait_for(subscription.get(), 1) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            assert subscription.queue.empty()
+            return sinistre_id, events
+
+    sinistre_id, events = asyncio.run(scenario())
+    assert [(e["resource"], e["action"]) for e in events] == [("sinistres", "created"), ("sinistres", "deleted")]
+    assert all(e["ids"] == [str(sinistre_id)] for e in events)
+
+
+def test_sse_stream_ready_then_typed_events():
+    async def scenario():
+        response = await change_stream(_request(), "sinistres,emotions")
+        chunks = response.body_iterator
+        ready = await chunks.__anext__()
+        assert "event: ready" in ready and ready.startswith("retry: ")
+
+        event = event_bus.publish("emotions", {"type": "change", "resource": "emotions", "action": "created", "ids": []})
+        chunk = await asyncio.wait_for(chunks.__anext__(), 1)
+        await chunks.aclose()
+        return event, chunk
+
+    event, chunk = asyncio.run(scenario())
+    lines = chunk.strip().split("\n")
+    assert lines[0] == f"id: {event['seq']}"
+    assert lines[1] == "event: emotions"
+    assert json.loads(lines[2][len("data: "):])["action"] == "created"
+    assert event_bus.stats()["subscribers"] == 0
+
+
+def test_unknown_topic_rejected():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(change_stream(_request(), "sinistres,inconnu"))
+    assert error.value.status_code == 400
@@ -0,0 +1,62 @@
+# backend/tests/test_claim_numbers.py
+
+import asyncio
+import re
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, SinistreDB
+from backend.routers import clients
+from backend.services.claim_numbers import ClaimNumberAllocator, format_claim_number
+
+
+def test_workers_never_share_a_block(db_engine):
+    # Deux allocateurs sur la même base = deux workers uvicorn
+    first = ClaimNumberAllocator(db_engine, block_size=5)
+    second = ClaimNumberAllocator(db_engine, block_size=5)
+
+    values = [first.next_value() for _ in range(7)] + [second.next_value() for _ in range(7)]
+    assert len(set(values)) == len(values)
+    assert first.blocks_reserved == 2 and second.blocks_reserved == 2
+
+
+def test_concurrent_allocation_is_unique(db_engine):
+    allocator = ClaimNumberAllocator(db_engine, block_size=10)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        numbers = list(pool.map(lambda _: allocator.next_number(), range(200)))
+
+    assert len(set(numbers)) == 200
+    assert allocator.blocks_reserved == 20
+    assert all(re.fullmatch(r"SINS-\d{8}-\d{8}", n) for n in numbers)
+
+
+def test_async_allocation_reserves_off_loop(db_engine):
+    allocator = ClaimNumberAllocator(db_engine, block_size=3)
+
+    async def allocate():
+        return [await allocator.next_number_async() for _ in range(4)]
+
+    numbers = asyncio.run(allocate())
+    assert len(set(numbers)) == 4
+    assert allocator.blocks_reserved == 2
+
+
+def test_format_claim_number():
+    assert format_claim_number(42, datetime(2026, 1, 15)) == "SINS-20260115-00000042"
+
+
+def test_create_sinistre_for_unknown_client_is_rejected(seeded_db):
+    app = FastAPI()
+    app.include_router(clients.router)
+    api = TestClient(app)
+    params = {"type_sinistre": "collision", "date_sinistre": "2026-01-15", "lieu_sinistre": "Rabat", "description": "choc"}
+
+    assert api.post("/api/v1/sinistres", params={**params, "client_id": str(uuid4())}).status_code == 404
+    client = seeded_db.query(ClientDB).first()
+    created = api.post("/api/v1/sinistres", params={**params, "client_id": str(client.id)})
+    assert created.status_code == 200
+    assert seeded_db.query(SinistreDB).count() == 1
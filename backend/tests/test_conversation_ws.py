@@ -0,0 +1,84 @@
+# backend/tests/test_conversation_ws.py
+
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import conversation
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(conversation.router)
+    return app
+
+
+def test_text_sent_before_deferred_audio(monkeypatch):
+    def slow_tts(text):
+        time.sleep(0.3)
+        return "http://localhost:8000/audio/test.mp3"
+
+    monkeypatch.setattr(conversation, "generate_audio_url", slow_tts)
+    monkeypatch.setattr(conversation.prompt_catalogue, "lookup", lambda text: None)
+
+    with TestClient(_app()).websocket_connect("/ws/conversation/test-session") as ws:
+        started = time.perf_counter()
+        greeting = ws.receive_json()
+        elapsed = time.perf_counter() - started
+
+        assert greeting["phase"] == "AUTHENTIFICATION"
+        assert greeting["audio_pending"] is True
+        assert greeting["audio_url"] is None
+        assert elapsed < 0.3
+
+        audio = ws.receive_json()
+        assert audio["type"] == "audio_ready"
+        assert audio["message_id"] == greeting["message_id"]
+        assert audio["audio_url"].endswith("test.mp3")
+
+
+def test_catalogued_prompt_served_without_synthesis(monkeypatch):
+    def no_tts(text):
+        raise AssertionError("synthèse inattendue")
+
+    monkeypatch.setattr(conversation, "generate_audio_url", no_tts)
+    monkeypatch.setattr(conversation.prompt_catalogue, "lookup", lambda text: "tts_greeting.mp3")
+
+    with TestClient(_app()).websocket_connect("/ws/conversation/test-catalogue") as ws:
+        greeting = ws.receive_json()
+
+        assert greeting["audio_url"].endswith("/audio/tts_greeting.mp3")
+        assert "audio_pending" not in greeting
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.path = None
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield chunk
+        self.path = "/tmp/tts_streamed.mp3"
+
+
+def test_audio_streamed_as_binary_frames(monkeypatch):
+    chunks = [b"ID3-part-1", b"part-2", b"part-3"]
+    monkeypatch.setattr(conversation.prompt_catalogue, "lookup", lambda text: None)
+    monkeypatch.setattr(conversation.tts_engine, "synthesize_stream", lambda text, tone: _FakeStream(chunks))
+
+    with TestClient(_app()).websocket_connect("/ws/conversation/test-stream?audio_stream=1") as ws:
+        greeting = ws.receive_json()
+        assert greeting["audio_pending"] is True
+
+        start = ws.receive_json()
+        assert start["type"] == "audio_stream_start"
+        assert start["message_id"] == greeting["message_id"]
+
+        received = [ws.receive_bytes() for _ in chunks]
+        assert received == chunks
+
+        end = ws.receive_json()
+        assert end["type"] == "audio_stream_end"
+        assert end["audio_url"].endswith("/audio/tts_streamed.mp3")
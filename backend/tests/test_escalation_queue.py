@@ -0,0 +1,90 @@
+# backend/tests/test_escalation_queue.py
+
+import asyncio
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, SinistreDB, EscaladeDB
+from backend.routers import advisor, operations
+from backend.services.event_bus import EventBus
+from backend.services.escalation_queue import queue_statement, queue_item, load_queue_item
+
+
+def _escalade(db, client, cci, minutes_ago, status="en_attente"):
+    sinistre = SinistreDB(
+        client_id=client.id, numero_sinistre=f"SINS-TEST-{uuid.uuid4().hex[:6]}",
+        type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test", cci_score=cci
+    )
+    db.add(sinistre)
+    db.flush()
+    escalade = EscaladeDB(
+        sinistre_id=sinistre.id, raison_escalade="CCI > 60", cci_score_trigger=cci, status=status,
+        date_escalade=datetime.utcnow() - timedelta(minutes=minutes_ago)
+    )
+    db.add(escalade)
+    db.commit()
+    return escalade
+
+
+def test_queue_ordered_by_cci_then_wait(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+    medium = _escalade(seeded_db, client, 70, minutes_ago=5)
+    urgent = _escalade(seeded_db, client, 90, minutes_ago=1)
+    oldest = _escalade(seeded_db, client, 70, minutes_ago=30)
+    done = _escalade(seeded_db, client, 99, minutes_ago=60, status="completee")
+
+    items = [queue_item(*row) for row in seeded_db.execute(queue_statement()).all()]
+    assert [i["escalade_id"] for i in items] == [str(urgent.id), str(oldest.id), str(medium.id)]
+    assert items[0]["client"]["matricule"] == client.matricule
+    assert load_queue_item(seeded_db, done.id) is None
+
+
+def test_bus_delivers_across_threads_and_requests_resync():
+    bus = EventBus(queue_size=2)
+
+    async def scenario():
+        with bus.subscribe(["escalades.queue"]) as subscription:
+            publisher = threading.Thread(target=bus.publish, args=("escalades.queue", {"type": "upsert"}))
+            publisher.start()
+            publisher.join()
+            bus.publish("autre.sujet", {"type": "upsert"})
+            event = await asyncio.wait_for(subscription.get(), 1)
+            assert event["type"] == "upsert" and event["seq"] == 1
+
+            for _ in range(5):
+                bus.publish("escalades.queue", {"type": "upsert"})
+            await asyncio.sleep(0)
+            assert (await subscription.get())["type"] == "resync"
+            assert subscription.queue.empty()
+        assert bus.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_stream_pushes_deltas(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+    sinistre_id = _escalade(seeded_db, client, 80, minutes_ago=1, status="completee").sinistre_id
+
+    app = FastAPI()
+    app.include_router(advisor.router)
+    app.include_router(advisor.ws_router)
+    app.include_router(operations.router)
+    api = TestClient(app)
+
+    with api.websocket_connect("/ws/escalades/queue") as ws:
+        assert ws.receive_json()["type"] == "snapshot"
+
+        created = api.post("/api/v1/escalades", json={"sinistre_id": str(sinistre_id), "cci_score_trigger": 80}).json()
+        delta = ws.receive_json()
+        assert delta["type"] == "upsert" and delta["event"] == "created"
+        assert delta["item"]["escalade_id"] == created["id"]
+        assert delta["item"]["client"]["nom"] == client.nom
+
+        api.put(f"/api/v1/escalades/{created['id']}", json={"status": "completee"})
+        delta = ws.receive_json()
+        assert (delta["type"], delta["event"], delta["escalade_id"]) == ("remove", "completed", created["id"])
+        assert "item" not in delta
@@ -0,0 +1,78 @@
+# backend/tests/test_exports.py
+
+import csv
+import io
+import json
+from decimal import Decimal
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, SinistreDB, RemboursementDB
+from backend.routers import exports
+from backend.services.exports import stream_export
+
+
+def _api():
+    app = FastAPI()
+    app.include_router(exports.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def claims(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+    rows = [
+        ("collision", "nouveau", date(2026, 1, 10)),
+        ("vol", "nouveau", date(2026, 2, 10)),
+        ("collision", "fermé", date(2026, 3, 10)),
+        ("incendie", "en_cours", date(2026, 4, 10)),
+        ("collision", "nouveau", date(2026, 5, 10)),
+    ]
+    for i, (type_sinistre, status, day) in enumerate(rows):
+        sinistre = SinistreDB(
+            client_id=client.id, numero_sinistre=f"SINS-EXP-{i:03d}", type_sinistre=type_sinistre,
+            status_dossier=status, date_sinistre=day, description="export"
+        )
+        seeded_db.add(sinistre)
+        seeded_db.flush()
+        seeded_db.add(RemboursementDB(sinistre_id=sinistre.id, montant_reclame=1000 + i, status="en_attente"))
+    seeded_db.commit()
+    return client
+
+
+def test_ndjson_export_with_filters(claims):
+    response = _api().get("/api/v1/export/sinistres", params={
+        "date_from": "2026-01-10", "date_to": "2026-03-10", "type": ["collision", "vol"], "status": ["nouveau"]
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["numero_sinistre"] for r in rows) == ["SINS-EXP-000", "SINS-EXP-001"]
+    assert all(r["client_matricule"] == claims.matricule for r in rows)
+    assert {r["date_sinistre"] for r in rows} == {"2026-01-10", "2026-02-10"}
+
+
+def test_csv_export_streams_in_batches(claims):
+    chunks = list(stream_export("remboursements", "csv", batch_size=2, types=["collision"]))
+    assert len(chunks) == 2  # En-tête + 2 lignes, puis la dernière ligne
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert sorted(r["numero_sinistre"] for r in rows) == ["SINS-EXP-000", "SINS-EXP-002", "SINS-EXP-004"]
+    assert {float(r["montant_reclame"]) for r in rows} == {1000, 1002, 1004}
+
+
+def test_parquet_export_round_trip(claims):
+    pq = pytest.importorskip("pyarrow.parquet")
+    chunks = list(stream_export("sinistres", "parquet", batch_size=2))
+    table = pq.read_table(io.BytesIO(b"".join(chunks)))
+    assert table.num_rows == 5 and table.num_columns == len(SinistreDB.__table__.c) + 1
+    assert sorted(table.column("numero_sinistre").to_pylist()) == [f"SINS-EXP-{i:03d}" for i in range(5)]
+    # Numeric(3,1) avec défaut 100: la valeur dépasse la précision déclarée
+    assert set(table.column("responsabilite_assuree").to_pylist()) == {Decimal("100.0")}
+
+
+def test_invalid_format_rejected():
+    response = _api().get("/api/v1/export/sinistres", params={"format": "xlsx"})
+    assert response.status_code == 400
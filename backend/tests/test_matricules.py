@@ -0,0 +1,142 @@
+# backend/tests/test_matricules.py
+
+from sqlalchemy import create_engine, inspect, text
+
+from backend.migrations import run_migrations
+from backend.models import ClientDB
+from backend.services.matricules import find_client_by_matricule
+
+
+def test_normalized_column_follows_matricule(seeded_db):
+    client = seeded_db.query(ClientDB).filter(ClientDB.matricule == "AB-4521-22").one()
+    assert client.matricule_normalized == "AB452122"
+
+    client.matricule = "ab 9999 01"
+    seeded_db.commit()
+    assert client.matricule_normalized == "AB999901"
+
+
+def test_any_format_resolves_in_one_query(seeded_db, db_engine, count_queries):
+    with count_queries(db_engine) as statements:
+        for variant in ("AB-4521-22", "AB452122", "ab 4521 22"):
+            client = find_client_by_matricule(seeded_db, variant)
+            assert client is not None and client.matricule == "AB-4521-22"
+
+    assert len(statements) == 3
+    assert find_client_by_matricule(seeded_db, "ZZ-0000-00") is None
+
+
+def test_migration_adds_column_and_backfills(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE clients (id CHAR(32) PRIMARY KEY, matricule VARCHAR(20) NOT NULL UNIQUE, "
+            "nom VARCHAR(100) NOT NULL, prenom VARCHAR(100) NOT NULL, email VARCHAR(120) NOT NULL, "
+            "telephone VARCHAR(20) NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO clients VALUES ('0123456789abcdef0123456789abcdef', 'FC-7834-19', 'Dupont', 'Marie', 'm@x.ma', '0600')"
+        ))
+
+    result = run_migrations(engine)
+
+    assert "clients.matricule_normalized" in result["columns"]
+    assert "ix_clients_matricule_normalized" in result["indexes"]
+    with engine.connect() as conn:
+        value = conn.execute(text("SELECT matricule_normalized FROM clients")).scalar()
+    assert value == "FC783419"
+
+    # Idempotent
+    assert run_migrations(engine) == {"columns": [], "indexes": [], "collisions": {}}
+
+
+def test_migration_reports_normalized_collisions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE clients (id CHAR(32) PRIMARY KEY, matricule VARCHAR(20) NOT NULL UNIQUE, "
+            "matricule_normalized VARCHAR(20), nom VARCHAR(100) NOT NULL, prenom VARCHAR(100) NOT NULL, "
+            "email VARCHAR(120) NOT NULL, telephone VARCHAR(20) NOT NULL)"
+        ))
+        conn.execute(text("CREATE INDEX ix_clients_matricule_normalized ON clients (matricule_normalized)"))
+        conn.execute(text(
+            "INSERT INTO clients (id, matricule, nom, prenom, email, telephone) VALUES "
+            "('0123456789abcdef0123456789abcdef', 'AB-4521-22', 'Alami', 'Sara', 's@x.ma', '0600'), "
+            "('fedcba9876543210fedcba9876543210', 'AB452122', 'Bennani', 'Omar', 'o@x.ma', '0601')"
+        ))
+
+    result = run_migrations(engine)
+
+    # Index laissé non unique, doublon rapporté
+    assert result["collisions"] == {"ix_clients_matricule_normalized": [{"matricule_normalized": "AB452122", "count": 2}]}
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE clients SET matricule = 'AB-4521-23', matricule_normalized = 'AB452123' WHERE nom = 'Bennani'"))
+    # Doublon corrigé: index reconstruit en unique
+    assert run_migrations(engine)["indexes"] == ["ix_clients_matricule_normalized"]
+    indexes = {ix["name"]: ix for ix in inspect(engine).get_indexes("clients")}
+    assert indexes["ix_clients_matricule_normalized"]["unique"]
+
+
+def test_update_rejects_normalized_duplicate(seeded_db):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.routers import clients
+
+    app = FastAPI()
+    app.include_router(clients.router)
+    client = seeded_db.query(ClientDB).filter(ClientDB.matricule == "JK-1234-20").one()
+    payload = {"matricule": "ab 4521 22", "nom": "Test", "prenom": "Test", "email": "t@example.com", "telephone": "0600000000"}
+
+    response = TestClient(app).put(f"/api/v1/clients/{client.id}", json=payload)
+
+    assert response.status_code == 409
+
+
+def test_index_finds_near_matricules():
+    from backend.services.matricules import MatriculeIndex
+
+    index = MatriculeIndex()
+    index.rebuild([(None, m) for m in ("AB-4521-22", "FC-7834-19", "JK-1234-20", "AB-4521-99")])
+
+    # Un chiffre mal entendu
+    assert index.search("AB-4521-23")[0] == (1, "AB-4521-22")
+    # Lettres inversées
+    assert index.search("BA452122")[0] == (2, "AB-4521-22")
+    assert index.search("XY-0000-00") == []
+
+
+def test_index_tracks_client_writes(seeded_db):
+    from backend.services.matricules import matricule_index
+
+    matricule_index.ensure_loaded(seeded_db)
+    client = seeded_db.query(ClientDB).filter(ClientDB.matricule == "JK-1234-20").one()
+    client.matricule = "JK-1234-77"
+    seeded_db.commit()
+
+    assert matricule_index.search("JK-1234-78")[0] == (1, "JK-1234-77")
+    assert all(m != "JK-1234-20" for _, m in matricule_index.search("JK-1234-20"))
+
+    seeded_db.delete(client)
+    seeded_db.commit()
+    assert matricule_index.search("JK-1234-77") == []
+
+
+def test_index_search_is_fast_on_large_portfolio():
+    import random
+    import time
+
+    from backend.services.matricules import MatriculeIndex
+
+    rng = random.Random(7)
+    letters = "ABCDEFGHJKLMNPRSTVWXYZ"
+    rows = {
+        f"{rng.choice(letters)}{rng.choice(letters)}-{rng.randint(0, 9999):04d}-{rng.randint(0, 99):02d}"
+        for _ in range(20000)
+    }
+    index = MatriculeIndex()
+    index.rebuild([(None, m) for m in rows])
+
+    started = time.perf_counter()
+    for _ in range(50):
+        index.search("AB-4521-23", max_distance=1)
+    assert (time.perf_counter() - started) / 50 < 0.005
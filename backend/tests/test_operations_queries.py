@@ -0,0 +1,58 @@
+# backend/tests/test_operations_queries.py
+
+from datetime import date, datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.database import engine
+from backend.models import ClientDB, ConseillerDB, SinistreDB, RemboursementDB, EscaladeDB
+from backend.routers import operations
+
+LIST_ENDPOINTS = ["/api/v1/sinistres", "/api/v1/contrats", "/api/v1/remboursements", "/api/v1/escalades"]
+
+
+def _add_claims(db, count: int, offset: int):
+    clients = db.query(ClientDB).all()
+    conseiller = db.query(ConseillerDB).first()
+    for i in range(offset, offset + count):
+        sinistre = SinistreDB(
+            client_id=clients[i % len(clients)].id, numero_sinistre=f"SINS-Q-{i}",
+            type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test"
+        )
+        db.add(sinistre)
+        db.flush()
+        db.add(RemboursementDB(sinistre_id=sinistre.id, montant_reclame=100, status="en_attente"))
+        db.add(EscaladeDB(
+            sinistre_id=sinistre.id, conseiller_id=conseiller.id, raison_escalade="CCI > 60",
+            status="en_attente", date_escalade=datetime.utcnow()
+        ))
+    db.commit()
+
+
+@pytest.fixture
+def api():
+    app = FastAPI()
+    app.include_router(operations.router)
+    return TestClient(app)
+
+
+def test_list_endpoints_use_constant_query_count(seeded_db, api, count_queries):
+    _add_claims(seeded_db, 3, 0)
+    small = {}
+    for path in LIST_ENDPOINTS:
+        with count_queries(engine) as statements:
+            assert len(api.get(path).json()) >= 3
+        small[path] = len(statements)
+
+    _add_claims(seeded_db, 12, 3)
+    for path in LIST_ENDPOINTS:
+        with count_queries(engine) as statements:
+            api.get(path)
+        assert len(statements) == small[path], f"{path}: requêtes proportionnelles au nombre de lignes"
+        assert len(statements) <= 2, f"{path}: {statements}"
+
+    escalade = api.get("/api/v1/escalades").json()[0]
+    assert escalade["sinistre"]["client"]["matricule"]
+    assert escalade["conseiller"]["email"]
+    assert api.get("/api/v1/remboursements").json()[0]["sinistre"]["client"] is not None
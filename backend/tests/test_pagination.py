@@ -0,0 +1,61 @@
+# backend/tests/test_pagination.py
+
+import uuid
+from datetime import date, datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, SinistreDB
+from backend.routers import clients, operations
+from backend.services.pagination import encode_cursor, decode_cursor
+
+
+def _api():
+    app = FastAPI()
+    app.include_router(clients.router)
+    app.include_router(operations.router)
+    return TestClient(app)
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(datetime(2026, 3, 1, 12, 30, 5, 120), row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor)[1] == row_id
+
+
+def test_keyset_pages_cover_all_rows_once(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+    # Même seconde de création (défaut CURRENT_TIMESTAMP): l'id départage
+    for i in range(25):
+        seeded_db.add(SinistreDB(
+            client_id=client.id, numero_sinistre=f"SINS-PAGE-{i:03d}",
+            type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test"
+        ))
+    seeded_db.commit()
+    api = _api()
+
+    seen, cursor, pages = [], "", 0
+    while cursor is not None:
+        page = api.get("/api/v1/sinistres", params={"cursor": cursor, "limit": 10}).json()
+        seen += [s["id"] for s in page["items"]]
+        cursor, pages = page["next_cursor"], pages + 1
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 25
+
+    # Mode offset inchangé (liste), même ordre
+    legacy = api.get("/api/v1/sinistres", params={"skip": 10, "limit": 10}).json()
+    assert [s["id"] for s in legacy] == seen[10:20]
+
+
+def test_clients_cursor_and_invalid_cursor(seeded_db):
+    api = _api()
+    total = seeded_db.query(ClientDB).count()
+    first = api.get("/api/v1/clients", params={"cursor": "", "limit": 2}).json()
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    rest = api.get("/api/v1/clients", params={"cursor": first["next_cursor"], "limit": 100}).json()
+    assert len(rest["items"]) == total - 2 and rest["next_cursor"] is None
+
+    assert isinstance(api.get("/api/v1/clients").json(), list)
+    assert api.get("/api/v1/contrats", params={"cursor": "pas-un-curseur"}).status_code == 400
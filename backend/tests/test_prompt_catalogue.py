@@ -0,0 +1,56 @@
+# backend/tests/test_prompt_catalogue.py
+
+from modules.prompt_catalogue import PromptCatalogue
+from modules.tts_module import TTSEngine
+
+
+def _engine(tmp_path, monkeypatch, calls):
+    engine = TTSEngine(language="fr", voice="george", output_dir=str(tmp_path), use_cache=True)
+    engine.engine = "gtts"
+
+    def fake_gtts(text, output_path):
+        calls.append(text)
+        with open(output_path, "wb") as f:
+            f.write(b"ID3" + text.encode("utf-8"))
+        return output_path
+
+    monkeypatch.setattr(engine, "_synthesize_gtts", fake_gtts)
+    return engine
+
+
+def test_prerender_then_lookup(tmp_path, monkeypatch):
+    calls = []
+    catalogue = PromptCatalogue(_engine(tmp_path, monkeypatch, calls))
+    prompts = PromptCatalogue.fixed_prompts()
+
+    stats = catalogue.prerender()
+
+    assert stats["rendered"] == len(prompts)
+    greeting = prompts["greeting"]
+    assert catalogue.lookup(greeting)
+    assert catalogue.lookup("Texte dynamique inconnu") is None
+
+
+def test_second_prerender_reuses_manifest(tmp_path, monkeypatch):
+    calls = []
+    engine = _engine(tmp_path, monkeypatch, calls)
+    PromptCatalogue(engine).prerender()
+    rendered = len(calls)
+
+    reloaded = PromptCatalogue(engine)
+    assert reloaded.lookup(PromptCatalogue.fixed_prompts()["ask_description"])
+    stats = reloaded.prerender()
+
+    assert stats["rendered"] == 0
+    assert len(calls) == rendered
+
+
+def test_voice_change_invalidates_renders(tmp_path, monkeypatch):
+    calls = []
+    engine = _engine(tmp_path, monkeypatch, calls)
+    PromptCatalogue(engine).prerender()
+
+    engine.voice_name = "sarah"
+    catalogue = PromptCatalogue(engine)
+
+    assert catalogue.lookup(PromptCatalogue.fixed_prompts()["greeting"]) is None
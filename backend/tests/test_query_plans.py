@@ -0,0 +1,61 @@
+# backend/tests/test_query_plans.py
+
+from sqlalchemy import inspect
+
+from backend.migrations import run_migrations
+from backend.query_plans import ROUTES, build_api, check_routes, route_params, seed_plan_data, _sqlite_scans
+
+
+def test_sqlite_scan_detection():
+    statement = "SELECT clients_1.id FROM sinistres LEFT OUTER JOIN clients AS clients_1 ON clients_1.id = sinistres.client_id"
+    plan = [
+        "SCAN sinistres USING INDEX ix_sinistres_date_creation_id",
+        "SEARCH clients_1 USING INDEX sqlite_autoindex_clients_1 (id=?)",
+        "SCAN clients_1",
+        "SCAN anon_1",
+        "SCAN conseillers",
+    ]
+    assert _sqlite_scans(plan, statement) == ["clients"]
+
+
+def test_composite_indexes_created_by_migration(db_engine):
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_escalades_status_date_escalade")
+    assert "ix_escalades_status_date_escalade" in run_migrations(db_engine)["indexes"]
+    names = {ix["name"] for ix in inspect(db_engine).get_indexes("escalades")}
+    assert "ix_escalades_status_date_escalade" in names
+
+
+def test_invalid_index_is_rebuilt(db_engine, monkeypatch):
+    from backend import migrations
+
+    class _Reflection:
+        """Réflexion PostgreSQL d'un CREATE INDEX CONCURRENTLY interrompu"""
+
+        def __init__(self, engine):
+            self._inspector = inspect(engine)
+
+        def __getattr__(self, name):
+            return getattr(self._inspector, name)
+
+        def get_indexes(self, name):
+            indexes = self._inspector.get_indexes(name)
+            for ix in indexes:
+                if ix["name"] == "ix_escalades_status_date_escalade":
+                    ix["dialect_options"] = {"postgresql_invalid": True}
+            return indexes
+
+    rebuilt = []
+    monkeypatch.setattr(migrations, "inspect", _Reflection)
+    monkeypatch.setattr(migrations, "_create_index", lambda engine, index: rebuilt.append(index.name) or True)
+
+    assert run_migrations(db_engine)["indexes"] == ["ix_escalades_status_date_escalade"]
+    assert rebuilt == ["ix_escalades_status_date_escalade"]
+
+
+def test_router_queries_use_indexes(db_session):
+    seed_plan_data(db_session)
+    api = build_api()
+    results = check_routes(api, ROUTES, route_params(db_session, api))
+    assert any("escalades" in r["statement"] and "status" in r["statement"] for r in results)
+    assert [(r["route"], r["scans"], r["plan"]) for r in results if r["scans"]] == []
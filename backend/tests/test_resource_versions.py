@@ -0,0 +1,80 @@
+# backend/tests/test_resource_versions.py
+
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.database import engine
+from backend.models import ClientDB, SinistreDB
+from backend.routers import operations
+from backend.services.resource_versions import current_versions, etag_matches, files_version
+
+
+def _api():
+    app = FastAPI()
+    app.include_router(operations.router)
+    return TestClient(app)
+
+
+def test_versions_follow_committed_writes(seeded_db):
+    before = current_versions(seeded_db, ["sinistres", "clients"])
+    client = seeded_db.query(ClientDB).first()
+
+    sinistre = SinistreDB(
+        client_id=client.id, numero_sinistre="SINS-ETAG-001",
+        type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test"
+    )
+    seeded_db.add(sinistre)
+    seeded_db.commit()
+    assert current_versions(seeded_db, ["sinistres", "clients"]) == {"sinistres": before["sinistres"] + 1, "clients": before["clients"]}
+
+    client.telephone = "0622222222"
+    seeded_db.flush()
+    seeded_db.rollback()
+    assert current_versions(seeded_db, ["clients"])["clients"] == before["clients"]
+
+    sinistre.status_dossier = sinistre.status_dossier  # Aucun changement réel
+    seeded_db.commit()
+    assert current_versions(seeded_db, ["sinistres"])["sinistres"] == before["sinistres"] + 1
+
+
+def test_versions_bumped_after_commit_outside_the_write_transaction(seeded_db, count_queries):
+    before = current_versions(seeded_db, ["clients"])["clients"]
+    with count_queries(seeded_db.get_bind()) as statements:
+        seeded_db.query(ClientDB).first().telephone = "0633333333"
+        seeded_db.flush()
+        assert not any("compteurs" in s for s in statements)  # Aucun verrou tenu jusqu'au commit
+        seeded_db.commit()
+    assert any("compteurs" in s for s in statements)
+    assert current_versions(seeded_db, ["clients"])["clients"] == before + 1
+
+
+def test_list_not_modified_skips_query(seeded_db, count_queries):
+    api = _api()
+    first = api.get("/api/v1/sinistres")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and first.headers["cache-control"] == "no-cache"
+
+    with count_queries(engine) as statements:
+        cached = api.get("/api/v1/sinistres", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert len(statements) == 1 and "compteurs" in statements[0]
+
+    client = seeded_db.query(ClientDB).first()
+    client.nom = "Renommé"
+    seeded_db.commit()
+    fresh = api.get("/api/v1/sinistres", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.headers["etag"] != etag
+
+
+def test_etag_matching_and_files_version(tmp_path):
+    assert etag_matches('"a-1", W/"3-4"', 'W/"3-4"')
+    assert etag_matches("*", 'W/"3-4"')
+    assert not etag_matches(None, 'W/"3-4"')
+    assert not etag_matches('W/"3-5"', 'W/"3-4"')
+
+    before = files_version([tmp_path, tmp_path / "absent"])
+    assert before.endswith(".0")
+    (tmp_path / "analyse.emotion.json").write_text("{}")
+    assert files_version([tmp_path, tmp_path / "absent"]) != before
@@ -0,0 +1,51 @@
+# backend/tests/test_serialization.py
+
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from backend.models import ClientDB, ContratDB
+from backend.routers import clients, operations
+from backend.schemas.schemas import ClientResponse
+from backend.services.serialization import FastJSONResponse, row_serializer, as_float
+
+
+def test_fast_response_matches_default_encoding():
+    content = {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "date": date(2026, 1, 15),
+        "at": datetime(2026, 1, 15, 9, 30, 5, 120),
+        "montant": Decimal("1250.50"),
+        "liste": [None, True, 3]
+    }
+    assert json.loads(FastJSONResponse(content).body) == jsonable_encoder(content)
+
+
+def test_row_serializer_converts_only_declared_fields():
+    contrat = ContratDB(id=uuid.uuid4(), numero_contrat="CTR-1", franchise_vol=None, limite_vol=Decimal("50000.00"))
+    serialize = row_serializer("id", "numero_contrat", "franchise_vol", "limite_vol", franchise_vol=as_float, limite_vol=as_float)
+    assert serialize(contrat) == {"id": contrat.id, "numero_contrat": "CTR-1", "franchise_vol": 0.0, "limite_vol": 50000.0}
+    assert row_serializer("numero_contrat")(contrat) == {"numero_contrat": "CTR-1"}
+
+
+def test_list_payloads_keep_their_shape(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+    seeded_db.add(ContratDB(client_id=client.id, numero_contrat="CTR-SER-001", type_assurance="auto", date_debut=date(2026, 1, 1)))
+    seeded_db.commit()
+    app = FastAPI()
+    app.include_router(clients.router)
+    app.include_router(operations.router)
+    api = TestClient(app)
+
+    listed = api.get("/api/v1/clients").json()
+    expected = [ClientResponse.model_validate(c).model_dump(mode="json") for c in seeded_db.query(ClientDB).all()]
+    assert sorted(listed, key=lambda c: c["id"]) == sorted(expected, key=lambda c: c["id"])
+
+    contrat = next(c for c in api.get("/api/v1/contrats").json() if c["numero_contrat"] == "CTR-SER-001")
+    assert contrat["client_id"] == str(client.id) and contrat["date_debut"] == "2026-01-01"
+    assert contrat["franchise_vol"] == 500.0 and contrat["client"]["matricule"] == client.matricule
@@ -0,0 +1,66 @@
+# backend/tests/test_session_scope.py
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.database import session_scope
+from backend.database_async import async_pool_metrics as pool_metrics, async_engine
+from backend.models import ClientDB
+from backend.routers import conversation
+
+
+def test_scope_commits_and_rolls_back(seeded_db):
+    with session_scope() as db:
+        client = db.query(ClientDB).filter(ClientDB.matricule == "AB-4521-22").one()
+        client.telephone = "0600000000"
+
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            client = db.query(ClientDB).filter(ClientDB.matricule == "AB-4521-22").one()
+            client.telephone = "0700000000"
+            raise RuntimeError("échec du tour")
+
+    with session_scope() as db:
+        client = db.query(ClientDB).filter(ClientDB.matricule == "AB-4521-22").one()
+        assert client.telephone == "0600000000"
+
+
+def test_connection_released_between_turns(seeded_db, monkeypatch):
+    monkeypatch.setattr(conversation, "generate_audio_url", lambda text: None)
+    monkeypatch.setattr(conversation.prompt_catalogue, "lookup", lambda text: None)
+    checkouts = pool_metrics.checkouts
+
+    app = FastAPI()
+    app.include_router(conversation.router)
+    with TestClient(app).websocket_connect("/ws/conversation/scope-test") as ws:
+        ws.receive_json()
+        assert pool_metrics.checked_out == 0
+
+        ws.send_json({"text": "AB 4521 22"})
+        reply = ws.receive_json()
+        while reply.get("type") == "audio_ready":
+            reply = ws.receive_json()
+        assert reply["phase"] == "CONFIRMATION"
+        # Le client parle: aucune connexion retenue
+        assert pool_metrics.checked_out == 0
+        assert pool_metrics.checkouts > checkouts
+
+    snapshot = pool_metrics.snapshot(async_engine.sync_engine)
+    assert snapshot["wait"]["count"] >= 1
+    assert snapshot["hold"]["max_ms"] >= 0
+
+
+def test_async_routes_read_seeded_data(seeded_db):
+    from backend.routers import clients, advisor
+
+    app = FastAPI()
+    app.include_router(clients.router)
+    app.include_router(advisor.router)
+    api = TestClient(app)
+
+    client = api.get("/api/v1/clients/ab452122").json()
+    assert client["matricule"] == "AB-4521-22"
+    assert api.get(f"/api/v1/clients/{client['id']}/sinistres").json() == []
+    assert len(api.get("/api/v1/conseillers").json()) >= 1
+    assert api.get("/api/v1/clients/ZZ-0000-00").status_code == 404
@@ -0,0 +1,91 @@
+# backend/tests/test_session_store.py
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import conversation
+from backend.services.session_store import MemorySessionStore, SQLiteSessionStore
+from modules.conversation_manager_crm import ConversationManager
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore(ttl_seconds=1, max_entries=3)
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=1)
+
+
+def test_roundtrip_and_ttl(store):
+    store.put("s1", {"state": {"phase": "DESCRIPTION"}})
+    assert store.get("s1") == {"state": {"phase": "DESCRIPTION"}}
+
+    time.sleep(1.1)
+    assert store.get("s1") is None
+    store.put("s2", {})
+    time.sleep(1.1)
+    assert store.purge_expired() >= 1
+    assert store.stats()["sessions"] == 0
+
+
+def test_sqlite_async_access_runs_off_the_event_loop(tmp_path, monkeypatch):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    threads = []
+    get, stats = store.get, store.stats
+    monkeypatch.setattr(store, "get", lambda sid: threads.append(threading.current_thread()) or get(sid))
+    monkeypatch.setattr(store, "stats", lambda: threads.append(threading.current_thread()) or stats())
+
+    async def scenario():
+        await store.aput("s1", {"state": {"phase": "DESCRIPTION"}})
+        loaded = await store.aget("s1")
+        await store.adelete("s1")
+        assert (await store.astats())["sessions"] == 0
+        return loaded, await store.aget("s1")
+
+    assert asyncio.run(scenario()) == ({"state": {"phase": "DESCRIPTION"}}, None)
+    assert threads and threading.main_thread() not in threads
+
+
+def test_memory_store_evicts_oldest_beyond_capacity():
+    store = MemorySessionStore(ttl_seconds=60, max_entries=3)
+    for i in range(5):
+        store.put(f"s{i}", {"i": i})
+
+    assert store.get("s0") is None and store.get("s1") is None
+    assert store.get("s4") == {"i": 4}
+
+
+def test_manager_roundtrip():
+    manager = ConversationManager("abc")
+    manager.current_phase = "documents"
+
+    restored = ConversationManager.from_dict(manager.to_dict())
+    assert restored.session_id == "abc"
+    assert restored.current_phase == "documents"
+
+
+def test_reconnect_resumes_saved_session(monkeypatch):
+    monkeypatch.setattr(conversation, "session_store", MemorySessionStore(ttl_seconds=60))
+    monkeypatch.setattr(conversation, "generate_audio_url", lambda text: None)
+    monkeypatch.setattr(conversation.prompt_catalogue, "lookup", lambda text: None)
+    conversation.session_store.put("resume-me", {
+        "state": {
+            "phase": "DESCRIPTION",
+            "client_id": None,
+            "client_data": None,
+            "sinistre_id": None,
+            "contexte": {"questions": [], "question_index": 0, "details_reponses": []}
+        },
+        "manager": ConversationManager("resume-me").to_dict()
+    })
+
+    app = FastAPI()
+    app.include_router(conversation.router)
+    with TestClient(app).websocket_connect("/ws/conversation/resume-me") as ws:
+        message = ws.receive_json()
+        assert message["phase"] == "DESCRIPTION"
+        assert message["action"] == "reprise_conversation"
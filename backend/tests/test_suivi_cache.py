@@ -0,0 +1,82 @@
+# backend/tests/test_suivi_cache.py
+
+import time
+import uuid
+from datetime import date, datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.database_async import async_engine
+from backend.models import ClientDB, ConseillerDB, SinistreDB, RemboursementDB, EscaladeDB, ActionRecommandeeDB
+from backend.routers import clients
+from backend.services.suivi_cache import SuiviCache, suivi_cache
+
+
+def _dossier(db):
+    client = db.query(ClientDB).first()
+    conseiller = db.query(ConseillerDB).first()
+    sinistre = SinistreDB(
+        client_id=client.id, numero_sinistre=f"SINS-TEST-{uuid.uuid4().hex[:6]}",
+        type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test"
+    )
+    db.add(sinistre)
+    db.flush()
+    db.add(RemboursementDB(sinistre_id=sinistre.id, montant_reclame=1500, status="en_attente"))
+    db.add(ActionRecommandeeDB(sinistre_id=sinistre.id, action="Envoyer le constat", status="en_attente"))
+    db.add(EscaladeDB(
+        sinistre_id=sinistre.id, conseiller_id=conseiller.id, raison_escalade="CCI > 60",
+        date_escalade=datetime.utcnow(), date_transfert=datetime.utcnow()
+    ))
+    db.commit()
+    return sinistre, conseiller
+
+
+def test_suivi_single_query_cached_and_invalidated(seeded_db, count_queries):
+    suivi_cache.clear()
+    sinistre, conseiller = _dossier(seeded_db)
+    app = FastAPI()
+    app.include_router(clients.router)
+    api = TestClient(app)
+    url = f"/api/v1/sinistres/{sinistre.id}/suivi"
+
+    with count_queries(async_engine.sync_engine) as statements:
+        first = api.get(url).json()
+        assert len(statements) == 1
+        assert api.get(url).json() == first
+        assert len(statements) == 1  # Servi par le cache
+
+    assert first["remboursement"]["status"] == "en_attente"
+    assert first["timeline_actions"][1]["action"] == f"Assigné à {conseiller.prenom} {conseiller.nom}"
+    assert first["garanties_applicables"]
+
+    # Écriture sur une ligne liée (objet expiré par le commit): entrée invalidée
+    sinistre.remboursements[0].status = "accepté"
+    seeded_db.commit()
+    assert api.get(url).json()["remboursement"]["status"] == "accepté"
+
+    # Conseiller affecté renommé: invalidation via l'index inverse
+    conseiller.prenom = "Nadia"
+    seeded_db.commit()
+    assert "Nadia" in api.get(url).json()["timeline_actions"][1]["action"]
+
+
+def test_stale_read_not_cached_after_invalidation():
+    cache = SuiviCache(ttl_seconds=60, max_entries=10)
+    client_id = uuid.uuid4()
+    token = cache.begin()
+    cache.invalidate(client_ids=[client_id])  # Aucun dossier connu: rien à faire
+    assert cache.put("s1", b"{}", token, client_id=client_id)
+
+    token = cache.begin()
+    cache.invalidate(client_ids=[client_id])  # Écriture concurrente de la lecture
+    assert not cache.put("s1", b"{}", token, client_id=client_id)
+    assert cache.get("s1") is None
+
+
+def test_cache_hit_well_under_a_millisecond():
+    cache = SuiviCache(ttl_seconds=60, max_entries=10)
+    cache.put("s1", b'{"numero_sinistre": "SINS"}', cache.begin())
+    started = time.perf_counter()
+    for _ in range(10_000):
+        cache.get("s1")
+    assert (time.perf_counter() - started) / 10_000 < 0.0001
@@ -0,0 +1,63 @@
+# backend/tests/test_timing.py
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import conversation
+from modules.timing import TimingRegistry, Histogram, span, turn, current_turn, registry
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(10, 100, 1000))
+    for ms in (3, 4, 50, 70, 80, 2000):
+        histogram.observe(ms)
+
+    assert histogram.counts == [2, 3, 0, 1]
+    assert histogram.quantile(0.5) == 100
+    assert histogram.quantile(0.99) == 2000
+    assert histogram.snapshot()["count"] == 6
+
+
+def test_prometheus_rendering_is_cumulative():
+    timings = TimingRegistry()
+    timings.observe("tts.synthesize", 0.02)
+    timings.observe("tts.synthesize", 0.3)
+
+    text = timings.render_prometheus()
+    assert 'pipeline_span_duration_ms_bucket{span="tts.synthesize",le="25"} 1' in text
+    assert 'pipeline_span_duration_ms_bucket{span="tts.synthesize",le="+Inf"} 2' in text
+    assert 'pipeline_span_duration_ms_count{span="tts.synthesize"} 2' in text
+
+
+def test_span_records_even_on_error():
+    with turn() as timings:
+        with pytest.raises(ValueError):
+            with span("test.failing"):
+                raise ValueError()
+
+    assert "test.failing" in timings
+    assert current_turn() is None  # Pas de fuite vers les tests suivants
+    assert registry.snapshot()["test.failing"]["count"] >= 1
+
+
+def test_debug_timings_attached_to_replies(monkeypatch):
+    monkeypatch.setattr(conversation, "generate_audio_url", lambda text: None)
+    monkeypatch.setattr(conversation.prompt_catalogue, "lookup", lambda text: None)
+    app = FastAPI()
+    app.include_router(conversation.router)
+
+    with TestClient(app).websocket_connect("/ws/conversation/timings-session?timings=1") as ws:
+        greeting = ws.receive_json()
+        assert "timings" not in greeting  # Aucun tour client encore
+
+        ws.send_json({"text": "bonjour"})
+        reply = ws.receive_json()
+        while reply.get("type") == "audio_ready":
+            reply = ws.receive_json()
+
+        assert reply["action"] == "redemander_matricule"
+        assert "ws.extract_matricule" in reply["timings"]
+        assert reply["timings"]["ws.turn"] >= 0
+
+    assert registry.snapshot()["ws.turn"]["count"] >= 1
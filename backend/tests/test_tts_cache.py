@@ -0,0 +1,116 @@
+# backend/tests/test_tts_cache.py
+
+import os
+import time
+
+from modules.tts_module import TTSEngine, TTSCache, PROJECT_ROOT, resolve_audio_dir
+
+
+def _engine(tmp_path, monkeypatch, calls):
+    engine = TTSEngine(language="fr", voice="george", output_dir=str(tmp_path), use_cache=True)
+    engine.engine = "gtts"
+
+    def fake_gtts(text, output_path):
+        calls.append(text)
+        with open(output_path, "wb") as f:
+            f.write(b"ID3" + text.encode("utf-8"))
+        return output_path
+
+    monkeypatch.setattr(engine, "_synthesize_gtts", fake_gtts)
+    return engine
+
+
+def test_identical_prompt_served_from_cache(tmp_path, monkeypatch):
+    calls = []
+    engine = _engine(tmp_path, monkeypatch, calls)
+
+    first = engine.synthesize("Bonjour, quel est votre matricule?")
+    second = engine.synthesize("Bonjour, quel est votre matricule?")
+
+    assert first == second
+    assert len(calls) == 1
+    assert engine.cache.hits == 1 and engine.cache.misses == 1
+
+
+def test_cache_key_covers_tone_and_voice(tmp_path, monkeypatch):
+    calls = []
+    engine = _engine(tmp_path, monkeypatch, calls)
+
+    a = engine.synthesize("Merci pour votre appel.", tone="professional")
+    b = engine.synthesize("Merci pour votre appel.", tone="empathetic")
+    c = engine.synthesize("Merci pour votre appel.", voice="sarah")
+
+    assert len({a, b, c}) == 3
+    assert len(calls) == 3
+
+
+def test_uncached_files_do_not_collide(tmp_path, monkeypatch):
+    calls = []
+    engine = _engine(tmp_path, monkeypatch, calls)
+    engine.cache = None
+
+    paths = {engine.synthesize(f"Message {i}") for i in range(5)}
+    assert len(paths) == 5
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=25)
+    for i in range(3):
+        src = tmp_path / f"src_{i}.mp3"
+        src.write_bytes(b"x" * 10)
+        cache.put(f"k{i}", str(src))
+
+    assert cache.get("k0") is None
+    assert cache.get("k2") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = TTSCache(tmp_path, max_age_seconds=60)
+    src = tmp_path / "src.mp3"
+    src.write_bytes(b"audio")
+    path = cache.put("old", str(src))
+
+    past = time.time() - 3600
+    os.utime(path, (past, past))
+    reloaded = TTSCache(tmp_path, max_age_seconds=60)
+
+    assert reloaded.get("old") is None
+    assert not os.path.exists(path)
+
+
+def test_stream_yields_chunks_and_archives(tmp_path, monkeypatch):
+    engine = TTSEngine(language="fr", voice="george", output_dir=str(tmp_path), use_cache=True)
+    engine.engine = "elevenlabs"
+    monkeypatch.setattr(engine, "_elevenlabs_chunks", lambda text: iter([b"ID3", b"abc", b"def"]))
+
+    stream = engine.synthesize_stream("Voici votre numéro de dossier.")
+    assert list(stream) == [b"ID3", b"abc", b"def"]
+
+    with open(stream.path, "rb") as f:
+        assert f.read() == b"ID3abcdef"
+
+    # Le rendu archivé sert ensuite de cache, sans appel fournisseur
+    monkeypatch.setattr(engine, "_elevenlabs_chunks", lambda text: (_ for _ in ()).throw(AssertionError()))
+    assert engine.synthesize("Voici votre numéro de dossier.") == stream.path
+
+
+def test_abandoned_stream_removes_partial_file(tmp_path, monkeypatch):
+    engine = TTSEngine(language="fr", voice="george", output_dir=str(tmp_path), use_cache=True)
+    engine.engine = "elevenlabs"
+    monkeypatch.setattr(engine, "_elevenlabs_chunks", lambda text: iter([b"ID3", b"abc", b"def"]))
+
+    stream = engine.synthesize_stream("Client parti en cours de lecture.")
+    chunks = iter(stream)
+    assert next(chunks) == b"ID3"
+    chunks.close()  # Consommateur parti (GeneratorExit)
+
+    assert stream.path is None
+    assert not list(tmp_path.glob("response_*.mp3"))
+
+
+def test_audio_dir_shared_with_static_route(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUDIO_DIR", str(tmp_path))
+    assert TTSEngine(language="fr", voice="george", use_cache=False).output_dir == resolve_audio_dir() == tmp_path
+    monkeypatch.setenv("AUDIO_DIR", "data/autre_audio")
+    assert resolve_audio_dir() == PROJECT_ROOT / "data" / "autre_audio"
@@ -0,0 +1,156 @@
+# backend/tests/test_turn_history.py
+
+import asyncio
+import os
+import uuid
+from datetime import date
+
+from sqlalchemy import MetaData, inspect, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from backend.database_async import to_async_url
+from backend.migrations import run_migrations
+from backend.models import ClientDB, SinistreDB, HistoriqueConversationDB
+from backend.services.turn_history import TurnHistoryBuffer
+
+
+def _run(scenario):
+    """Moteur async propre à la boucle du test"""
+    async def main():
+        engine = create_async_engine(to_async_url(os.environ["DATABASE_URL"]))
+        try:
+            await scenario(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_turns_flushed_in_batches(db_session):
+    async def scenario(factory):
+        buffer = TurnHistoryBuffer(factory, batch_size=2, flush_ms=60_000)
+        buffer.record("s1", "AUTHENTIFICATION", message_bot="Bonjour")
+        buffer.record("s1", "AUTHENTIFICATION", message_user="AB 4521 22", stt_confidence=0.92,
+                      message_bot="Vous êtes bien Dupont?", contexte={"cci_score": 10})
+        # Flush déclenché par la taille du lot, sans attendre le timer
+        for _ in range(100):
+            if buffer.stats()["flushed"] == 2:
+                break
+            await asyncio.sleep(0.02)
+        assert buffer.stats()["flushed"] == 2
+
+        buffer.record("s1", "CONFIRMATION", message_user="oui")
+        assert len(buffer) == 1
+        await buffer.stop()
+        assert buffer.stats()["pending"] == 0
+
+    _run(scenario)
+
+    rows = db_session.query(HistoriqueConversationDB).order_by(HistoriqueConversationDB.date_message).all()
+    assert [r.phase_conversation for r in rows] == ["AUTHENTIFICATION", "AUTHENTIFICATION", "CONFIRMATION"]
+    assert float(rows[1].stt_confidence) == 0.92
+    assert rows[1].contexte_json == {"cci_score": 10}
+
+
+def test_earlier_turns_attached_to_created_sinistre(seeded_db):
+    client = seeded_db.query(ClientDB).first()
+    sinistre = SinistreDB(
+        client_id=client.id, numero_sinistre=f"SINS-TEST-{uuid.uuid4().hex[:6]}",
+        type_sinistre="collision", date_sinistre=date(2026, 1, 15), description="test"
+    )
+    seeded_db.add(sinistre)
+    seeded_db.commit()
+
+    async def scenario(factory):
+        buffer = TurnHistoryBuffer(factory, batch_size=10, flush_ms=60_000)
+        buffer.record("s2", "DESCRIPTION", message_user="On m'a percuté")
+        await buffer.flush()
+        buffer.record("s2", "DOCUMENTS", message_user="j'ai le constat", sinistre_id=sinistre.id)
+        buffer.bind_sinistre("s2", sinistre.id)
+        await buffer.stop()
+
+    _run(scenario)
+
+    rows = seeded_db.query(HistoriqueConversationDB).filter(HistoriqueConversationDB.session_id == "s2").all()
+    assert len(rows) == 2
+    assert {r.sinistre_id for r in rows} == {sinistre.id}
+
+
+def test_invalid_turn_rejected_without_blocking_the_batch(db_session):
+    async def scenario(factory):
+        buffer = TurnHistoryBuffer(factory, batch_size=10, flush_ms=60_000)
+        for phase in ("AUTHENTIFICATION", "DESCRIPTION", "DOCUMENTS"):
+            buffer.record("s3", phase, message_user=phase.lower())
+        buffer._rows[1]["phase_conversation"] = None  # NOT NULL refusé par la base
+        assert await buffer.flush() == 2
+        stats = buffer.stats()
+        assert (stats["pending"], stats["flushed"], stats["rejected"]) == (0, 2, 1)
+
+    _run(scenario)
+
+    rows = db_session.query(HistoriqueConversationDB).filter(HistoriqueConversationDB.session_id == "s3").all()
+    assert sorted(r.phase_conversation for r in rows) == ["AUTHENTIFICATION", "DOCUMENTS"]
+
+
+def test_non_database_error_isolated_not_requeued(db_session):
+    class Faulty(TurnHistoryBuffer):
+        async def _write(self, rows, bindings):
+            if any(r["message_user"] == "bug" for r in rows):
+                raise TypeError("valeur inattendue")
+            await super()._write(rows, bindings)
+
+    async def scenario(factory):
+        buffer = Faulty(factory, batch_size=10, flush_ms=60_000)
+        for message in ("un", "bug", "deux"):
+            buffer.record("s5", "DESCRIPTION", message_user=message)
+        assert await buffer.flush() == 2
+        assert await buffer.flush() == 0  # Rien remis en attente
+        stats = buffer.stats()
+        assert (stats["pending"], stats["flushed"], stats["rejected"]) == (0, 2, 1)
+        await buffer.stop()
+
+    _run(scenario)
+
+
+def test_unavailable_database_keeps_turns_pending():
+    class Unavailable:
+        async def __aenter__(self):
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    async def scenario():
+        buffer = TurnHistoryBuffer(Unavailable, batch_size=10, flush_ms=60_000, max_pending=2)
+        for i in range(3):
+            buffer.record("s4", "DESCRIPTION", message_user=str(i))
+        assert await buffer.flush() == 0
+        assert [r["message_user"] for r in buffer._rows] == ["1", "2"]
+        assert buffer.stats()["dropped"] == 1 and buffer.stats()["rejected"] == 0
+        await buffer.stop()
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_not_null_relaxed_by_table_rebuild(db_engine):
+    table = HistoriqueConversationDB.__table__
+    scratch = MetaData()
+    for other in table.metadata.sorted_tables:
+        other.to_metadata(scratch)
+    legacy = scratch.tables[table.name]
+    legacy.c.sinistre_id.nullable = False
+    with db_engine.begin() as conn:
+        table.drop(conn)
+        legacy.create(conn)
+        conn.execute(legacy.insert().values(id=uuid.uuid4(), sinistre_id=uuid.uuid4(), session_id="old", phase_conversation="DESCRIPTION"))
+
+    run_migrations(db_engine)
+
+    columns = {c["name"]: c for c in inspect(db_engine).get_columns("historique_conversation")}
+    assert columns["sinistre_id"]["nullable"] is True
+    indexes = {ix["name"] for ix in inspect(db_engine).get_indexes("historique_conversation")}
+    assert {ix.name for ix in table.indexes} <= indexes
+    with db_engine.begin() as conn:
+        conn.execute(table.insert().values(id=uuid.uuid4(), session_id="new", phase_conversation="DESCRIPTION"))
+        assert sorted(conn.execute(select(table.c.session_id)).scalars()) == ["new", "old"]
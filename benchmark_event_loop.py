@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark: latence de la boucle d'événements sous charge concurrente
+Compare l'ancienne forme des routes (ORM bloquant dans un `async def`)
+et les routes migrées sur AsyncSession.
+
+Run from project root (base déjà seedée: python seed_db.py):
+    python benchmark_event_loop.py [--concurrency 50] [--duration 5] [--matricule AB-4521-22]
+Pour des chiffres représentatifs, pointer DATABASE_URL vers PostgreSQL.
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# Setup paths
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+import httpx
+from fastapi import FastAPI
+
+from backend.database import SessionLocal
+from backend.routers import clients
+from backend.services.matricules import find_client_by_matricule
+
+PROBE_INTERVAL = 0.005  # 5 ms
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(clients.router)
+
+    @app.get("/bench/blocking/{matricule}")
+    async def blocking_lookup(matricule: str):
+        """Forme d'origine: requête synchrone exécutée sur la boucle"""
+        db = SessionLocal()
+        try:
+            client = find_client_by_matricule(db, matricule)
+            return {"matricule": client.matricule if client else None}
+        finally:
+            db.close()
+
+    return app
+
+
+async def probe_lag(stop: asyncio.Event, samples: list):
+    """Mesure le retard de réveil d'un sleep(5 ms): c'est le temps où la boucle était bloquée"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(max(0.0, loop.time() - started - PROBE_INTERVAL))
+
+
+async def run_load(app: FastAPI, path: str, concurrency: int, duration: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    lags, latencies = [], []
+    stop = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def worker():
+            while not stop.is_set():
+                started = time.perf_counter()
+                response = await http.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        probe = asyncio.create_task(probe_lag(stop, lags))
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(probe, *workers)
+
+    lags.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_s": round(len(latencies) / duration, 1),
+        "lag_p50_ms": round(statistics.median(lags) * 1000, 2),
+        "lag_p99_ms": round(lags[int(len(lags) * 0.99) - 1] * 1000, 2),
+        "lag_max_ms": round(lags[-1] * 1000, 2),
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event-loop lag benchmark")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--matricule", default="AB-4521-22")
+    args = parser.parse_args()
+
+    app = build_app()
+    print(f"⏱️  {args.concurrency} requêtes concurrentes, {args.duration}s par mode\n")
+
+    for label, path in (
+        ("avant (ORM bloquant)", f"/bench/blocking/{args.matricule}"),
+        ("après (AsyncSession)", f"/api/v1/clients/{args.matricule}"),
+    ):
+        result = await run_load(app, path, args.concurrency, args.duration)
+        print(f"📊 {label}")
+        for key, value in result.items():
+            print(f"   {key:16} {value}")
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
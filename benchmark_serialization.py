@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark: sérialisation d'une liste de 200 lignes (corps de réponse complet)
+Compare le chemin FastAPI par défaut (dict/response_model -> jsonable_encoder ->
+json.dumps) et la couche services/serialization.py (sérialiseurs précompilés +
+FastJSONResponse, orjson si installé). Lignes ORM construites en mémoire, sans base.
+
+Run from project root:
+    python benchmark_serialization.py [--rows 200] [--repeat 200]
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, date, timedelta
+
+# Setup paths
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+parser = argparse.ArgumentParser(description="Default FastAPI JSON path vs precompiled serializers")
+parser.add_argument("--rows", type=int, default=200)
+parser.add_argument("--repeat", type=int, default=200, help="Mesures par scénario")
+args = parser.parse_args()
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='bench_serialization_')}/bench.db"
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.models import ClientDB, SinistreDB, ContratDB
+from backend.routers import clients, operations
+from backend.schemas.schemas import ClientResponse
+from backend.services.serialization import FastJSONResponse, orjson
+
+
+def build_rows(count: int):
+    start = datetime(2026, 1, 1, 9, 30)
+    rows = []
+    for i in range(count):
+        client = ClientDB(
+            id=uuid.uuid4(), matricule=f"BN-{i:04d}-26", nom="Bench", prenom=f"Client{i}",
+            email=f"bench{i}@example.com", telephone="0600000000", statut="actif",
+            date_naissance=date(1980, 1, 1), ville="Casablanca", date_creation=start + timedelta(minutes=i)
+        )
+        sinistre = SinistreDB(
+            id=uuid.uuid4(), client_id=client.id, numero_sinistre=f"SINS-BENCH-{i:05d}", type_sinistre="collision",
+            date_sinistre=date(2026, 1, 15), lieu_sinistre="Rabat", description="Choc arrière au feu rouge " * 3,
+            cci_score=i % 100, status_dossier="en_cours", type_traitement="autonome", tiers_implique=True,
+            tiers_nom="Tiers", tiers_responsable_incertain=False, documents_complets=False,
+            date_creation=start + timedelta(minutes=i), date_modification=start + timedelta(minutes=i, seconds=30)
+        )
+        sinistre.client = client
+        contrat = ContratDB(
+            id=uuid.uuid4(), client_id=client.id, numero_contrat=f"CTR-BENCH-{i:05d}", type_assurance="auto",
+            date_debut=date(2025, 1, 1), statut="actif", garantie_collision=True, garantie_vol=False,
+            garantie_incendie=False, garantie_responsabilite=True, garantie_assistance=True,
+            franchise_collision=Decimal("500.00"), franchise_vol=Decimal("500.00"), franchise_incendie=Decimal("500.00"),
+            limite_responsabilite=Decimal("50000.00"), limite_collision=Decimal("50000.00"), limite_vol=Decimal("50000.00"),
+            date_creation=start, date_modification=start
+        )
+        contrat.client = client
+        rows.append((client, sinistre, contrat))
+    return rows
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    rows = build_rows(args.rows)
+    clients_rows = [c for c, _, _ in rows]
+    sinistres = [s for _, s, _ in rows]
+    contrats = [c for _, _, c in rows]
+
+    scenarios = {
+        "GET /sinistres": (
+            lambda: JSONResponse(jsonable_encoder([operations._sinistre_to_dict(s, s.client) for s in sinistres])).body,
+            lambda: FastJSONResponse([operations._sinistre_to_dict(s, s.client) for s in sinistres]).body,
+        ),
+        "GET /contrats": (
+            lambda: JSONResponse(jsonable_encoder([operations._contrat_to_dict(c, c.client) for c in contrats])).body,
+            lambda: FastJSONResponse([operations._contrat_to_dict(c, c.client) for c in contrats]).body,
+        ),
+        # Avant: validation response_model (from_attributes) puis jsonable_encoder
+        "GET /clients": (
+            lambda: JSONResponse(jsonable_encoder([ClientResponse.model_validate(c) for c in clients_rows])).body,
+            lambda: FastJSONResponse([clients._client_row(c) for c in clients_rows]).body,
+        ),
+    }
+
+    print(f"🧪 {args.rows} lignes, médiane sur {args.repeat} mesures — encodeur: {'orjson' if orjson else 'json (orjson absent)'}\n")
+    print(f"   {'route':<16} {'défaut ms':>10} {'rapide ms':>10} {'gain':>7}")
+    for name, (default_path, fast_path) in scenarios.items():
+        assert len(fast_path()) > 0
+        default_ms = timed(default_path, args.repeat)
+        fast_ms = timed(fast_path, args.repeat)
+        print(f"   {name:<16} {default_ms:>10.2f} {fast_ms:>10.2f} {default_ms / fast_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import { useEffect, useState } from 'react';
+import axios from 'axios';
+
+const API_BASE = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+const WS_BASE = API_BASE.replace(/^http/, 'ws');
+const RECONNECT_MAX_MS = 30000;
+// Les deltas ne viennent que du worker de la socket: rechargement lent de la file
+// entière (réponse 304 si rien n'a changé) pour les escalades des autres workers
+const LIVE_POLL_MS = 60000;
+
+const byPriority = (a, b) =>
+  (b.cci_score || 0) - (a.cci_score || 0) || (a.date_escalade || '').localeCompare(b.date_escalade || '');
+
+// File d'escalades en attente poussée par le serveur (WebSocket /ws/escalades/queue):
+// instantané puis deltas upsert/remove, et GET /api/v1/escalades/queue toutes les
+// LIVE_POLL_MS. Tant que la socket est fermée: polling toutes les fallbackMs, et
+// reconnexion avec délai croissant.
+export default function useEscaladesQueue(fallbackMs) {
+  const [items, setItems] = useState([]);
+  const [live, setLive] = useState(false);
+
+  useEffect(() => {
+    let socket = null;
+    let poll = null;
+    let retry = null;
+    let delay = 1000;
+    let closed = false;
+    const queue = new Map();
+
+    const publish = () => setItems([...queue.values()].sort(byPriority));
+    const replace = (list) => {
+      queue.clear();
+      list.forEach((item) => queue.set(item.escalade_id, item));
+      publish();
+    };
+    const load = async () => {
+      try {
+        const res = await axios.get(`${API_BASE}/api/v1/escalades/queue`);
+        replace(res.data?.items || []);
+      } catch (err) {
+        console.error('Erreur chargement file escalades:', err);
+      }
+    };
+    let pollMs = null;
+    const startPolling = (ms = fallbackMs) => {
+      if (poll && pollMs === ms) return;
+      if (ms === fallbackMs && pollMs !== ms) load();  // Socket perdue: rattraper tout de suite
+      clearInterval(poll);
+      pollMs = ms;
+      poll = setInterval(load, ms);
+    };
+    const stopPolling = () => { clearInterval(poll); poll = null; };
+
+    const connect = () => {
+      if (closed) return;
+      if (typeof window === 'undefined' || !window.WebSocket) {
+        startPolling();
+        return;
+      }
+      socket = new WebSocket(`${WS_BASE}/ws/escalades/queue`);
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'snapshot') {
+          startPolling(Math.max(LIVE_POLL_MS, fallbackMs));
+          setLive(true);
+          delay = 1000;
+          replace(message.items || []);
+        } else if (message.type === 'upsert') {
+          queue.set(message.escalade_id, message.item);
+          publish();
+        } else if (message.type === 'remove') {
+          queue.delete(message.escalade_id);
+          publish();
+        } else if (message.type === 'resync') {
+          // Deltas perdus (abonné trop lent): recharger la file entière
+          load();
+        }
+      };
+      socket.onclose = () => {
+        setLive(false);
+        if (closed) return;
+        startPolling(fallbackMs);
+        retry = setTimeout(connect, delay);
+        delay = Math.min(delay * 2, RECONNECT_MAX_MS);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      stopPolling();
+      if (socket) socket.close();
+    };
+  }, [fallbackMs]);
+
+  return { items, live };
+}
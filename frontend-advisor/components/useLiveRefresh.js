@@ -0,0 +1,55 @@
+import { useEffect, useRef } from 'react';
+
+const API_BASE = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+const DEBOUNCE_MS = 300;
+// Le bus d'événements ne couvre que le worker de la connexion SSE: les écritures
+// traitées par un autre worker n'arrivent que par ce polling lent (réponses 304)
+const LIVE_POLL_MS = 60000;
+
+// Recharge les données quand le serveur publie un changement (SSE /api/v1/events)
+// sur l'un des sujets, et toutes les LIVE_POLL_MS. Tant que le flux est
+// indisponible: polling toutes les fallbackMs.
+export default function useLiveRefresh(refresh, topics, fallbackMs) {
+  const refreshRef = useRef(refresh);
+  refreshRef.current = refresh;
+  const topicsKey = topics.join(',');
+
+  useEffect(() => {
+    let poll = null;
+    let debounce = null;
+    let connectedOnce = false;
+    const run = () => refreshRef.current();
+    let pollMs = null;
+    const startPolling = (ms = fallbackMs) => {
+      if (poll && pollMs === ms) return;
+      clearInterval(poll);
+      pollMs = ms;
+      poll = setInterval(run, ms);
+    };
+    const stopPolling = () => { clearInterval(poll); poll = null; };
+    const schedule = () => { clearTimeout(debounce); debounce = setTimeout(run, DEBOUNCE_MS); };
+
+    run();
+    if (typeof window === 'undefined' || !window.EventSource) {
+      startPolling();
+      return stopPolling;
+    }
+
+    const source = new EventSource(`${API_BASE}/api/v1/events?topics=${topicsKey}`);
+    source.addEventListener('ready', () => {
+      startPolling(Math.max(LIVE_POLL_MS, fallbackMs));
+      // Reconnexion: des changements ont pu être manqués
+      if (connectedOnce) schedule();
+      connectedOnce = true;
+    });
+    [...topics, 'resync'].forEach((topic) => source.addEventListener(topic, schedule));
+    // EventSource se reconnecte seul; polling rapide en attendant
+    source.onerror = () => startPolling();
+
+    return () => {
+      source.close();
+      stopPolling();
+      clearTimeout(debounce);
+    };
+  }, [topicsKey, fallbackMs]);
+}
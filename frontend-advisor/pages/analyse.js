@@ -1,5 +1,6 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import Navigation from '../components/Navigation';
+import useLiveRefresh from '../components/useLiveRefresh';
 import { 
   FiCpu, FiActivity, FiAlertTriangle, FiCheckCircle, 
   FiFileText, FiZap, FiThermometer, FiHeart, FiMessageSquare
@@ -16,12 +17,6 @@ export default function AnalyseCognitive() {
   const [selectedSinistre, setSelectedSinistre] = useState(null);
   const [loading, setLoading] = useState(true);
 
-  useEffect(() => {
-    fetchData();
-    const interval = setInterval(fetchData, 15000);
-    return () => clearInterval(interval);
-  }, []);
-
   const fetchData = async () => {
     try {
       const res = await fetch(`${API_BASE}/api/v1/sinistres`);
@@ -37,6 +32,9 @@ export default function AnalyseCognitive() {
     }
   };
 
+  // Rechargé sur changement de sinistre (push serveur), polling 15s en repli
+  useLiveRefresh(fetchData, ['sinistres'], 15000);
+
   const analyzeText = (text) => {
     if (!text) return { faits: [], suppositions: [], emotions: [], phrases: [] };
     
@@ -1,5 +1,6 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import Navigation from '../components/Navigation';
+import useLiveRefresh from '../components/useLiveRefresh';
 import { BarChart, Bar, LineChart, Line, PieChart, Pie, Cell, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { FiHeart, FiActivity, FiAlertTriangle, FiThermometer, FiZap, FiTrendingUp, FiFrown, FiSmile } from 'react-icons/fi';
 
@@ -80,11 +81,8 @@ export default function EmotionDashboard() {
     }
   };
 
-  useEffect(() => {
-    fetchData();
-    const interval = setInterval(fetchData, 15000); // Refresh toutes les 15s
-    return () => clearInterval(interval);
-  }, []);
+  // Rechargé à chaque nouvelle analyse (push serveur), polling 15s en repli
+  useLiveRefresh(fetchData, ['emotions'], 15000);
 
   if (loading) {
     return (
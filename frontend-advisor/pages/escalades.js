@@ -3,6 +3,7 @@ import { FiAlertCircle, FiPlus, FiSearch, FiEdit2, FiTrash2, FiSave, FiX } from
 import { motion, AnimatePresence } from 'framer-motion';
 import axios from 'axios';
 import Navigation from '../components/Navigation';
+import useEscaladesQueue from '../components/useEscaladesQueue';
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -14,6 +15,7 @@ export default function EscaladesManager() {
   const [searchTerm, setSearchTerm] = useState('');
   const [showForm, setShowForm] = useState(false);
   const [editing, setEditing] = useState(null);
+  const { items: queue, live } = useEscaladesQueue(10000);
   const [formData, setFormData] = useState({
     sinistre_id: '',
     conseiller_id: '',
@@ -198,6 +200,30 @@ export default function EscaladesManager() {
           )}
         </AnimatePresence>
 
+        <div className="bg-white rounded-xl shadow-lg p-6 mb-6">
+          <div className="flex items-center justify-between mb-4">
+            <h2 className="text-xl font-bold text-gray-800">File d'attente ({queue.length})</h2>
+            <span className={`text-xs font-bold px-3 py-1 rounded-full ${live ? 'bg-emerald-100 text-emerald-700' : 'bg-gray-100 text-gray-700'}`}>
+              {live ? 'En direct' : 'Actualisation périodique'}
+            </span>
+          </div>
+          {queue.length === 0 ? (
+            <p className="text-sm text-gray-700">Aucune escalade en attente</p>
+          ) : (
+            <ul className="divide-y">
+              {queue.map(item => (
+                <li key={item.escalade_id} className="py-3 flex items-center justify-between text-sm text-gray-900">
+                  <span className="font-medium">{item.sinistre?.numero} — {item.client?.nom} {item.client?.prenom}</span>
+                  <span className="flex items-center gap-4">
+                    <span>{item.conseiller ? `${item.conseiller.prenom} ${item.conseiller.nom}` : 'Non affectée'}</span>
+                    <span className="font-bold text-rose-600">CCI {item.cci_score ?? '-'}</span>
+                  </span>
+                </li>
+              ))}
+            </ul>
+          )}
+        </div>
+
         {loading ? (
           <div className="text-center py-12">Chargement...</div>
         ) : (
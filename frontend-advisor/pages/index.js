@@ -1,5 +1,6 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import Navigation from '../components/Navigation';
+import useLiveRefresh from '../components/useLiveRefresh';
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
 import { FiActivity, FiUsers, FiAlertCircle, FiFileText, FiTrendingUp, FiHeart, FiAlertTriangle, FiSmile } from 'react-icons/fi';
 import Link from 'next/link';
@@ -38,11 +39,8 @@ export default function DashboardAdvisor() {
     }
   };
 
-  useEffect(() => {
-    fetchAll();
-    const interval = setInterval(fetchAll, 10000);
-    return () => clearInterval(interval);
-  }, []);
+  // Rechargé sur changement (push serveur), polling 10s en repli
+  useLiveRefresh(fetchAll, ['sinistres', 'escalades', 'remboursements', 'clients', 'emotions'], 10000);
 
   if (loading) {
     return (
@@ -5,6 +5,8 @@ import axios from 'axios';
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 const WS_BASE = API_BASE.replace(/^http/i, 'ws');
+const AUDIO_WAIT_MS = 8000; // Délai max d'attente d'un audio différé
+const AUDIO_STREAM = process.env.NEXT_PUBLIC_AUDIO_STREAM === '1'; // Opt-in: audio en trames binaires
 
 export default function Home() {
   const [step, setStep] = useState('welcome'); // welcome, dialogue, summary
@@ -26,6 +28,8 @@ export default function Home() {
   const callActive = useRef(false);
   
   const ws = useRef(null);
+  const pendingAudio = useRef({}); // message_id -> audio attendu
+  const audioStream = useRef(null); // Flux audio binaire en cours de lecture
   const mediaRecorder = useRef(null);
   const audioChunks = useRef([]);
   const recordingTimer = useRef(null); // Timer pour l'enregistrement auto
@@ -44,11 +48,20 @@ export default function Home() {
     
     try {
       // Connexion WebSocket
+      const streamSupported = AUDIO_STREAM && typeof window !== 'undefined'
+        && window.MediaSource && window.MediaSource.isTypeSupported('audio/mpeg');
       ws.current = new WebSocket(
-        `${WS_BASE}/ws/conversation/${sessionId}`
+        `${WS_BASE}/ws/conversation/${sessionId}${streamSupported ? '?audio_stream=1' : ''}`
       );
+      ws.current.binaryType = 'arraybuffer';
 
       ws.current.onmessage = (event) => {
+        // Morceau audio du flux en cours
+        if (event.data instanceof ArrayBuffer) {
+          appendAudioChunk(event.data);
+          return;
+        }
+
         console.log('📨 [BOT] Message reçu:', event.data.substring(0, 100));
         const data = JSON.parse(event.data);
 
@@ -60,14 +73,55 @@ export default function Home() {
           setClaimId(data.sinistre_id);
         }
 
+        // Audio livré en différé pour un message déjà affiché
+        if (data.type === 'audio_ready') {
+          const pending = pendingAudio.current[data.message_id];
+          if (!pending) return;
+          clearTimeout(pending.timer);
+          delete pendingAudio.current[data.message_id];
+          if (data.audio_url) {
+            setMessages(prev => prev.map(m => m.messageId === data.message_id ? { ...m, hasAudio: true, audioUrl: data.audio_url } : m));
+          }
+          playAudio(data.audio_url, { autoRecord: pending.autoRecord, fallbackText: pending.text });
+          return;
+        }
+
+        // Audio en flux: lecture dès le premier morceau
+        if (data.type === 'audio_stream_start') {
+          const pending = pendingAudio.current[data.message_id];
+          if (pending) {
+            clearTimeout(pending.timer);
+            delete pendingAudio.current[data.message_id];
+          }
+          startAudioStream(data.message_id, pending || { text: '', autoRecord: false });
+          return;
+        }
+
+        if (data.type === 'audio_stream_end') {
+          if (data.audio_url) {
+            setMessages(prev => prev.map(m => m.messageId === data.message_id ? { ...m, hasAudio: true, audioUrl: data.audio_url } : m));
+          }
+          endAudioStream(data.message_id);
+          return;
+        }
+
         if (messageText) {
-          setMessages(prev => [...prev, { speaker: 'system', text: messageText, hasAudio: !!data.audio_url, audioUrl: data.audio_url || null }]);
+          setMessages(prev => [...prev, { speaker: 'system', text: messageText, messageId: data.message_id, hasAudio: !!data.audio_url, audioUrl: data.audio_url || null }]);
           setStep('dialogue');
 
-          if (isFullCall.current && callActive.current) {
-            playAudio(data.audio_url, { autoRecord: true, fallbackText: messageText });
+          const autoRecord = isFullCall.current && callActive.current;
+          if (data.audio_pending) {
+            // Attendre la trame audio_ready, sinon fallback Web Speech
+            pendingAudio.current[data.message_id] = {
+              text: messageText,
+              autoRecord,
+              timer: setTimeout(() => {
+                delete pendingAudio.current[data.message_id];
+                playAudio(null, { autoRecord, fallbackText: messageText });
+              }, AUDIO_WAIT_MS),
+            };
           } else {
-            playAudio(data.audio_url, { fallbackText: messageText });
+            playAudio(data.audio_url, { autoRecord, fallbackText: messageText });
           }
         }
       };
@@ -80,6 +134,63 @@ export default function Home() {
     }
   };
 
+  const startAudioStream = (messageId, { text, autoRecord }) => {
+    const mediaSource = new MediaSource();
+    const audio = new Audio(URL.createObjectURL(mediaSource));
+    const stream = { messageId, mediaSource, audio, sourceBuffer: null, queue: [], ended: false, received: 0 };
+    audioStream.current = stream;
+
+    const flush = () => {
+      if (!stream.sourceBuffer || stream.sourceBuffer.updating) return;
+      if (stream.queue.length) {
+        stream.sourceBuffer.appendBuffer(stream.queue.shift());
+      } else if (stream.ended && mediaSource.readyState === 'open') {
+        mediaSource.endOfStream();
+      }
+    };
+    stream.flush = flush;
+
+    mediaSource.addEventListener('sourceopen', () => {
+      stream.sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+      stream.sourceBuffer.addEventListener('updateend', flush);
+      flush();
+    });
+
+    audio.onended = () => {
+      if (autoRecord && isFullCall.current && callActive.current) {
+        startAutoRecording();
+      }
+    };
+    stream.fallback = () => {
+      if (stream.fellBack) return;
+      stream.fellBack = true;
+      speakText(text, { autoRecord });
+    };
+
+    audio.play().catch(err => {
+      console.error('❌ Lecture flux impossible:', err);
+      stream.fallback();
+    });
+  };
+
+  const appendAudioChunk = (chunk) => {
+    const stream = audioStream.current;
+    if (!stream) return;
+    stream.received += chunk.byteLength;
+    stream.queue.push(chunk);
+    stream.flush();
+  };
+
+  const endAudioStream = (messageId) => {
+    const stream = audioStream.current;
+    if (!stream || stream.messageId !== messageId) return;
+    stream.ended = true;
+    if (!stream.received) {
+      stream.fallback();
+    }
+    stream.flush();
+  };
+
   const speakText = (text, { autoRecord = false } = {}) => {
     if (!text) return;
 
@@ -334,7 +445,8 @@ export default function Home() {
         if (ws.current?.readyState === WebSocket.OPEN) {
           console.log('✅ [16] WebSocket OPEN, envoi message');
           ws.current.send(JSON.stringify({
-            text: transcript
+            text: transcript,
+            confidence: response.data.confidence
           }));
         } else {
           console.error('❌ [16] WebSocket NOT OPEN (readyState=' + ws.current?.readyState + ')');
@@ -382,7 +494,8 @@ export default function Home() {
         // Envoyer au WebSocket
         if (ws.current?.readyState === WebSocket.OPEN) {
           ws.current.send(JSON.stringify({
-            text: transcript
+            text: transcript,
+            confidence: response.data.confidence
           }));
         }
       }
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Import en masse d'un portefeuille (clients puis contrats) depuis un fichier NDJSON ou CSV
+Même chemin que POST /api/v1/import/{clients,contrats}: validation par blocs,
+insert groupé, erreurs rapportées ligne par ligne sans interrompre l'import.
+
+Run from project root:
+    python import_portfolio.py clients data/clients.csv
+    python import_portfolio.py contrats data/contrats.ndjson [--errors erreurs.json]
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Setup paths
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+parser = argparse.ArgumentParser(description="Bulk import of clients or contracts")
+parser.add_argument("resource", choices=["clients", "contrats"])
+parser.add_argument("path", type=Path)
+parser.add_argument("--format", choices=["ndjson", "csv"], help="Défaut: selon l'extension du fichier")
+parser.add_argument("--chunk-size", type=int, default=None)
+parser.add_argument("--errors", type=Path, help="Écrit le détail des erreurs dans ce fichier JSON")
+args = parser.parse_args()
+
+from backend.database import engine
+from backend.services.bulk_import import import_lines, IMPORT_CHUNK_SIZE
+
+fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+print(f"📁 Database: {engine.url}")
+print(f"📥 Import {args.resource} depuis {args.path} ({fmt})...")
+
+try:
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        report = import_lines(args.resource, fmt, f, chunk_size=args.chunk_size or IMPORT_CHUNK_SIZE)
+except (OSError, ValueError) as e:
+    print(f"❌ Error: {e}")
+    sys.exit(1)
+
+print(f"✅ {report['inserted']}/{report['total']} lignes importées en {report['elapsed_ms']} ms ({report['rows_per_second']} lignes/s)")
+if report["failed"]:
+    print(f"⚠️  {report['failed']} lignes rejetées")
+    for error in report["errors"][:10]:
+        print(f"   ligne {error['line']}: {error['error']}")
+    if args.errors:
+        args.errors.write_text(json.dumps(report["errors"], ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"   détail: {args.errors}")
+    sys.exit(2)
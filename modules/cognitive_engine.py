@@ -14,6 +14,7 @@ from models.claim_models import (
     AmbiguityFlag,
     TranscriptMetadata
 )
+from modules.timing import timed
 
 
 class CognitiveClaimEngine:
@@ -84,6 +85,7 @@ class CognitiveClaimEngine:
             print(f"⚠️ SDK LLM non installé ({e}), mode règles")
             self.use_llm = False
     
+    @timed("cognitive.analyze_claim")
     def analyze_claim(
         self, 
         transcript_metadata: TranscriptMetadata
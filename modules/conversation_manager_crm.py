@@ -428,6 +428,22 @@ class ConversationManager:
         return actions
     # ==================== MÉTHODES SUPPLÉMENTAIRES ====================
 
+    def matricule_introuvable(self) -> str:
+        """Message quand le matricule n'est pas reconnu"""
+        return "Je n'ai pas trouvé ce matricule. Pouvez-vous vérifier et réessayer?"
+
+    def proposer_matricule(self, matricule: str, nom: str, prenom: str) -> str:
+        """Confirmation d'un matricule proche de celui entendu (erreur STT probable)"""
+        return f"Je n'ai pas trouvé exactement ce matricule. S'agit-il du matricule {matricule}, au nom de {nom} {prenom}?"
+
+    def reprendre_conversation(self) -> str:
+        """Message de reprise après reconnexion"""
+        return "Nous reprenons là où nous en étions. Je vous écoute."
+
+    def recommencer_authentification(self) -> str:
+        """Message quand le client ne confirme pas son identité"""
+        return "D'accord, recommençons. Quel est votre numéro de matricule?"
+
     def ask_description(self) -> str:
         """Demander description du sinistre"""
         return "Merci! Pouvez-vous me décrire ce qui s'est passé? Les détails nous aident à traiter votre dossier plus rapidement."
@@ -473,6 +489,24 @@ Merci de patienter quelques instants..."""
         
         return cci
 
+    # ==================== PERSISTANCE ====================
+
+    def to_dict(self) -> Dict[str, Any]:
+        """État sérialisable (JSON) pour le stockage de session"""
+        return {
+            "session_id": self.session_id,
+            "phase": self.phase_actuelle.value,
+            "contexte": self.contexte if isinstance(self.contexte, dict) else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationManager":
+        """Reconstruit un manager depuis to_dict (client/sinistre rechargés depuis la base)"""
+        manager = cls(data["session_id"])
+        manager.current_phase = data.get("phase", ConversationPhaseEnum.AUTHENTIFICATION.value)
+        manager.contexte = data.get("contexte")
+        return manager
+
     @property
     def current_phase(self):
         """Getter phase actuelle"""
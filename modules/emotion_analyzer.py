@@ -20,6 +20,8 @@ from pathlib import Path
 import json
 from datetime import datetime
 
+from modules.timing import timed
+
 
 class EmotionAnalyzer:
     """
@@ -78,6 +80,7 @@ class EmotionAnalyzer:
         except ImportError:
             print("⚠️ Parselmouth non disponible - pas d'analyse prosodique")
     
+    @timed("emotion.audio_features")
     def analyze_audio_features(self, audio_path: str) -> Dict:
         """
         Extrait les caractéristiques acoustiques de l'audio
@@ -169,6 +172,7 @@ class EmotionAnalyzer:
         except:
             return {"fallback": True, "error": True}
     
+    @timed("emotion.text")
     def analyze_text_emotion(self, text: str) -> Dict[str, float]:
         """
         Analyse les émotions basées sur le contenu textuel
@@ -341,6 +345,7 @@ class EmotionAnalyzer:
         
         return fused
     
+    @timed("emotion.analyze_complete")
     def analyze_complete(
         self, 
         audio_path: str, 
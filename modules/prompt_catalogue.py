@@ -0,0 +1,159 @@
+"""
+Catalogue des messages fixes de la conversation.
+Les prompts connus à l'avance (salutation, relances, questions, transfert...)
+sont rendus en audio une seule fois (déploiement ou démarrage), puis servis
+directement par le WebSocket sans attendre de synthèse.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from modules.conversation_manager_crm import ConversationManager
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "prompt_catalogue.json"
+
+
+class PromptCatalogue:
+    """Prompts fixes pré-rendus, versionnés par voix et hash du texte"""
+
+    def __init__(self, tts_engine, tone: str = "professional", manifest_path: Optional[str] = None):
+        self.tts_engine = tts_engine
+        self.tone = tone
+        self.manifest_path = Path(manifest_path) if manifest_path else Path(tts_engine.output_dir) / MANIFEST_NAME
+        self._by_text: Dict[str, str] = {}  # texte -> nom de fichier audio
+        self._lock = threading.Lock()
+        self._load()
+
+    # ==================== CONTENU ====================
+
+    @staticmethod
+    def fixed_prompts() -> Dict[str, str]:
+        """Tous les messages fixes, indexés par une clé stable"""
+        manager = ConversationManager("prompt-catalogue")
+        prompts = {
+            "greeting": manager.get_greeting()["message"],
+            "matricule_introuvable": manager.matricule_introuvable(),
+            "recommencer_authentification": manager.recommencer_authentification(),
+            "reprendre_conversation": manager.reprendre_conversation(),
+            "ask_description": manager.ask_description(),
+            "demander_documents": manager.demander_documents()["message"],
+            "preparer_transfert": manager.preparer_transfert(""),
+        }
+
+        for type_sinistre in ("collision", "vol", "incendie", "blessure", "dommage_materiel"):
+            for i, question in enumerate(manager._generer_questions_contexte(type_sinistre)):
+                prompts[f"contexte_{type_sinistre}_{i}"] = question
+            for i, item in enumerate(manager.poser_questions_details(type_sinistre)):
+                prompts[f"details_{type_sinistre}_{i}"] = item["question"]
+
+        return prompts
+
+    def version_for(self, text: str) -> str:
+        """Version d'un rendu: change si la voix, le moteur, le ton ou le texte change"""
+        engine = self.tts_engine
+        raw = json.dumps(
+            [engine.get_voice_id(), engine.engine, engine.output_format, self.tone, text],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    # ==================== RENDU ====================
+
+    def prerender(self, force: bool = False) -> Dict[str, Any]:
+        """Rend les prompts manquants ou périmés et réécrit le manifeste"""
+        manifest = self._read_manifest()
+        stats = {"total": 0, "rendered": 0, "reused": 0, "failed": 0}
+
+        for key, text in self.fixed_prompts().items():
+            stats["total"] += 1
+            version = self.version_for(text)
+            entry = manifest.get(key)
+            audio_dir = Path(self.tts_engine.output_dir)
+
+            if (
+                not force
+                and entry
+                and entry.get("version") == version
+                and (audio_dir / entry.get("file", "")).exists()
+            ):
+                os.utime(audio_dir / entry["file"])  # Garder le rendu en tête du LRU du cache TTS
+                stats["reused"] += 1
+                continue
+
+            audio_path = self.tts_engine.synthesize(text, tone=self.tone)
+            if not audio_path or not audio_path.endswith(".mp3"):
+                stats["failed"] += 1
+                manifest.pop(key, None)
+                continue
+
+            manifest[key] = {"version": version, "file": Path(audio_path).name, "text": text}
+            stats["rendered"] += 1
+
+        self._write_manifest(manifest)
+        self._index(manifest)
+        logger.info(f"🎙️ Catalogue prompts: {stats}")
+        return stats
+
+    def lookup(self, text: Optional[str]) -> Optional[str]:
+        """Nom du fichier pré-rendu pour ce texte exact, sinon None"""
+        if not text:
+            return None
+        with self._lock:
+            filename = self._by_text.get(text)
+        if filename and not (Path(self.tts_engine.output_dir) / filename).exists():
+            # Fichier évincé du cache: retour à la synthèse différée
+            with self._lock:
+                self._by_text.pop(text, None)
+            return None
+        return filename
+
+    # ==================== MANIFESTE ====================
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _load(self):
+        """Charge les rendus existants encore valides pour la voix courante"""
+        self._index(self._read_manifest())
+
+    def _index(self, manifest: Dict[str, Any]):
+        audio_dir = Path(self.tts_engine.output_dir)
+        by_text = {}
+        for entry in manifest.values():
+            text = entry.get("text")
+            if (
+                text
+                and entry.get("version") == self.version_for(text)
+                and (audio_dir / entry.get("file", "")).exists()
+            ):
+                by_text[text] = entry["file"]
+        with self._lock:
+            self._by_text = by_text
+
+
+if __name__ == "__main__":
+    # Rendu au déploiement: python -m modules.prompt_catalogue [--force]
+    import sys
+    from modules.tts_module import TTSEngine
+
+    logging.basicConfig(level=logging.INFO)
+    catalogue = PromptCatalogue(TTSEngine(language="fr", voice="george"))
+    result = catalogue.prerender(force="--force" in sys.argv)
+    print(f"✅ Catalogue: {result['rendered']} rendus, {result['reused']} réutilisés, {result['failed']} échecs")
@@ -14,6 +14,7 @@ from dotenv import load_dotenv
 
 # Import pour les type hints uniquement
 from models.claim_models import TranscriptMetadata
+from modules.timing import timed
 
 
 # --- Moteur Principal ---
@@ -55,6 +56,7 @@ class STTEngine:
         except ImportError:
             print("⚠️ Module 'faster-whisper' non trouvé. Le mode local ne fonctionnera pas.")
 
+    @timed("stt.transcribe")
     def transcribe_audio(self, audio_path: str, language: str = None) -> Optional[TranscriptMetadata]:
         """
         Fonction principale : Transcrit ET Traduit.
@@ -0,0 +1,157 @@
+"""
+Mesure du temps passé dans chaque étape du pipeline de conversation.
+`span("nom")` (bloc with) et `@timed("nom")` alimentent des histogrammes à
+seaux fixes, partagés par tout le process et exposés sur /metrics.
+Dans un tour de conversation ouvert par `start_turn()` (ou le bloc `turn()`),
+les durées sont aussi cumulées par étape pour être jointes aux messages en mode debug.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List
+
+# Bornes supérieures des seaux, en millisecondes (+Inf implicite)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_turn: ContextVar[Optional[Dict[str, float]]] = ContextVar("turn_timings", default=None)
+
+
+class Histogram:
+    """Compteurs cumulables par seau, somme et maximum"""
+
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Borne supérieure du seau contenant le quantile q (approximation)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 3)
+        }
+
+
+class TimingRegistry:
+    """Histogrammes nommés, thread-safe (spans émis depuis les pools TTS/STT)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+
+    def observe(self, name: str, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: h.snapshot() for name, h in sorted(self._histograms.items())}
+
+    def render_prometheus(self, metric: str = "pipeline_span_duration_ms") -> str:
+        """Format d'exposition Prometheus (histogramme cumulatif, label span)"""
+        lines: List[str] = [
+            f"# HELP {metric} Durée des étapes du pipeline de conversation",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{span="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {round(h.sum_ms, 3)}')
+                lines.append(f'{metric}_count{{span="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+registry = TimingRegistry()
+
+
+@contextmanager
+def span(name: str):
+    """Chronomètre un bloc; la durée est enregistrée même si le bloc lève"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe(name, elapsed)
+        turn = _turn.get()
+        if turn is not None:
+            turn[name] = round(turn.get(name, 0.0) + elapsed * 1000, 3)
+
+
+def timed(name: str):
+    """Décorateur: chaque appel de la fonction est un span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_turn() -> Dict[str, float]:
+    """
+    Ouvre la collecte du tour pour la tâche asyncio courante: les spans qui suivent
+    (et ceux des tâches créées ensuite, qui héritent du contexte) s'y cumulent.
+    """
+    timings: Dict[str, float] = {}
+    _turn.set(timings)
+    return timings
+
+
+@contextmanager
+def turn():
+    """
+    Tour borné au bloc: le contexte d'avant est restauré à la sortie.
+    start_turn() ne le restaure pas: réservé aux tâches dont le contexte meurt
+    avec elles (une connexion WebSocket), pas au thread principal.
+    """
+    timings: Dict[str, float] = {}
+    token = _turn.set(timings)
+    try:
+        yield timings
+    finally:
+        _turn.reset(token)
+
+
+def current_turn() -> Optional[Dict[str, float]]:
+    return _turn.get()
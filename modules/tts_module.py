@@ -5,9 +5,223 @@ Utilise pyttsx3 (offline, fiable) pour génération robuste.
 """
 
 import os
-from typing import Optional
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterator
 from pathlib import Path
 
+from modules.timing import timed
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def resolve_audio_dir(output_dir: Optional[str] = None) -> Path:
+    """Dossier des fichiers audio: argument, sinon $AUDIO_DIR (relatif à la racine projet)"""
+    path = Path(output_dir or os.getenv("AUDIO_DIR", "data/audio_responses"))
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVENLABS_OUTPUT_FORMAT = "mp3_44100_128"
+
+
+class TTSCache:
+    """
+    Cache disque des synthèses, adressé par contenu.
+    Clé = hash(texte préparé, voice_id, ton, moteur, format de sortie).
+    Éviction LRU bornée en taille totale et en âge.
+    """
+
+    FILE_PREFIX = "tts_"
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 200 * 1024 * 1024, max_age_seconds: int = 30 * 86400):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (path, size, last_access)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, tone: str, engine: str, output_format: str) -> str:
+        """Empreinte stable des paramètres qui déterminent l'audio produit"""
+        raw = json.dumps([text, voice_id, tone, engine, output_format], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self):
+        """Reconstruit l'index LRU depuis le disque (ordre = dernière utilisation)"""
+        files = []
+        for path in self.cache_dir.glob(f"{self.FILE_PREFIX}*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+
+        with self._lock:
+            for mtime, path, size in sorted(files):
+                key = path.stem[len(self.FILE_PREFIX):]
+                self._entries[key] = (str(path), size, mtime)
+                self._total_bytes += size
+            self._evict_locked()
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne le chemin audio en cache (et le marque récent), sinon None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                path, size, last_access = entry
+                if time.time() - last_access <= self.max_age_seconds and os.path.exists(path):
+                    now = time.time()
+                    self._entries[key] = (path, size, now)
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    try:
+                        os.utime(path, (now, now))  # Persister l'ordre LRU entre redémarrages
+                    except OSError:
+                        pass
+                    return path
+                self._remove_locked(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, source_path: str) -> str:
+        """Range un fichier fraîchement synthétisé dans le cache (déplacement atomique)"""
+        suffix = Path(source_path).suffix or ".mp3"
+        final_path = self.cache_dir / f"{self.FILE_PREFIX}{key}{suffix}"
+        os.replace(source_path, final_path)
+        size = final_path.stat().st_size
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries[key][1]
+            self._entries[key] = (str(final_path), size, time.time())
+            self._entries.move_to_end(key)
+            self._total_bytes += size
+            self._evict_locked()
+        return str(final_path)
+
+    def _remove_locked(self, key: str):
+        path, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict_locked(self):
+        now = time.time()
+        for key in [k for k, (_, _, last) in self._entries.items() if now - last > self.max_age_seconds]:
+            self._remove_locked(key)
+            self.evictions += 1
+        while self._entries and self._total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove_locked(oldest)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs hit/miss et occupation"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class TTSStream:
+    """
+    Flux de synthèse itérable (bytes).
+    Chaque morceau est écrit sur disque pendant la lecture, puis le fichier
+    complet est rangé dans le cache TTS; `path` est renseigné en fin de flux.
+    """
+
+    def __init__(self, engine: "TTSEngine", text: str, tone: str, voice: Optional[str], chunk_size: int):
+        self.engine = engine
+        self.text = text
+        self.tone = tone
+        self.voice = voice
+        self.chunk_size = chunk_size
+        self.path: Optional[str] = None
+
+    def __iter__(self) -> Iterator[bytes]:
+        engine = self.engine
+        if not self.text or not self.text.strip():
+            return
+
+        if self.voice:
+            engine.voice_name = self.voice
+        prepared_text = engine._prepare_text_for_tone(self.text, self.tone)
+        cache_key = engine._cache_key(prepared_text, self.voice, self.tone)
+        cached_path = engine.cache.get(cache_key) if cache_key else None
+
+        if cached_path:
+            self.path = cached_path
+        elif engine.engine == "elevenlabs":
+            yield from self._stream_elevenlabs(prepared_text, cache_key)
+            return
+        else:
+            self.path = engine.synthesize(self.text, tone=self.tone, voice=self.voice)
+
+        yield from self._read_file(self.path)
+
+    def _stream_elevenlabs(self, prepared_text: str, cache_key: Optional[str]) -> Iterator[bytes]:
+        engine = self.engine
+        output_path = engine._new_output_path()
+        received = 0
+        complete = False
+        try:
+            with open(output_path, "wb") as f:
+                for chunk in engine._elevenlabs_chunks(prepared_text):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    received += len(chunk)
+                    yield chunk
+            complete = True
+        except Exception as e:
+            print(f"⚠️ Flux ElevenLabs interrompu: {e}")
+            if received:
+                raise
+            # Rien n'a été envoyé: bascule sur la synthèse classique (moteurs de secours)
+            self.path = engine.synthesize(self.text, tone=self.tone, voice=self.voice)
+            yield from self._read_file(self.path)
+            return
+        finally:
+            if not complete:
+                # Erreur ou flux abandonné par le consommateur (GeneratorExit): fichier
+                # partiel hors cache, que l'éviction ne supprimerait jamais
+                try:
+                    os.remove(output_path)
+                except OSError:
+                    pass
+
+        self.path = engine.cache.put(cache_key, output_path) if cache_key and received else output_path
+
+    def _read_file(self, path: Optional[str]) -> Iterator[bytes]:
+        if not path or not os.path.exists(path) or not path.endswith(".mp3"):
+            return
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
 
 class TTSEngine:
     """Moteur de synthèse vocale Text-to-Speech"""
@@ -23,7 +237,14 @@ class TTSEngine:
         "sarah": {"id": "EXAVITQu4vr4xnSDxMaL", "language": "fr", "gender": "female", "description": "Voix féminine mûre, rassurante, confiante"},
     }
     
-    def __init__(self, language: str = "fr", use_lemonfoxx: bool = True, voice: str = None):
+    def __init__(
+        self,
+        language: str = "fr",
+        use_lemonfoxx: bool = True,
+        voice: str = None,
+        output_dir: Optional[str] = None,
+        use_cache: Optional[bool] = None
+    ):
         """
         Initialise le moteur TTS
         
@@ -31,6 +252,8 @@ class TTSEngine:
             language: Code langue (fr, ar, en)
             use_lemonfoxx: Inutilisé (maintient la compatibilité)
             voice: Nom de la voix (george, alice, eric, jessica, will, roger, sarah) ou voice_id
+            output_dir: Dossier des fichiers audio (défaut: $AUDIO_DIR, relatif à la racine projet)
+            use_cache: Active le cache disque des synthèses (défaut: $TTS_CACHE_ENABLED)
         """
         import os
         from dotenv import load_dotenv
@@ -40,6 +263,19 @@ class TTSEngine:
         self.voice_name = voice or self._get_default_voice(language)
         self.elevenlabs_key = os.getenv("ELEVENLABS_API_KEY")
         self.engine = None
+        self._local = threading.local()
+
+        self.output_dir = resolve_audio_dir(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        if use_cache is None:
+            use_cache = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+        self.cache = TTSCache(
+            self.output_dir,
+            max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024,
+            max_age_seconds=int(os.getenv("TTS_CACHE_MAX_AGE_DAYS", "30")) * 86400
+        ) if use_cache else None
+
         self._initialize_engine()
     
     def _get_default_voice(self, language: str) -> str:
@@ -91,7 +327,23 @@ class TTSEngine:
         except ImportError:
             print("⚠️ Aucun moteur TTS disponible. Mode simulation audio.")
             self.engine = None
+
+    @property
+    def output_format(self) -> str:
+        """Format audio produit par le moteur actif (entre dans la clé de cache)"""
+        if self.engine == "elevenlabs":
+            return ELEVENLABS_OUTPUT_FORMAT
+        return "mp3"
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache TTS (vide si désactivé)"""
+        return self.cache.stats() if self.cache else {"enabled": False}
+
+    def _mark_fallback(self):
+        """Signale que la synthèse courante a basculé sur un moteur de secours"""
+        self._local.fallback = True
     
+    @timed("tts.synthesize")
     def synthesize(
         self, 
         text: str, 
@@ -122,24 +374,80 @@ class TTSEngine:
         # Préparer le texte selon le ton
         prepared_text = self._prepare_text_for_tone(text, tone)
         
-        # Générer nom de fichier si non fourni
+        # Cache: uniquement pour les chemins générés automatiquement
+        cache_key = None
         if output_path is None:
-            output_dir = Path("c:/Users/HP/Inssurance Advanced/data/audio_responses")
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = str(output_dir / f"response_{timestamp}.mp3")
+            cache_key = self._cache_key(prepared_text, voice, tone)
+            cached_path = self.cache.get(cache_key) if cache_key else None
+            if cached_path:
+                return cached_path
+        
+        # Générer nom de fichier unique si non fourni (appels concurrents)
+        if output_path is None:
+            output_path = self._new_output_path()
         
         # Synthèse selon l'engine disponible
+        self._local.fallback = False
         if self.engine == "elevenlabs":
-            return self._synthesize_elevenlabs(prepared_text, output_path)
+            result = self._synthesize_elevenlabs(prepared_text, output_path)
         elif self.engine == "pyttsx3":
-            return self._synthesize_pyttsx3(prepared_text, output_path)
+            result = self._synthesize_pyttsx3(prepared_text, output_path)
         elif self.engine == "gtts":
-            return self._synthesize_gtts(prepared_text, output_path)
+            result = self._synthesize_gtts(prepared_text, output_path)
         else:
-            return self._simulate_synthesis(prepared_text, output_path)
+            result = self._simulate_synthesis(prepared_text, output_path)
+        
+        # Ne mettre en cache que l'audio réellement produit par le moteur attendu
+        if (
+            cache_key
+            and result == output_path
+            and not self._local.fallback
+            and os.path.exists(result)
+            and os.path.getsize(result) > 0
+        ):
+            return self.cache.put(cache_key, result)
+        return result
+    
+    def synthesize_stream(
+        self,
+        text: str,
+        tone: str = "professional",
+        voice: str = None,
+        chunk_size: int = 16384
+    ) -> "TTSStream":
+        """
+        Synthèse en flux: les morceaux audio sont rendus au fur et à mesure
+        de leur réception (ElevenLabs), le fichier complet est archivé ensuite.
+        Les autres moteurs (et le cache) livrent le fichier découpé en morceaux.
+        
+        Returns:
+            TTSStream itérable de bytes; .path contient le fichier archivé une fois épuisé
+        """
+        return TTSStream(self, text, tone, voice, chunk_size)
+    
+    def _cache_key(self, prepared_text: str, voice: Optional[str], tone: str) -> Optional[str]:
+        if self.cache is None or not self.engine:
+            return None
+        return TTSCache.make_key(
+            prepared_text, self.get_voice_id(voice or self.voice_name), tone, self.engine, self.output_format
+        )
+    
+    def _new_output_path(self) -> str:
+        from datetime import datetime
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return str(self.output_dir / f"response_{timestamp}_{uuid.uuid4().hex[:8]}.mp3")
+    
+    def _elevenlabs_chunks(self, text: str):
+        """Générateur de morceaux MP3 renvoyé par l'API ElevenLabs"""
+        from elevenlabs.client import ElevenLabs
+        
+        client = ElevenLabs(api_key=self.elevenlabs_key)
+        return client.text_to_speech.convert(
+            voice_id=self.get_voice_id(self.voice_name),
+            text=text,
+            model_id=ELEVENLABS_MODEL_ID,
+            output_format=ELEVENLABS_OUTPUT_FORMAT
+        )
     
     def _synthesize_gtts(self, text: str, output_path: str) -> str:
         """Synthèse avec gTTS"""
@@ -161,6 +469,7 @@ class TTSEngine:
             
         except Exception as e:
             print(f"❌ Erreur gTTS: {e}")
+            self._mark_fallback()
             return self._simulate_synthesis(text, output_path)
     
     def _synthesize_elevenlabs(self, text: str, output_path: str) -> str:
@@ -179,12 +488,7 @@ class TTSEngine:
             
             # Convertir texte en audio avec API officielle
             print(f"📡 [ELEVENLABS] Appel API convert...")
-            audio_generator = client.text_to_speech.convert(
-                voice_id=voice_id,
-                text=text,
-                model_id="eleven_multilingual_v2",
-                output_format="mp3_44100_128"
-            )
+            audio_generator = self._elevenlabs_chunks(text)
             
             # Sauvegarder l'audio (c'est un generator, pas bytes direct)
             with open(output_path, 'wb') as f:
@@ -201,6 +505,7 @@ class TTSEngine:
         except Exception as e:
             print(f"⚠️ ElevenLabs échoué: {str(e)}")
             print(f"📋 Fallback vers gTTS...")
+            self._mark_fallback()
             return self._synthesize_gtts(text, output_path)
     
     def _synthesize_pyttsx3(self, text: str, output_path: str) -> str:
@@ -225,10 +530,12 @@ class TTSEngine:
                 return output_path
             else:
                 print(f"⚠️ pyttsx3 a généré un fichier vide, essai gTTS...")
+                self._mark_fallback()
                 return self._synthesize_gtts(text, output_path)
                 
         except Exception as e:
             print(f"❌ Erreur pyttsx3: {e}")
+            self._mark_fallback()
             return self._synthesize_gtts(text, output_path)
     
 
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""
+Reconstruit la table analytics_rollup depuis les tables sources
+(reprise après incident ou import massif hors ORM)
+Run from project root: python rebuild_analytics.py
+"""
+import sys
+from pathlib import Path
+
+# Setup paths
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from backend.database import engine, Base
+from backend.models import AnalyticsRollupDB, AnalyticsDeltaDB
+from backend.services.analytics_rollup import rebuild
+
+print(f"📁 Database: {engine.url}")
+
+try:
+    Base.metadata.create_all(bind=engine, tables=[AnalyticsRollupDB.__table__, AnalyticsDeltaDB.__table__])
+    with engine.begin() as conn:
+        count = rebuild(conn)
+    print(f"✅ analytics_rollup reconstruite: {count} lignes")
+except Exception as e:
+    print(f"❌ Error: {e}")
+    sys.exit(1)